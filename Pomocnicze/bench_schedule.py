@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Porównanie planu przebiegu równoległego: FIFO (kolejność katalogu, stałe paczki)
+vs koszt (największe pliki pierwsze, drobne w paczkach) – schedule.py.
+
+  python bench_schedule.py                      (syntetyczny korpus: drobne części + blachy perforowane)
+  python bench_schedule.py D:/projekt/nc --workers 2 4 8 [--real]
+
+Czasy plików mierzone raz, po kolei (parse + DXF do katalogu tymczasowego); makespan
+każdego planu liczony symulacją listową na N procesach, z narzutem wysłania paczki.
+--real: dodatkowo prawdziwe run_batch -j N dla obu planów (sens tylko przy >= N rdzeniach).
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main
+import schedule
+
+OVERHEAD = 0.002     # s – wysłanie paczki do procesu (pickle + kolejka), zmierzone rzędu ms
+
+def synthetic_part(i: int, holes: int) -> str:
+    rnd = random.Random(i)
+    lines = ["ST", "** syntetyczna", "ORD1", "6", f"P{i}", f"A{i}", "S355", "2", "BL12", "B",
+             " 1500.00", " 1000.00", " 12.00", " 0", "AK",
+             "  v     0.00u     0.00   0.00", "  v  1500.00u     0.00   0.00",
+             "  v  1500.00u  1000.00   0.00", "  v     0.00u  1000.00   0.00", "BO"]
+    for _ in range(holes):
+        lines.append(f"  v {rnd.uniform(20, 1480):8.2f}u {rnd.uniform(20, 980):8.2f} 10.00 0.00")
+    return "\n".join(lines + ["EN"]) + "\n"
+
+def synthetic_corpus(folder: Path, small: int = 200, large: int = 4) -> None:
+    """Drobne części (5-60 otworów), a na końcu katalogu kilka blach perforowanych (2-6 tys. otworów)."""
+    rnd = random.Random(0)
+    for i in range(small):
+        (folder / f"a{i:04d}.nc1").write_text(synthetic_part(i, rnd.randint(5, 60)))
+    for i in range(large):
+        (folder / f"z{i:04d}.nc1").write_text(synthetic_part(10000 + i, rnd.randint(2000, 6000)))
+
+def measure(files, out_dir: Path) -> list[float]:
+    lic = {"name": "benchmark"}
+    times = []
+    for p in files:
+        t = time.perf_counter()
+        main.process_file(p, lic, rename=False, dxf=True, out_dir=out_dir)
+        times.append(time.perf_counter() - t)
+    return times
+
+def main_cli():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("folder", nargs="?", help="Katalog z plikami NC (domyślnie korpus syntetyczny)")
+    ap.add_argument("--workers", type=int, nargs="+", default=[2, 4, 8])
+    ap.add_argument("--real", action="store_true", help="Także prawdziwe run_batch -j N (FIFO vs koszt)")
+    args = ap.parse_args()
+
+    tmp = Path(tempfile.mkdtemp(prefix="nctodxf_sched_"))
+    try:
+        src = Path(args.folder) if args.folder else tmp / "nc"
+        if not args.folder:
+            src.mkdir()
+            synthetic_corpus(src)
+        files = main.find_candidates([src])
+        (tmp / "dxf").mkdir()
+        times = measure(files, tmp / "dxf")
+        jobs = [(p, None, False, True, None, None, None, False, None) for p in files]
+        size_costs = main.job_costs(jobs, "size")
+        scan_costs = main.job_costs(jobs, "scan")
+        print(f"Pliki: {len(files)}, suma czasu: {sum(times):.2f} s, najdłuższy: {max(times):.2f} s")
+        print(f"{'N':>3} {'dolna granica':>14} {'FIFO':>8} {'size':>8} {'scan':>8} {'FIFO/size':>10}")
+        for n in args.workers:
+            bound = max(sum(times) / n, max(times))
+            fifo = schedule.simulate(times, schedule.fifo_plan(len(files), n), n, OVERHEAD)
+            by_size = schedule.simulate(times, schedule.plan(size_costs, n), n, OVERHEAD)
+            by_scan = schedule.simulate(times, schedule.plan(scan_costs, n), n, OVERHEAD)
+            print(f"{n:3d} {bound:13.2f}s {fifo:7.2f}s {by_size:7.2f}s {by_scan:7.2f}s {fifo / by_size:9.2f}x")
+
+        if args.real:
+            for n in args.workers:
+                for mode in ("fifo", "size"):
+                    out = tmp / f"real_{mode}_{n}"
+                    t = time.perf_counter()
+                    main.run_batch([src], {"name": "benchmark"}, out_dir=out, rename=False,
+                                   workers=n, quiet=True, schedule=mode)
+                    print(f"run_batch -j {n} {mode:>4}: {time.perf_counter() - t:.2f} s (rdzeni: {os.cpu_count()})")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+if __name__ == "__main__":
+    main_cli()
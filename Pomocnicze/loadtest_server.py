@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test obciążenia serwera konwersji (server.py): N żądań POST /convert z C wątków,
+każdy wątek na jednym połączeniu keep-alive. Pliki NC1 z podanego katalogu po kolei.
+
+  python loadtest_server.py D:/projekt/nc --requests 500 --concurrency 8 [--port 8765]
+
+Wynik: żądania/s, opóźnienia p50/p90/p99/max [ms], liczba błędów.
+"""
+
+import argparse
+import http.client
+import statistics
+import threading
+import time
+from pathlib import Path
+
+def percentile(sorted_vals, q):
+    if not sorted_vals:
+        return 0.0
+    i = min(len(sorted_vals) - 1, max(0, round(q / 100.0 * (len(sorted_vals) - 1))))
+    return sorted_vals[i]
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("folder", help="Katalog z plikami .nc1/.nc/.dstv")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--requests", type=int, default=200)
+    ap.add_argument("--concurrency", type=int, default=4)
+    args = ap.parse_args()
+
+    bodies = [(p.stem, p.read_bytes()) for p in sorted(Path(args.folder).iterdir())
+              if p.is_file() and p.suffix.lower() in (".nc", ".nc1", ".dstv")]
+    if not bodies:
+        raise SystemExit("Brak plików NC1 w katalogu.")
+
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    counter = iter(range(args.requests))
+
+    def worker():
+        conn = http.client.HTTPConnection(args.host, args.port, timeout=120)
+        while True:
+            with lock:
+                n = next(counter, None)
+            if n is None:
+                break
+            stem, body = bodies[n % len(bodies)]
+            t0 = time.perf_counter()
+            try:
+                conn.request("POST", f"/convert?stem={stem}", body=body,
+                             headers={"Content-Type": "application/octet-stream"})
+                resp = conn.getresponse()
+                resp.read()
+                ok = resp.status == 200
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                conn = http.client.HTTPConnection(args.host, args.port, timeout=120)
+                ok, resp = False, e
+            dt = (time.perf_counter() - t0) * 1000.0
+            with lock:
+                latencies.append(dt)
+                if not ok:
+                    errors.append(getattr(resp, "status", resp))
+        conn.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(args.concurrency)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+
+    lat = sorted(latencies)
+    print(f"żądań: {len(lat)}, równolegle: {args.concurrency}, czas: {wall:.2f} s")
+    print(f"przepustowość: {len(lat) / wall:.1f} żądań/s")
+    print(f"opóźnienie [ms]: śr {statistics.fmean(lat):.1f}, p50 {percentile(lat, 50):.1f}, "
+          f"p90 {percentile(lat, 90):.1f}, p99 {percentile(lat, 99):.1f}, max {lat[-1]:.1f}")
+    print(f"błędy: {len(errors)}" + (f" ({errors[:5]})" if errors else ""))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+API do użycia w innych programach (bez okien, input() i zapisu plików):
+
+  import api
+  lic = api.license_payload()                         # raz; LicenseError gdy brak/zła licencja
+  res = api.convert(open("P1.nc1", "rb").read(), stem="P1", lic=lic)
+  res["name"], res["file_stem"], res["dxf"]           # nazwa, nazwa pliku, bajty DXF
+
+  for res in api.convert_many(paths, lic=lic, executor="auto", workers=4):
+      ...                                             # w kolejności ukończenia
+  res = await api.convert_async(data, stem="P1", lic=lic)
+  async for res in api.convert_many_async(paths, lic=lic): ...
+
+Wynik: {"path", "name", "file_stem", "header", "dxf", "info", "error"} – przy błędzie
+konwersji "error" = komunikat, a pozostałe pola puste (generator się nie przerywa).
+Ustawienia (DXF_FORMAT, DXF_PROFILE, CUT_ORDER, ...) – stałe modułu main; zmiany
+zrobione przed convert_many trafiają też do procesów roboczych.
+"""
+
+import asyncio
+import contextlib
+import io
+from concurrent.futures import Executor, FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from pathlib import Path
+
+import main
+
+IN_FLIGHT = 4      # zadań w kolejce na proces/wątek (convert_many nie wczytuje wszystkiego naraz)
+
+class LicenseError(RuntimeError):
+    pass
+
+def license_payload() -> dict:
+    """Weryfikuje program.lic; payload licencji albo LicenseError (komunikat jak w programie)."""
+    out = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(out):
+            return main.verify_license_or_exit(wait=False)
+    except SystemExit:
+        raise LicenseError(out.getvalue().strip()) from None
+
+def _result(path, res=None, error=None) -> dict:
+    base = {"path": str(path) if path is not None else None, "name": None, "file_stem": None,
+            "header": None, "dxf": None, "info": None, "error": error}
+    if res is not None:
+        base.update(res)
+    return base
+
+def convert(data: bytes | str, stem: str = "", lic: dict | None = None) -> dict:
+    """Jedna część NC1 (bajty lub tekst) -> wynik; wyjątek przy błędzie."""
+    if lic is None:
+        lic = license_payload()
+    txt = data.decode("utf-8", errors="replace") if isinstance(data, (bytes, bytearray)) else data
+    return _result(None, main.nc_to_dxf_bytes(txt, lic, stem))
+
+def _convert_path(path, lic: dict) -> dict:
+    path = Path(path)
+    try:
+        res = convert(path.read_bytes(), path.stem, lic)
+        res["path"] = str(path)
+        return res
+    except Exception as e:
+        return _result(path, error=f"{type(e).__name__}: {e}")
+
+def _make_executor(executor, workers):
+    """executor: "process", "thread", "auto" (main.BACKEND) albo gotowy Executor -> (executor, czy zamknąć)."""
+    if isinstance(executor, Executor):
+        return executor, False
+    if executor == "auto":
+        executor = main.resolve_backend("auto")
+    if executor == "thread":
+        return ThreadPoolExecutor(max_workers=workers), True
+    if executor == "process":
+        return ProcessPoolExecutor(max_workers=workers, initializer=main.apply_settings,
+                                   initargs=(main.current_settings(),)), True
+    raise ValueError(f"nieznany executor: {executor!r}")
+
+def convert_many(paths, lic: dict | None = None, executor="auto", workers: int | None = None):
+    """
+    Generator wyników dla plików NC1, w kolejności ukończenia.
+    executor: "auto" (wątki na Pythonie bez GIL, inaczej procesy), "process", "thread"
+    lub własny concurrent.futures.Executor.
+    """
+    if lic is None:
+        lic = license_payload()
+    pool, owned = _make_executor(executor, workers)
+    limit = IN_FLIGHT * (getattr(pool, "_max_workers", None) or 4)
+    paths = iter(paths)
+    pending = set()
+    try:
+        while True:
+            for path in paths:
+                pending.add(pool.submit(_convert_path, path, lic))
+                if len(pending) >= limit:
+                    break
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                yield fut.result()
+    finally:
+        for fut in pending:
+            fut.cancel()
+        if owned:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+async def convert_async(data: bytes | str, stem: str = "", lic: dict | None = None,
+                        executor: Executor | None = None) -> dict:
+    """convert() w executorze (domyślnie executor pętli asyncio) – nie blokuje pętli."""
+    if lic is None:
+        lic = await asyncio.get_running_loop().run_in_executor(executor, license_payload)
+    return await asyncio.get_running_loop().run_in_executor(executor, convert, data, stem, lic)
+
+async def convert_many_async(paths, lic: dict | None = None, executor="auto",
+                             workers: int | None = None):
+    """Asynchroniczny odpowiednik convert_many (async for)."""
+    loop = asyncio.get_running_loop()
+    if lic is None:
+        lic = await loop.run_in_executor(None, license_payload)
+    pool, owned = _make_executor(executor, workers)
+    limit = IN_FLIGHT * (getattr(pool, "_max_workers", None) or 4)
+    paths = iter(paths)
+    pending = set()
+    try:
+        while True:
+            for path in paths:
+                pending.add(loop.run_in_executor(pool, _convert_path, path, lic))
+                if len(pending) >= limit:
+                    break
+            if not pending:
+                break
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for fut in done:
+                yield fut.result()
+    finally:
+        for fut in pending:
+            fut.cancel()
+        if owned:
+            pool.shutdown(wait=False, cancel_futures=True)
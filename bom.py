@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Zestawienie materiałowe (BOM) zapisywane kolumnami w tym samym przebiegu co zmiana nazw.
+
+Parquet (gdy jest pyarrow) – kolumny typowane, zapis grupami po ROW_GROUP wierszy;
+bez pyarrow – CSV (';', utf-8-sig) pisany wiersz po wierszu.
+W pamięci jest najwyżej jedna grupa wierszy, więc projekt 100k części nie rośnie w RAM.
+"""
+
+import csv
+from pathlib import Path
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:          # opcjonalne – fallback na CSV
+    pa = pq = None
+
+ROW_GROUP = 10000
+
+# kolumna -> typ (Parquet); kolejność = kolejność w pliku
+FIELDS = {
+    "piece":        "string",
+    "assembly":     "string",
+    "grade":        "string",
+    "thickness":    "float64",
+    "qty":          "int64",
+    "profile":      "string",
+    "type_code":    "string",
+    "area_mm2":     "float64",
+    "cut_outer_mm": "float64",
+    "cut_inner_mm": "float64",
+    "pierces":      "int64",
+    "mass_kg":      "float64",
+    "nc":           "string",
+    "dxf":          "string",
+}
+
+def _typed(value, kind):
+    if value is None or value == "":
+        return None
+    try:
+        if kind == "float64":
+            return float(str(value).replace(",", "."))
+        if kind == "int64":
+            return int(float(str(value).replace(",", ".")))
+    except ValueError:
+        return None
+    return str(value)
+
+class BomWriter:
+    """Strumieniowy zapis BOM; fmt "parquet" (wymaga pyarrow) albo "csv". Użycie: with BomWriter(...) as bom."""
+
+    def __init__(self, path: Path, fmt: str | None = None, row_group: int = ROW_GROUP):
+        self.fmt = fmt or ("parquet" if pa is not None else "csv")
+        if self.fmt == "parquet" and pa is None:
+            raise RuntimeError("Parquet wymaga pakietu pyarrow")
+        self.path = path.with_suffix(".parquet" if self.fmt == "parquet" else ".csv")
+        self.row_group = row_group
+        self.rows = 0
+        if self.fmt == "parquet":
+            self.schema = pa.schema([(name, getattr(pa, kind)()) for name, kind in FIELDS.items()])
+            self.writer = pq.ParquetWriter(self.path, self.schema)
+            self.columns = {name: [] for name in FIELDS}
+        else:
+            self.file = self.path.open("w", encoding="utf-8-sig", newline="")
+            self.writer = csv.writer(self.file, delimiter=";")
+            self.writer.writerow(FIELDS)
+
+    def add(self, row: dict) -> None:
+        """row: klucze jak FIELDS (brakujące → puste)."""
+        values = [_typed(row.get(name), kind) for name, kind in FIELDS.items()]
+        if self.fmt == "parquet":
+            for name, v in zip(FIELDS, values):
+                self.columns[name].append(v)
+            if len(self.columns["piece"]) >= self.row_group:
+                self._flush_group()
+        else:
+            self.writer.writerow(["" if v is None else v for v in values])
+        self.rows += 1
+
+    def _flush_group(self) -> None:
+        if self.columns["piece"]:
+            self.writer.write_table(pa.table(self.columns, schema=self.schema))
+            self.columns = {name: [] for name in FIELDS}
+
+    def close(self) -> None:
+        """Ostatnia grupa i stopka Parquet / zamknięcie CSV – plik zamykany także po błędzie zapisu grupy."""
+        if self.fmt == "parquet":
+            try:
+                self._flush_group()
+            finally:
+                self.writer.close()
+        else:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
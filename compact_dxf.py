@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Profil "compact" zapisu DXF (mniejsze pliki dla stacji nestingu):
+- współrzędne, promienie i bulge zaokrąglone do DECIMALS miejsc
+  (NC1 ma zwykle 2 miejsca – XY zostają 1:1),
+- nagłówek ograniczony do KEEP_HEADER ($INSUNITS = mm),
+- usunięte nieużywane wpisy tabel (warstwa Defpoints, zbędne APPID).
+Warstwy OUTER/cutout i XDATA NCTODXF zostają bez zmian.
+"""
+
+from dxf_format import serialize
+
+DECIMALS = 4
+
+KEEP_HEADER = {
+    "$ACADVER", "$ACADMAINTVER", "$DWGCODEPAGE", "$HANDSEED",
+    "$INSUNITS", "$MEASUREMENT", "$LASTSAVEDBY",
+}
+KEEP_APPIDS = {"ACAD", "EZDXF", "NCTODXF"}
+INSUNITS_MM = 4
+
+def _r(v, decimals):
+    return round(float(v), decimals)
+
+def round_entities(layout, decimals=DECIMALS) -> None:
+    for e in layout:
+        t = e.dxftype()
+        if t == "LWPOLYLINE":
+            pts = [(_r(x, decimals), _r(y, decimals), _r(b, decimals)) for x, y, b in e.get_points("xyb")]
+            e.set_points(pts, format="xyb")
+        elif t == "CIRCLE":
+            c = e.dxf.center
+            e.dxf.center = (_r(c.x, decimals), _r(c.y, decimals))
+            e.dxf.radius = _r(e.dxf.radius, decimals)
+        elif t == "INSERT":
+            p = e.dxf.insert
+            e.dxf.insert = (_r(p.x, decimals), _r(p.y, decimals))
+            for key in ("column_spacing", "row_spacing"):
+                if e.dxf.hasattr(key):
+                    e.dxf.set(key, _r(e.dxf.get(key), decimals))
+
+def compact_doc(doc, decimals=DECIMALS) -> None:
+    """Przerabia dokument na profil compact (przed zapisem)."""
+    doc.header["$INSUNITS"] = INSUNITS_MM
+    for var in list(doc.header.varnames()):
+        if var not in KEEP_HEADER:
+            del doc.header[var]
+
+    used_layers = {e.dxf.layer for e in doc.modelspace()}
+    for blk in doc.blocks:
+        used_layers.update(e.dxf.layer for e in blk)
+    if "Defpoints" in doc.layers and "Defpoints" not in used_layers:
+        doc.layers.remove("Defpoints")
+    for appid in [a.dxf.name for a in doc.appids]:
+        if appid.upper() not in KEEP_APPIDS:
+            doc.appids.remove(appid)
+
+    round_entities(doc.modelspace(), decimals)
+    for blk in doc.blocks:
+        if not blk.name.startswith("*"):
+            round_entities(blk, decimals)
+
+def dxf_size(doc, fmt: str = "asc") -> int:
+    """Rozmiar pliku w bajtach (bez zapisu na dysk) – kodowanie i końce linii jak saveas, do raportu oszczędności."""
+    return len(serialize(doc, fmt))
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Kolejność cięcia wycięć (IK + BO) – minimalizacja przejazdów jałowych głowicy.
+
+Trasa: start (0,0) -> punkty przebicia wycięć -> przebicie OUTER (cięty na końcu).
+1) najbliższy sąsiad (k-d drzewo – skupiska i powtórzone punkty bez kosztu kwadratowego),
+2) 2-opt na listach K najbliższych sąsiadów (don't-look bits),
+   końce trasy stałe; wspólny limit czasu TIME_LIMIT na oba etapy.
+"""
+
+import math
+import time
+from collections import deque
+from heapq import heappush, heapreplace
+from itertools import islice
+
+NEIGHBORS = 8        # K najbliższych sąsiadów dla 2-opt
+TIME_LIMIT = 0.5     # s – twardy limit na całą optymalizację (NN + listy sąsiadów + 2-opt)
+EPS = 1e-9
+
+def path_length(points, order, start, end) -> float:
+    """Długość przejazdów: start -> points[order...] -> end."""
+    total = 0.0
+    cur = start
+    for i in order:
+        total += math.dist(cur, points[i])
+        cur = points[i]
+    if end is not None:
+        total += math.dist(cur, end)
+    return total
+
+class _KDTree:
+    """
+    k-d drzewo na unikalnych współrzędnych (liście <= LEAF), podział w medianie osi o większym
+    rozrzucie – skupiska otworów nie zapychają jednej komórki jak w siatce o stałym kroku.
+    Punkty o tych samych XY w jednym węźle; usuwanie przez liczniki żywych punktów w węzłach.
+    """
+
+    LEAF = 8
+
+    def __init__(self, points):
+        groups = {}
+        for i, p in enumerate(points):
+            groups.setdefault((p[0], p[1]), []).append(i)
+        self.coords = list(groups)
+        self.members = [dict.fromkeys(g) for g in groups.values()]
+        self.coord_of = [0] * len(points)
+        for c, g in enumerate(groups.values()):
+            for i in g:
+                self.coord_of[i] = c
+        self.axis, self.split, self.left, self.right = [], [], [], []
+        self.items, self.alive, self.parent = [], [], []
+        self.leaf_of = [0] * len(self.coords)
+        self._build(list(range(len(self.coords))), -1)
+
+    def _build(self, ids, parent) -> int:
+        node = len(self.axis)
+        self.axis.append(-1); self.split.append(0.0); self.left.append(-1); self.right.append(-1)
+        self.items.append(None); self.parent.append(parent)
+        self.alive.append(sum(len(self.members[c]) for c in ids))
+        if len(ids) <= self.LEAF:
+            self.items[node] = ids
+            for c in ids:
+                self.leaf_of[c] = node
+            return node
+        xs = [self.coords[c][0] for c in ids]; ys = [self.coords[c][1] for c in ids]
+        ax = 0 if max(xs) - min(xs) >= max(ys) - min(ys) else 1
+        ids.sort(key=lambda c: self.coords[c][ax])
+        mid = len(ids) // 2
+        self.axis[node] = ax
+        self.split[node] = self.coords[ids[mid]][ax]       # lewe <= split <= prawe
+        self.left[node] = self._build(ids[:mid], node)
+        self.right[node] = self._build(ids[mid:], node)
+        return node
+
+    def remove(self, i) -> None:
+        c = self.coord_of[i]
+        if self.members[c].pop(i, False) is not False:
+            node = self.leaf_of[c]
+            while node >= 0:
+                self.alive[node] -= 1
+                node = self.parent[node]
+
+    def nearest(self, p, want=1, exclude=None):
+        """`want` najbliższych żywych punktów (indeksy rosnąco wg odległości)."""
+        px, py = p[0], p[1]
+        axis, split, left, right, alive = self.axis, self.split, self.left, self.right, self.alive
+        items, members, coords = self.items, self.members, self.coords
+        best = []                       # kopiec (-d2, -i) – najdalszy z najlepszych na górze
+        worst = math.inf                # odległość² najdalszego z best, gdy best pełne
+        stack = [(0, 0.0)]              # (węzeł, dolne ograniczenie odległości²)
+        while stack:
+            node, bound = stack.pop()
+            if bound >= worst or not alive[node]:
+                continue
+            ax = axis[node]
+            while ax >= 0:              # zejście do bliższego liścia, dalsze poddrzewa na stos
+                diff = (px if ax == 0 else py) - split[node]
+                if diff < 0:
+                    node, far = left[node], right[node]
+                else:
+                    node, far = right[node], left[node]
+                if alive[far]:
+                    stack.append((far, diff * diff))
+                ax = axis[node]
+            for c in items[node]:
+                mem = members[c]
+                if not mem:
+                    continue
+                q = coords[c]
+                dx = q[0] - px; dy = q[1] - py
+                d2 = dx * dx + dy * dy
+                if d2 >= worst:
+                    continue
+                for i in islice(mem, want + 1):
+                    if i == exclude:
+                        continue
+                    if len(best) < want:
+                        heappush(best, (-d2, -i))
+                        if len(best) == want:
+                            worst = -best[0][0]
+                    elif d2 < worst:
+                        heapreplace(best, (-d2, -i))
+                        worst = -best[0][0]
+                    else:
+                        break
+        best.sort(reverse=True)
+        return [-i for _, i in best]
+
+def nearest_neighbor_order(points, start, deadline=None):
+    """Najbliższy sąsiad od start; po przekroczeniu deadline reszta w kolejności z pliku."""
+    tree = _KDTree(points)
+    order = []
+    cur = start
+    for n in range(len(points)):
+        if deadline is not None and n % 64 == 0 and time.perf_counter() > deadline:
+            taken = set(order)
+            order += [i for i in range(len(points)) if i not in taken]
+            break
+        i = tree.nearest(cur)[0]
+        tree.remove(i)
+        order.append(i)
+        cur = points[i]
+    return order
+
+def two_opt(points, order, start, end, deadline=None):
+    """
+    2-opt po listach sąsiadów; trasa [start] + order + [end], końce stałe.
+    end=None – koniec wolny (węzeł wirtualny o zerowej odległości).
+    deadline (perf_counter): wspólny z budową list sąsiadów – po nim trasa jak jest.
+    """
+    n = len(order)
+    if n < 3:
+        return order
+    if deadline is None:
+        deadline = time.perf_counter() + TIME_LIMIT
+    pts = [start] + [points[i] for i in order] + [end if end is not None else start]
+    m = len(pts) - 1                    # pts[0] i pts[m] stałe
+    tour = list(range(m + 1))           # tour[pozycja] = węzeł (indeks w pts)
+    pos = list(range(m + 1))
+    tree = _KDTree(pts[1:m])
+    neigh = [[]]
+    for v in range(1, m):
+        if v % 64 == 0 and time.perf_counter() > deadline:
+            return order
+        neigh.append([j + 1 for j in tree.nearest(pts[v], NEIGHBORS + 1, exclude=v - 1)])
+    neigh.append([])
+    dist = math.dist
+    free_end = end is None
+
+    def d(u, v):
+        if free_end and (u == m or v == m):
+            return 0.0
+        return dist(pts[u], pts[v])
+
+    def reverse(i, j):
+        tour[i:j + 1] = tour[i:j + 1][::-1]
+        for p in range(i, j + 1):
+            pos[tour[p]] = p
+
+    queue = deque(range(1, m))
+    queued = [False] + [True] * (m - 1) + [False]
+    while queue and time.perf_counter() < deadline:
+        a = queue.popleft()
+        queued[a] = False
+        improved = True
+        while improved:
+            improved = False
+            i = pos[a]
+            for c in neigh[a]:
+                j = pos[c]
+                if j > i + 1 and j < m:
+                    # (a,b)+(c,dn) -> (a,c)+(b,dn); odwrócenie [i+1..j]
+                    b, dn = tour[i + 1], tour[j + 1]
+                    delta = d(a, c) + d(b, dn) - d(a, b) - d(c, dn)
+                    lo, hi = i + 1, j
+                elif j < i - 1 and i < m:
+                    # (c,cn)+(a,an) -> (c,a)+(cn,an); odwrócenie [j+1..i]
+                    cn, an = tour[j + 1], tour[i + 1]
+                    delta = d(c, a) + d(cn, an) - d(c, cn) - d(a, an)
+                    lo, hi = j + 1, i
+                else:
+                    continue
+                if delta < -EPS:
+                    touched = (tour[lo - 1], tour[lo], tour[hi], tour[hi + 1])
+                    reverse(lo, hi)
+                    for v in touched:
+                        if 0 < v < m and not queued[v]:
+                            queued[v] = True
+                            queue.append(v)
+                    improved = True
+                    break
+    return [order[v - 1] for v in tour[1:m]]
+
+def optimize_cut_order(points, start=(0.0, 0.0), end=None, time_limit=TIME_LIMIT):
+    """
+    points: punkty przebicia wycięć (w kolejności z pliku), end: przebicie OUTER.
+    time_limit: wspólny limit na najbliższego sąsiada, listy sąsiadów i 2-opt.
+    Zwraca (kolejność indeksów, przejazd przed [mm], przejazd po [mm]).
+    """
+    deadline = time.perf_counter() + time_limit
+    identity = list(range(len(points)))
+    before = path_length(points, identity, start, end)
+    if len(points) < 3:
+        return identity, before, before
+    order = nearest_neighbor_order(points, start, deadline)
+    order = two_opt(points, order, start, end, deadline)
+    after = path_length(points, order, start, end)
+    if after >= before:
+        return identity, before, before
+    return order, before, after
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Deduplikacja identycznych plików DXF w jednym przebiegu.
+
+Treść = sekcje BLOCKS..ENTITIES (geometria) + XDATA NCTODXF z block_record modelspace
+(sekcja TABLES: licencja, metryki); nagłówek z datami/GUID oraz "generated=" różnią się
+przy każdym zapisie, więc nie wchodzą do hasha.
+Pierwszy plik o danej treści jest zapisywany normalnie, kolejne powstają jako:
+  reflink (Linux FICLONE – btrfs/XFS, macOS clonefile – APFS)
+  -> hardlink (ten sam wolumin; UWAGA: edycja jednego zmienia wszystkie)
+  -> zwykła kopia.
+"""
+
+import hashlib
+import os
+import shutil
+import sys
+from pathlib import Path
+
+from dxf_format import serialize
+
+METHODS = ("reflink", "hardlink")   # kolejność prób; na końcu zawsze kopia
+APPID   = "NCTODXF"                 # metadane programu (licencja, metryki) – nc1core.add_doc_metadata
+
+def content_key(data: bytes, xdata=()) -> str:
+    """Hash sekcji BLOCKS..ENTITIES (ASCII lub binarny DXF) i par XDATA (doc_xdata)."""
+    start = data.find(b"BLOCKS")
+    end = data.find(b"OBJECTS", max(start, 0))
+    if start < 0 or end < start:
+        start, end = 0, len(data)
+    h = hashlib.blake2b(data[start:end], digest_size=16)
+    for code, value in xdata:
+        h.update(f"\n{code}\n{value}".encode("utf-8"))
+    return h.hexdigest()
+
+def doc_xdata(doc, appid: str = APPID) -> list:
+    """XDATA appid na block_record modelspace (w TABLES) bez "generated=" – część treści pliku."""
+    try:
+        tags = doc.modelspace().block_record.get_xdata(appid)
+    except Exception:   # brak XDATA (DXFValueError) – bez metadanych
+        return []
+    return [(code, value) for code, value in tags if not str(value).startswith("generated=")]
+
+def reflink(src: Path, dst: Path) -> None:
+    """Kopia copy-on-write (współdzielone bloki); OSError, gdy system plików nie umie."""
+    if sys.platform.startswith("linux"):
+        import fcntl
+        FICLONE = 0x40049409
+        with open(src, "rb") as s, open(dst, "wb") as d:
+            try:
+                fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+            except OSError:
+                d.close()
+                dst.unlink()
+                raise
+    elif sys.platform == "darwin":
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        if libc.clonefile(os.fsencode(src), os.fsencode(dst), 0) != 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+    else:
+        raise OSError("reflink nieobsługiwany na tym systemie")
+
+def link_or_copy(src: Path, dst: Path, methods=METHODS) -> str:
+    """Tworzy dst jako reflink/hardlink src (wg methods), w ostateczności kopia."""
+    for method in methods:
+        try:
+            if method == "reflink":
+                reflink(src, dst)
+            elif method == "hardlink":
+                os.link(src, dst)
+            else:
+                continue
+            return method
+        except OSError:
+            continue
+    shutil.copyfile(src, dst)
+    return "copy"
+
+class OutputDeduper:
+    """Stan jednego przebiegu: hash treści -> pierwszy zapisany plik."""
+
+    def __init__(self, methods=METHODS):
+        self.methods = methods
+        self.first = {}
+        self.counts = {}
+        self.bytes_saved = 0
+
+    def save(self, doc, out_path: Path, fmt: str = "asc") -> str:
+        """Zapisuje doc (jak saveas) albo linkuje do identycznego pliku. Zwraca metodę."""
+        data = serialize(doc, fmt)
+        key = content_key(data, doc_xdata(doc))
+        src = self.first.get(key)
+        if src is not None and src.exists():
+            method = link_or_copy(src, out_path, self.methods)
+            self.bytes_saved += src.stat().st_size if method != "copy" else 0
+        else:
+            out_path.write_bytes(data)
+            self.first[key] = out_path
+            method = "write"
+        self.counts[method] = self.counts.get(method, 0) + 1
+        return method
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Format zapisu DXF: ASCII ("asc") lub binarny ("bin").
+
+Binarny DXF (ten sam model co ASCII, wartości zapisane binarnie) jest mniejszy
+i szybszy w zapisie/odczycie – czyta go ezdxf i większość CAM.
+benchmark_formats() mierzy w pamięci zapis i odczyt obu formatów dla raportu.
+"""
+
+import io
+import os
+import time
+
+import ezdxf
+from ezdxf.document import Drawing
+from ezdxf.lldxf.tagger import binary_tags_loader
+
+FORMATS = ("asc", "bin")
+
+def serialize(doc: Drawing, fmt: str = "asc") -> bytes:
+    """Bajty pliku DXF – identyczne z doc.saveas(..., fmt=fmt)."""
+    if fmt == "bin":
+        stream = io.BytesIO()
+        doc.write(stream, fmt="bin")
+        return stream.getvalue()
+    stream = io.StringIO()
+    doc.write(stream)
+    text = stream.getvalue()
+    if os.linesep != "\n":                       # saveas pisze w trybie tekstowym
+        text = text.replace("\n", os.linesep)
+    return text.encode(doc.output_encoding, errors="dxfreplace")
+
+def load(data: bytes, encoding: str = "utf-8") -> Drawing:
+    if data.startswith(b"AutoCAD Binary DXF"):
+        return Drawing.load(binary_tags_loader(data))
+    return ezdxf.read(io.StringIO(data.decode(encoding, errors="surrogateescape")))
+
+def benchmark_formats(doc: Drawing) -> dict:
+    """Zapis/odczyt ASCII vs binarny w pamięci: {asc_bytes, asc_write_ms, asc_read_ms, bin_...}."""
+    out = {}
+    for fmt in FORMATS:
+        t0 = time.perf_counter()
+        data = serialize(doc, fmt)
+        t1 = time.perf_counter()
+        load(data, doc.output_encoding)
+        t2 = time.perf_counter()
+        out[f"{fmt}_bytes"] = len(data)
+        out[f"{fmt}_write_ms"] = round((t1 - t0) * 1000.0, 2)
+        out[f"{fmt}_read_ms"] = round((t2 - t1) * 1000.0, 2)
+    return out
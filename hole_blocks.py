@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Powtarzalne otwory BO jako bloki DXF:
+- identyczne kształty (ta sama średnica; slot: średnica + wektor dx,dy) -> jedna
+  definicja bloku (geometria względem środka c1) + INSERT w każdym miejscu;
+  klucz (zaokrąglony do KEY_DECIMALS) tylko grupuje, blok ma wymiary pierwszego
+  otworu grupy z pliku,
+- opcjonalnie regularne siatki (stały krok w X i/lub Y) -> jeden MINSERT
+  (INSERT z column_count/row_count). MINSERT rysuje całą siatkę w miejscu pierwszego
+  otworu, więc nie łączy się z optymalizacją kolejności cięcia (main: CUT_ORDER
+  wyłącza HOLE_ARRAYS).
+
+Elementy w bloku leżą na tej samej warstwie co otwory (cutout), żeby CAM
+filtrujący po warstwie widział je tak samo jak zwykłe CIRCLE/LWPOLYLINE.
+"""
+
+from collections import Counter, defaultdict
+
+KEY_DECIMALS = 4     # dokładność porównania kształtów [mm]
+MIN_COUNT    = 2     # min. liczba identycznych otworów, żeby zrobić blok
+ARRAY_TOL    = 1e-3  # mm – odchyłka położenia w siatce MINSERT
+ARRAY_MIN    = 4     # min. liczba otworów w jednym MINSERT
+
+def hole_key(item):
+    """Klucz kształtu BO (bez położenia)."""
+    kind, c1, c2, dia = item
+    if kind == "slot":
+        return ("slot", round(dia, KEY_DECIMALS),
+                round(c2[0] - c1[0], KEY_DECIMALS), round(c2[1] - c1[1], KEY_DECIMALS))
+    return ("circle", round(dia, KEY_DECIMALS))
+
+def _block_name(key, used):
+    if key[0] == "slot":
+        base = f"BO_SLOT_{key[1]:g}_{key[2]:g}_{key[3]:g}"
+    else:
+        base = f"BO_D{key[1]:g}"
+    name, n = base, 1
+    while name in used:
+        n += 1
+        name = f"{base}_{n}"
+    return name
+
+def _runs(values, tol):
+    """Posortowane wartości -> serie arytmetyczne [(start, krok, [indeksy]), ...]."""
+    runs = []
+    i = 0
+    while i < len(values):
+        j = i + 1
+        if j < len(values):
+            step = values[j][0] - values[i][0]
+            while j + 1 < len(values) and abs(values[j + 1][0] - (values[i][0] + (j + 1 - i) * step)) <= tol:
+                j += 1
+            if step <= tol:
+                j = i
+        else:
+            j = i
+            step = 0.0
+        runs.append((values[i][0], step if j > i else 0.0, [v[1] for v in values[i:j + 1]]))
+        i = j + 1
+    return runs
+
+def find_arrays(positions, tol=ARRAY_TOL, min_count=ARRAY_MIN):
+    """
+    positions: [(x,y), ...] jednego kształtu -> lista siatek
+    (x0, y0, n_kol, krok_x, n_wier, krok_y, [indeksy]) z co najmniej min_count elementami.
+    """
+    # wiersze (ta sama Y) -> serie w X
+    rows = defaultdict(list)
+    for i, (x, y) in enumerate(positions):
+        rows[round(y / tol)].append((x, i))
+    row_runs = defaultdict(list)             # (x0, n, krok) -> [(y, indeksy)]
+    for members in rows.values():
+        members.sort()
+        for x0, step, idx in _runs(members, tol):
+            sig = (round(x0 / tol), len(idx), round(step / tol))
+            row_runs[sig].append((positions[idx[0]][1], idx))
+
+    # serie w X o tym samym podpisie -> serie w Y
+    arrays = []
+    for (_, ncol, _), items in row_runs.items():
+        items.sort()
+        ys = [(y, k) for k, (y, _) in enumerate(items)]
+        for y0, ystep, ks in _runs(ys, tol):
+            idx = [i for k in ks for i in items[k][1]]
+            if len(idx) < min_count:
+                continue
+            first = items[ks[0]][1]
+            x0 = positions[first[0]][0]
+            xstep = positions[first[1]][0] - x0 if ncol > 1 else 0.0
+            arrays.append((x0, y0, ncol, xstep, len(ks), ystep, idx))
+    return arrays
+
+class HoleBlocks:
+    """
+    Bloki dla powtarzalnych BO w jednym dokumencie.
+    draw(layout, item, layer) rysuje pojedynczy BO (np. add_bo_item).
+    """
+
+    def __init__(self, doc, bo_items, draw, layer="cutout", arrays=False):
+        self.layer = layer
+        self.names = {}
+        self.inserts = 0
+        self.arrays = 0
+        self._array_at = {}      # id(pierwszego elementu) -> siatka
+        self._skip = set()       # id() elementów narysowanych przez MINSERT
+
+        counts = Counter()
+        first = {}               # klucz -> pierwszy otwór grupy (jego wymiary trafiają do bloku)
+        for it in bo_items:
+            if it[3] > 0:
+                key = hole_key(it)
+                counts[key] += 1
+                first.setdefault(key, it)
+        used = {b.name for b in doc.blocks}
+        for key, n in counts.items():
+            if n < MIN_COUNT:
+                continue
+            name = _block_name(key, used)
+            used.add(name)
+            blk = doc.blocks.new(name)
+            kind, c1, c2, dia = first[key]
+            if kind == "slot":
+                draw(blk, ("slot", (0.0, 0.0), (c2[0] - c1[0], c2[1] - c1[1]), dia), layer)
+            else:
+                draw(blk, ("circle", (0.0, 0.0), None, dia), layer)
+            self.names[key] = name
+
+        if arrays:
+            groups = defaultdict(list)
+            for it in bo_items:
+                key = hole_key(it)
+                if key in self.names:
+                    groups[key].append(it)
+            for key, items in groups.items():
+                for arr in find_arrays([it[1] for it in items]):
+                    members = [items[i] for i in arr[6]]
+                    self._array_at[id(members[0])] = (key, arr)
+                    self._skip.update(id(it) for it in members[1:])
+
+    @property
+    def count(self) -> int:
+        return len(self.names)
+
+    def add(self, msp, item) -> bool:
+        """Wstawia BO jako INSERT/MINSERT; False = kształt bez bloku (rysuj zwykle)."""
+        key = hole_key(item)
+        name = self.names.get(key)
+        if name is None:
+            return False
+        if id(item) in self._skip:
+            return True
+        arr = self._array_at.get(id(item))
+        if arr is not None:
+            x0, y0, ncol, xstep, nrow, ystep, _ = arr[1]
+            msp.add_blockref(name, (x0, y0), dxfattribs={
+                "layer": self.layer,
+                "column_count": ncol, "column_spacing": xstep,
+                "row_count": nrow, "row_spacing": ystep,
+            })
+            self.arrays += 1
+            return True
+        msp.add_blockref(name, item[1], dxfattribs={"layer": self.layer})
+        self.inserts += 1
+        return True
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Licencja offline: fingerprint komputera i weryfikacja program.lic (obok EXE/skryptu)
+podpisem Ed25519 (main.verify_license_or_exit – także main_WIn.py, api, serwer).
+"""
+
+import sys, json, base64, platform, subprocess, uuid
+from pathlib import Path
+from datetime import datetime, date
+
+from nacl import signing, exceptions as nacl_exc
+
+def get_program_dir() -> Path:
+    if getattr(sys, "frozen", False):
+        return Path(sys.executable).resolve().parent
+    return Path(__file__).resolve().parent
+
+def get_machine_fingerprint() -> str:
+    sysname = platform.system().lower()
+    ident = None
+    try:
+        if sysname == "windows":
+            try:
+                import winreg
+                with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Cryptography") as k:
+                    ident, _ = winreg.QueryValueEx(k, "MachineGuid")
+                    ident = str(ident).strip()
+            except Exception:
+                try:
+                    out = subprocess.check_output(["wmic","csproduct","get","uuid"], text=True, stderr=subprocess.DEVNULL)
+                    parts = [p.strip() for p in out.splitlines() if p.strip() and "UUID" not in p]
+                    if parts:
+                        ident = parts[0]
+                except Exception:
+                    pass
+        elif sysname == "linux":
+            try:
+                ident = Path("/etc/machine-id").read_text().strip()
+            except Exception:
+                pass
+        elif sysname == "darwin":
+            try:
+                out = subprocess.check_output(["ioreg","-rd1","-c","IOPlatformExpertDevice"], text=True)
+                for line in out.splitlines():
+                    if "IOPlatformUUID" in line:
+                        ident = line.split("=",1)[1].strip().strip('"')
+                        break
+            except Exception:
+                pass
+    except Exception:
+        pass
+    if not ident:
+        ident = f"MAC-{uuid.getnode():012X}"
+    prefix = {"windows":"WIN","linux":"LIN","darwin":"MAC"}.get(sysname,"UNK")
+    return f"{prefix}|{ident}".upper()
+
+def canonical_bytes(payload: dict) -> bytes:
+    return json.dumps(payload, separators=(",", ":"), sort_keys=True).encode("utf-8")
+
+def verify_license_or_exit(public_key_b64: str, wait: bool = True):
+    """
+    Weryfikuje program.lic (obok EXE/skryptu), zwraca payload licencji (dict),
+    m.in. {"fp","name","expires", "features"}.
+    public_key_b64: klucz publiczny Ed25519 programu (Base64).
+    wait=False: przy błędzie bez "Naciśnij Enter" (serwer, uruchomienia skryptowe).
+    """
+    lic_path = get_program_dir() / "program.lic"
+    if not lic_path.exists():
+        fp = get_machine_fingerprint()
+        print(f"❌ Brak pliku licencji program.lic obok programu.\n   Fingerprint tego komputera: {fp}")
+        if wait:
+            input("\nNaciśnij Enter, aby zamknąć...")
+        sys.exit(1)
+
+    try:
+        data = json.loads(lic_path.read_text(encoding="utf-8"))
+        payload = data["payload"]
+        sig_b64 = data["sig"]
+    except Exception:
+        print("❌ Nieprawidłowy format pliku licencji (JSON).")
+        if wait:
+            input("\nNaciśnij Enter, aby zamknąć...")
+        sys.exit(1)
+
+    try:
+        vk = signing.VerifyKey(base64.b64decode(public_key_b64))
+    except Exception:
+        print("❌ PUBLIC_KEY_BASE64 w programie jest nieprawidłowy. Wklej klucz z generatora.")
+        if wait:
+            input("\nNaciśnij Enter, aby zamknąć...")
+        sys.exit(1)
+
+    msg = canonical_bytes(payload)
+    try:
+        vk.verify(msg, base64.b64decode(sig_b64))
+    except nacl_exc.BadSignatureError:
+        print("❌ Podpis licencji nieprawidłowy.")
+        if wait:
+            input("\nNaciśnij Enter, aby zamknąć...")
+        sys.exit(1)
+
+    # fingerprint
+    fp_here = get_machine_fingerprint()
+    if payload.get("fp","").upper() != fp_here:
+        print("❌ Licencja nie pasuje do tego komputera.")
+        print(f"   W licencji: {payload.get('fp')}\n   Ten komputer: {fp_here}")
+        if wait:
+            input("\nNaciśnij Enter, aby zamknąć...")
+        sys.exit(1)
+
+    # data ważności
+    exp = payload.get("expires")
+    if exp:
+        try:
+            if date.today() > datetime.strptime(exp, "%Y-%m-%d").date():
+                print(f"❌ Licencja wygasła: {exp}")
+                if wait:
+                    input("\nNaciśnij Enter, aby zamknąć...")
+                sys.exit(1)
+        except Exception:
+            pass
+
+    return payload
@@ -7,19 +7,38 @@ Metadane DXF:
 - $LASTSAVEDBY = "PRIMES sp. z o.o. / nctodxf"
 - XDATA (appid: NCTODXF) na MODEL_SPACE.block_record:
   program, owner, version, license_to, license_fp, license_expires, generated
+  (+ area_mm2, cut_outer_mm, cut_inner_mm, pierces, mass_kg gdy METRICS_XDATA)
 
 Łuki (AK/IK): bulge > 0 = CCW gdy k > 0. XY 1:1 z NC1.
 """
 
-import math, re, sys, json, base64, platform, subprocess, uuid
-from pathlib import Path
-from tkinter import Tk, filedialog
-from datetime import datetime, date
+import sys, csv, io, contextlib, functools, zipfile
+from pathlib import Path, PurePosixPath
 from ezdxf.document import Drawing
-import _cffi_backend  # wymusza zapakowanie przez PyInstaller
-
-import ezdxf
-from nacl import signing, exceptions as nacl_exc
+import _cffi_backend  # noqa: F401 – wymusza zapakowanie przez PyInstaller (PyNaCl -> cffi)
+
+import licensing
+
+from metrics import compute_part_metrics, format_metrics
+from validate import validate_part
+from cut_order import optimize_cut_order
+from simplify import simplify_points
+from part_hash import geometry_hash, group_duplicates, write_merged_parts
+from dedup_output import OutputDeduper, METHODS as DEDUP_METHODS
+from compact_dxf import compact_doc, dxf_size
+from dxf_format import benchmark_formats, serialize
+from sheets import SheetGroups, part_bbox
+from part_index import PartIndex
+from bom import BomWriter
+from part_cache import PartCache, source_key
+from part_model import Contour
+from nc1core import (sanitize, parse_header_fields, parse_nc1_for_name, parse_nc_geometry,
+                     new_dxf_doc, part_geometry)
+from nc1core import draw_part as core_draw_part, add_doc_metadata as core_doc_metadata
+from prenest import prenest_group, write_prenest_report, write_layout_dxf
+from zip_io import ZipOutput, ZipMember, ZipReaders, is_zip, lazy_members, read_members, zip_members
+from staging import Stager, stage_path
+from schedule import fifo_plan, plan, run_plan, scan_cost, size_cost
 
 # ====== KONFIG / BRAND ======
 PROGRAM_NAME    = "nctodxf"
@@ -33,397 +52,794 @@ PUBLIC_KEY_BASE64 = "cJrzx9tGemj8dGrZC1gVek+vohIP4iiJ2dYMJ5WyePI="
 TARGET_EXT = ".nc1"
 RECURSIVE  = False
 
-# --- stałe/regex ---
-EPS = 1e-9
-FLOAT_RE = r"[+-]?\d+(?:[.,]\d+)?"
-TAG_RE   = re.compile(r"^[A-Z]{2}\s*$")
-
-# ---------- fingerprint ----------
-def get_program_dir() -> Path:
-    if getattr(sys, "frozen", False):
-        return Path(sys.executable).resolve().parent
-    return Path(__file__).resolve().parent
-
-def get_machine_fingerprint() -> str:
-    sysname = platform.system().lower()
-    ident = None
-    try:
-        if sysname == "windows":
-            try:
-                import winreg
-                with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Cryptography") as k:
-                    ident, _ = winreg.QueryValueEx(k, "MachineGuid")
-                    ident = str(ident).strip()
-            except Exception:
-                try:
-                    out = subprocess.check_output(["wmic","csproduct","get","uuid"], text=True, stderr=subprocess.DEVNULL)
-                    parts = [p.strip() for p in out.splitlines() if p.strip() and "UUID" not in p]
-                    if parts:
-                        ident = parts[0]
-                except Exception:
-                    pass
-        elif sysname == "linux":
-            try:
-                ident = Path("/etc/machine-id").read_text().strip()
-            except Exception:
-                pass
-        elif sysname == "darwin":
-            try:
-                out = subprocess.check_output(["ioreg","-rd1","-c","IOPlatformExpertDevice"], text=True)
-                for line in out.splitlines():
-                    if "IOPlatformUUID" in line:
-                        ident = line.split("=",1)[1].strip().strip('"')
-                        break
-            except Exception:
-                pass
-    except Exception:
-        pass
-    if not ident:
-        ident = f"MAC-{uuid.getnode():012X}"
-    prefix = {"windows":"WIN","linux":"LIN","darwin":"MAC"}.get(sysname,"UNK")
-    return f"{prefix}|{ident}".upper()
-
-def canonical_bytes(payload: dict) -> bytes:
-    return json.dumps(payload, separators=(",", ":"), sort_keys=True).encode("utf-8")
+# Raport przebiegu (CSV w wybranym katalogu) i metryki w DXF
+REPORT_NAME    = "nctodxf_raport.csv"
+METRICS_XDATA  = False   # True → metryki części także w XDATA (appid NCTODXF)
+VALIDATE       = False   # True → walidacja geometrii (BO/IK poza OUTER, nakładki, łuki)
+CUT_ORDER      = False   # True → wycięcia (IK+BO) w kolejności min. przejazdów, OUTER na końcu
+SIMPLIFY_TOL   = 0.0     # mm; > 0 → usuwa duplikaty i współliniowe punkty AK/IK (łuki bez zmian)
+HOLE_BLOCKS    = False   # True → identyczne otwory BO jako jeden blok + INSERT
+HOLE_ARRAYS    = False   # True → (z HOLE_BLOCKS) regularne siatki otworów jako MINSERT (nie przy CUT_ORDER)
+
+# Duplikaty części w projekcie (hash geometrii) -> scalona lista z sumą ilości
+DUPLICATES     = False
+DUP_ROTATE     = False   # True → części obrócone też są duplikatami
+DUP_MIRROR     = False   # True → części w lustrze też są duplikatami
+MERGED_NAME    = "nctodxf_czesci.csv"
+
+# Identyczne DXF w przebiegu -> reflink/hardlink zamiast kolejnego zapisu (fallback: kopia)
+DEDUP_OUTPUT   = False
+
+# Profil zapisu DXF: "full" (domyślny ezdxf) lub "compact" (zaokrąglenie, minimalny nagłówek)
+DXF_PROFILE    = "full"
+DXF_DECIMALS   = 4
+DXF_FORMAT     = "asc"   # "asc" (ASCII) lub "bin" (binarny DXF – mniejszy, szybszy zapis/odczyt)
+DXF_BENCHMARK  = False   # True → w raporcie zapis/odczyt/rozmiar ASCII vs binarny
+
+# Zbiorcze DXF: jeden plik na gatunek + grubość (części jako bloki z atrybutem QTY)
+SHEET_GROUPS   = False
+SHEET_DIR      = "arkusze"   # podkatalog wybranego katalogu
+
+# Pre-nesting prostokątny (bbox × ilość) -> szacunek liczby arkuszy na gatunek + grubość
+PRENEST        = False
+PRENEST_SHEETS = [(3000, 1500), (6000, 2000)]   # mm – dostępne formaty arkuszy
+PRENEST_NAME   = "nctodxf_prenest.csv"
+PRENEST_DXF    = False   # True → układy arkuszy w DXF (podkatalog SHEET_DIR)
+
+# Indeks części w SQLite (zapytania: python part_index.py <plik> --grade S355 --thickness 12 --slots)
+PART_INDEX     = False
+INDEX_NAME     = "nctodxf_index.sqlite"
+
+# Zestawienie materiałowe (BOM): Parquet gdy jest pyarrow, inaczej CSV (zapis strumieniowy)
+BOM            = False
+BOM_NAME       = "nctodxf_bom"   # rozszerzenie .parquet / .csv dopisywane automatycznie
+BOM_FORMAT     = "auto"          # "auto", "parquet" lub "csv"
+
+# Cache sparsowanych części (binarny, mmap) – ponowny przebieg bez parsowania NC1
+PARSE_CACHE    = False
+CACHE_DIR      = ".nctodxf_cache"   # podkatalog wybranego katalogu
+
+# Wyniki poza katalogiem źródłowym (np. gdy źródła leżą na wolnym udziale sieciowym)
+OUTPUT_ROOT    = None    # np. Path("D:/dxf") – DXF w drzewie katalogów jak wejście; None → obok NC
+STAGING_DIR    = None    # np. Path("C:/Temp/nctodxf") – zapis na dysk lokalny, potem przeniesienie do celu
+STAGING_MOVE   = "background"   # "background" (partiami w trakcie przebiegu) lub "end" (po przebiegu)
+
+# Równoległy przebieg (-j N): "process" (pula procesów), "thread" (pula wątków – bez pickle
+# i startu procesów; realne przyspieszenie na CPython 3.13t bez GIL) lub "auto" (wątki bez GIL)
+BACKEND        = "auto"
+SCHEDULE       = "size"  # kolejność przy -j > 1: "size"/"scan" – najdroższe pliki pierwsze (koszt z rozmiaru
+                         # albo z linii AK/IK/BO), drobne w paczkach; "fifo" – kolejność katalogu
+IO_WORKERS     = 4       # równoległe odczyty NC przy -j > 1 (osobny limit od liczby procesów CPU)
+
+# Rdzeń konwersji (parse -> build_part -> build_dxf_doc) jest re-entrant: stan tylko w
+# argumentach i w dokumencie ezdxf tworzonym na wywołanie; parser/geometria/zapis NC1 we
+# wspólnym nc1core (niezmienne wzorce). Stałe KONFIG czytane w trakcie przebiegu – zmieniać przed nim.
+
+# ---------- licencja (licensing) ----------
+def verify_license_or_exit(wait: bool = True):
+    """licensing.verify_license_or_exit z kluczem PUBLIC_KEY_BASE64 programu."""
+    return licensing.verify_license_or_exit(PUBLIC_KEY_BASE64, wait=wait)
 
-def verify_license_or_exit():
+# ---------- utils DXF/NC ----------
+def pierce_point(cutout):
+    """Punkt przebicia wycięcia: początek konturu IK / środek otworu BO."""
+    kind, obj = cutout
+    if kind == "IK":
+        return obj[0][0], obj[0][1]
+    return obj[1]
+
+def add_doc_metadata(doc: Drawing, msp, lic_payload: dict, extra: dict | None = None) -> None:
+    """$LASTSAVEDBY i XDATA NCTODXF (nc1core.add_doc_metadata) z marką PROGRAM_*; extra – np. metryki."""
+    core_doc_metadata(doc, msp, lic_payload, (PROGRAM_NAME, PROGRAM_OWNER, PROGRAM_VERSION), extra)
+
+def read_nc_header(txt: str) -> dict:
+    """Pola nagłówka NC1 do nazwy/raportów (name = piece, uzupełniane nazwą pliku przy braku)."""
+    name, thickness, grade, qty = parse_nc1_for_name(txt, fallback_stem="")
+    piece, assembly, _, _, profile, type_code, _ = parse_header_fields(txt.splitlines())
+    return {"piece": piece, "name": name if piece else "", "assembly": assembly, "grade": grade,
+            "qty": qty, "profile": profile, "type_code": type_code, "thickness": thickness}
+
+def build_part(txt: str, thickness=None, grade=None, geometry=None) -> dict:
     """
-    Weryfikuje program.lic (obok EXE/skryptu), zwraca payload licencji (dict),
-    m.in. {"fp","name","expires", "features"}.
+    Parsowanie + geometria jednej części (bez zapisu):
+      {"outer": Contour (x,y,b), "cutouts": [("IK", Contour) | ("BO", Hole/Slot), ...],
+       "metrics": {...}, "info": {... do raportu}}
+    info: metryki (metrics.compute_part_metrics), "issues" (validate.validate_part)
+    gdy VALIDATE, "geom_hash" gdy DUPLICATES, przejazdy gdy CUT_ORDER.
+    geometry: gotowy PartModel (parse_nc_geometry, np. z cache) zamiast parsowania txt.
     """
-    lic_path = get_program_dir() / "program.lic"
-    if not lic_path.exists():
-        fp = get_machine_fingerprint()
-        print(f"❌ Brak pliku licencji program.lic obok programu.\n   Fingerprint tego komputera: {fp}")
-        input("\nNaciśnij Enter, aby zamknąć...")
-        sys.exit(1)
-
-    try:
-        data = json.loads(lic_path.read_text(encoding="utf-8"))
-        payload = data["payload"]
-        sig_b64 = data["sig"]
-    except Exception:
-        print("❌ Nieprawidłowy format pliku licencji (JSON).")
-        input("\nNaciśnij Enter, aby zamknąć...")
-        sys.exit(1)
+    outer_pts, inner_contours, bo_items = geometry or parse_nc_geometry(txt)
+
+    removed = 0
+    if SIMPLIFY_TOL > 0:
+        if outer_pts:
+            outer_pts, removed = simplify_points(outer_pts, SIMPLIFY_TOL)
+            outer_pts = Contour.from_points(outer_pts)
+        simplified = []
+        for pts in inner_contours:
+            pts, n = simplify_points(pts, SIMPLIFY_TOL)
+            simplified.append(Contour.from_points(pts))
+            removed += n
+        inner_contours = simplified
+
+    geo = part_geometry(outer_pts, inner_contours, bo_items)
+    outer_verts, inner_all, cutouts = geo["outer"], geo["inner"], geo["cutouts"]   # inner_all: indeks = IK #n
+    inner_verts = [v for v in inner_all if v]
+    metrics = compute_part_metrics(outer_verts, inner_verts, bo_items,
+                                   thickness=thickness, grade=grade)
+    info = dict(metrics)
+    if SIMPLIFY_TOL > 0:
+        info["vertices_removed"] = removed
+    if DUPLICATES:
+        info["geom_hash"] = geometry_hash(outer_pts, inner_contours, bo_items,
+                                          rotate=DUP_ROTATE, mirror=DUP_MIRROR)
+    if VALIDATE:
+        info["issues"] = validate_part(outer_pts, inner_contours, outer_verts, inner_all, bo_items)
+
+    # Wycięcia: IK, potem BO (kolejność z pliku) lub wg optymalizacji przejazdów
+    if CUT_ORDER and cutouts:
+        end = (outer_verts[0][0], outer_verts[0][1]) if outer_verts else None
+        order, before, after = optimize_cut_order([pierce_point(c) for c in cutouts], end=end)
+        cutouts = [cutouts[i] for i in order]
+        info["travel_before_mm"] = round(before, 1)
+        info["travel_after_mm"] = round(after, 1)
+
+    return {"outer": outer_verts, "cutouts": cutouts, "metrics": metrics, "info": info}
+
+def new_dxf_template():
+    """Dokument wielokrotnego użytku (tryb strumieniowy, serwer): (doc, msp, bloki bazowe)."""
+    doc, msp = new_dxf_doc()
+    return doc, msp, {b.name for b in doc.blocks}
+
+def reset_dxf_template(template):
+    """Czyści modelspace i bloki dodane przez poprzednią część -> (doc, msp)."""
+    doc, msp, base = template
+    msp.delete_all_entities()
+    for name in [b.name for b in doc.blocks if b.name not in base]:
+        doc.blocks.delete_block(name, safe=False)
+    return doc, msp
+
+def draw_part(doc: Drawing, layout, part: dict) -> dict:
+    """
+    nc1core.draw_part wg KONFIG: OUTER na końcu przy CUT_ORDER, bloki BO przy HOLE_BLOCKS.
+    MINSERT (HOLE_ARRAYS) rysuje całą siatkę naraz – przy CUT_ORDER wyłączony, żeby nie psuć kolejności.
+    """
+    return core_draw_part(doc, layout, part, outer_last=CUT_ORDER,
+                          hole_blocks=HOLE_BLOCKS, hole_arrays=HOLE_ARRAYS and not CUT_ORDER)
 
-    try:
-        vk = signing.VerifyKey(base64.b64decode(PUBLIC_KEY_BASE64))
-    except Exception:
-        print("❌ PUBLIC_KEY_BASE64 w programie jest nieprawidłowy. Wklej klucz z generatora.")
-        input("\nNaciśnij Enter, aby zamknąć...")
-        sys.exit(1)
+def build_dxf_doc(part: dict, lic_payload: dict, template=None):
+    """
+    Dokument DXF części (rysunek, metadane, profil) -> (doc, info do raportu).
+    template: new_dxf_template() – ten sam dokument dla kolejnych części (bez ezdxf.new).
+    """
+    info = dict(part["info"])
 
-    msg = canonical_bytes(payload)
-    try:
-        vk.verify(msg, base64.b64decode(sig_b64))
-    except nacl_exc.BadSignatureError:
-        print("❌ Podpis licencji nieprawidłowy.")
-        input("\nNaciśnij Enter, aby zamknąć...")
-        sys.exit(1)
-
-    # fingerprint
-    fp_here = get_machine_fingerprint()
-    if payload.get("fp","").upper() != fp_here:
-        print("❌ Licencja nie pasuje do tego komputera.")
-        print(f"   W licencji: {payload.get('fp')}\n   Ten komputer: {fp_here}")
-        input("\nNaciśnij Enter, aby zamknąć...")
-        sys.exit(1)
-
-    # data ważności
-    exp = payload.get("expires")
-    if exp:
-        try:
-            if date.today() > datetime.strptime(exp, "%Y-%m-%d").date():
-                print(f"❌ Licencja wygasła: {exp}")
-                input("\nNaciśnij Enter, aby zamknąć...")
-                sys.exit(1)
-        except Exception:
-            pass
+    doc, msp = reset_dxf_template(template) if template is not None else new_dxf_doc()
+    info.update(draw_part(doc, msp, part))
 
-    return payload  # <-- użyjemy do komunikatu i metadanych
+    # Metadane dokumentu
+    add_doc_metadata(doc, msp, lic_payload, extra=part["metrics"] if METRICS_XDATA else None)
 
-# ---------- utils DXF/NC ----------
-def sanitize(text: str) -> str:
-    if not text:
-        return "NA"
-    return re.sub(r'[\\/:*?"<>|\r\n]+', "_", text.strip())
+    # Profil compact (rozmiar przed zmianą liczony w pamięci – do raportu)
+    if DXF_PROFILE == "compact":
+        info["dxf_bytes_full"] = dxf_size(doc, DXF_FORMAT)
+        compact_doc(doc, DXF_DECIMALS)
+    if DXF_BENCHMARK:
+        info.update(benchmark_formats(doc))
+    return doc, info
 
-def fnum(s: str) -> float:
-    return float(s.replace(",", "."))
+def nc_to_dxf_bytes(txt: str, lic_payload: dict, stem: str = "", template=None) -> dict:
+    """
+    Jedna część w pamięci, bez zapisu plików:
+      {"name", "file_stem" (nazwa pliku bez rozszerzenia jak przy zmianie nazw),
+       "header" (pola nagłówka NC1), "dxf" (bajty DXF), "info" (jak w raporcie)}
+    stem: nazwa pliku źródłowego – używana, gdy nagłówek nie ma nazwy części.
+    template: jak w build_dxf_doc (jeden wątek na szablon).
+    """
+    header = read_nc_header(txt)
+    name = header["name"] or sanitize(stem)
+    thickness, grade, qty = header["thickness"], header["grade"], header["qty"]
+    part = build_part(txt, thickness=thickness, grade=grade)
+    doc, info = build_dxf_doc(part, lic_payload, template)
+    data = serialize(doc, DXF_FORMAT)
+    info["dxf_bytes"] = len(data)
+    return {"name": name, "file_stem": sanitize(f"{grade}-{thickness}-({name})-{qty}"),
+            "header": {**header, "name": name}, "dxf": data, "info": info}
+
+def generate_dxf_from_nc_text(txt: str, out_path: Path, lic_payload: dict,
+                              thickness=None, grade=None, dedup: OutputDeduper | None = None,
+                              part: dict | None = None) -> dict:
+    """
+    Zapisuje DXF i zwraca info do raportu (patrz build_part).
+    dedup: stan przebiegu – identyczny DXF powstaje jako link do wcześniejszego.
+    part: gotowy wynik build_part(txt) – bez ponownego parsowania.
+    """
+    if part is None:
+        part = build_part(txt, thickness=thickness, grade=grade)
+    doc, info = build_dxf_doc(part, lic_payload)
 
-def to_float(s: str):
+    # Zapis
     try:
-        return float(s.replace(",", "."))
+        if out_path.exists():
+            out_path.unlink()
     except Exception:
-        return None
-
-def norm_num(s: str) -> str | None:
-    v = to_float(s)
-    if v is None:
-        return None
-    return f"{v:.3f}".rstrip("0").rstrip(".")
-
-def parse_header_fields(lines):
-    try:
-        st_idx = next(i for i, ln in enumerate(lines) if ln.strip().upper() == "ST")
-    except StopIteration:
-        st_idx = -1
-    seq = []
-    src = lines[st_idx+1:] if st_idx >= 0 else lines
-    for ln in src[:30]:
-        s = ln.strip()
-        if not s or s.startswith("**"):
-            continue
-        seq.append(s)
-        if len(seq) >= 9:
-            break
-    ID         = seq[0] if len(seq) > 0 else ""
-    type_code  = seq[1] if len(seq) > 1 else ""
-    piece      = seq[2] if len(seq) > 2 else ""
-    assembly   = seq[3] if len(seq) > 3 else ""
-    grade      = seq[4] if len(seq) > 4 else ""
-    qty        = seq[5] if len(seq) > 5 else ""
-    profile    = seq[6] if len(seq) > 6 else ""
-    try:
-        b_idx = next(i for i, ln in enumerate(lines) if ln.strip().upper() == "B")
-    except StopIteration:
-        b_idx = -1
-    return piece, assembly, grade, qty, profile, type_code, b_idx
-
-def parse_thickness_from_B(lines, b_idx):
-    if b_idx < 0:
-        return None
-    vals = []
-    for ln in lines[b_idx+1:b_idx+1+20]:
-        s = ln.strip()
-        if not s:
-            continue
-        m = re.search(r'([+-]?\d+(?:[.,]\d+)?)', s)
-        if m:
-            vals.append(m.group(1))
-        if len(vals) >= 12:
-            break
-    if len(vals) >= 3:
-        return norm_num(vals[2])
-    return None
-
-def pick_qty_simple(qty_str: str) -> str:
+        pass
+    if dedup is not None:
+        info["dxf_write"] = dedup.save(doc, out_path, fmt=DXF_FORMAT)
+    else:
+        doc.saveas(out_path, fmt=DXF_FORMAT)
+    info["dxf_bytes"] = out_path.stat().st_size
+    return info
+
+def write_run_report(rows: list[dict], path: Path) -> None:
+    """Raport przebiegu: jeden wiersz na plik (CSV ; – pod polski Excel)."""
+    fields = []
+    for row in rows:
+        for key in row:
+            if key not in fields:
+                fields.append(key)
+    with path.open("w", encoding="utf-8-sig", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=fields, delimiter=";")
+        w.writeheader()
+        w.writerows(rows)
+
+# ---------- przebieg wsadowy ----------
+NC_SUFFIXES = (".nc", ".nc1", ".dstv")
+
+# stałe przekazywane do procesów roboczych (api.convert_many, run_batch z workers > 1)
+SETTINGS = (
+    "METRICS_XDATA", "VALIDATE", "CUT_ORDER", "SIMPLIFY_TOL", "HOLE_BLOCKS", "HOLE_ARRAYS",
+    "DUPLICATES", "DUP_ROTATE", "DUP_MIRROR", "DXF_PROFILE", "DXF_DECIMALS", "DXF_FORMAT",
+    "DXF_BENCHMARK", "TARGET_EXT",
+)
+
+def current_settings() -> dict:
+    return {key: globals()[key] for key in SETTINGS}
+
+def apply_settings(settings: dict) -> None:
+    globals().update({k: v for k, v in settings.items() if k in SETTINGS})
+
+def find_candidates(roots, recursive: bool | None = None) -> list[Path]:
+    """Pliki NC w katalogach roots (archiwa .zip pomijane); recursive None → RECURSIVE."""
+    recursive = RECURSIVE if recursive is None else recursive
+    globber = "**/*" if recursive else "*"
+    return [p for root in roots if not is_zip(Path(root)) for p in sorted(Path(root).glob(globber))
+            if p.is_file() and p.suffix.lower() in NC_SUFFIXES]
+
+def process_file(p: Path, lic: dict, rename: bool = True, dxf: bool = True, out_dir: Path | None = None,
+                 dedup: OutputDeduper | None = None, cache: PartCache | None = None,
+                 data: bytes | None = None, emit: bool = False, stage_dir: Path | None = None,
+                 before_rename=None) -> dict:
+    """
+    Jedna część: zmiana nazwy NC + DXF. Bez wypisywania – komunikaty w "log"
+    jako (czy_błąd, tekst), żeby procesy robocze nie mieszały wyjścia.
+    data: gotowa treść NC albo ZipMember (pozycja ZIP; p to wtedy ścieżka w archiwum).
+    emit: nic nie jest zapisywane ani przemianowywane na dysku – NC pod nową nazwą
+          i DXF trafiają do "outputs" jako (nazwa pliku, bajty).
+    stage_dir: DXF zapisywany w katalogu roboczym; (robocza, docelowa) w "staged" – przenosi wywołujący,
+               utworzone katalogi robocze w "staged_dirs" (Stager.add_dirs – sprzątanie).
+    before_rename(p, target): wywoływane tuż przed zmianą nazwy na dysku (dziennik w shard.py).
+    -> {"row", "part", "header", "nc_path", "dxf_path", "log", "renamed", "errors", "outputs", "staged",
+        "staged_dirs"}
+    """
+    log = []
+    res = {"row": None, "part": None, "header": None, "nc_path": p, "dxf_path": None,
+           "log": log, "renamed": 0, "errors": 0, "outputs": [], "staged": [], "staged_dirs": []}
     try:
-        q = int(qty_str.strip())
-        return str(q if q > 0 else 1)
-    except Exception:
-        return "1"
-
-def pick_grade_simple(grade: str, lines):
-    if grade and grade.strip():
-        return grade.strip().upper()
-    patterns = [r'\bS[2-9][0-9]{2}[A-Z0-9]{0,3}\b', r'\bA36\b', r'\b1\.[0-9]{4}\b']
-    for rx in patterns:
-        pat = re.compile(rx, re.IGNORECASE)
-        for ln in lines[:60]:
-            m = pat.search(ln)
-            if m:
-                return m.group(0).upper()
-    return "NA"
-
-def parse_nc1_for_name(text: str, fallback_stem: str):
-    lines = text.splitlines()
-    piece, assembly, grade_raw, qty_raw, profile, type_code, b_idx = parse_header_fields(lines)
-    name = piece if piece else fallback_stem
-    thickness = parse_thickness_from_B(lines, b_idx)
-    grade = pick_grade_simple(grade_raw, lines)
-    qty = pick_qty_simple(qty_raw)
-    name = sanitize(name)
-    grade = sanitize(grade)
-    thickness = sanitize(thickness if thickness else "NA")
-    return name, thickness, grade, qty
-
-def tokenize_blocks(text: str):
-    lines = text.splitlines()
-    cur_tag = None
-    cur = []
-    for ln in lines:
-        s = ln.strip()
-        if TAG_RE.fullmatch(s):
-            if cur_tag is not None:
-                yield cur_tag, cur
-                cur = []
-            cur_tag = s
-            if cur_tag == "EN":
-                break
+        if data is None:
+            raw = p.read_bytes()
         else:
-            if cur_tag is not None:
-                cur.append(ln)
-    if cur_tag is not None and cur_tag != "EN":
-        yield cur_tag, cur
-
-def parse_points_k(block_lines):
-    pts = []
-    for ln in block_lines:
-        nums = re.findall(FLOAT_RE, ln)
-        if len(nums) >= 2:
-            x = fnum(nums[0]); y = fnum(nums[1])
-            k = fnum(nums[2]) if len(nums) >= 3 else 0.0
-            pts.append((x,y,k))
-    return pts
-
-def bulge_from_points_radius(p1, p2, r, ccw=True):
-    d = math.dist(p1, p2)
-    if r < EPS:
-        return 0.0
-    arg = max(-1.0, min(1.0, d/(2.0*r)))
-    theta = 2.0 * math.asin(arg)
-    b = math.tan(theta/4.0)
-    return b if ccw else -b
-
-def build_xyb_from_points(pts):
-    n = len(pts)
-    if n < 2:
-        return []
-    out = []
-    for i in range(n):
-        x,y,k = pts[i]
-        x2,y2,_ = pts[(i+1)%n]
-        if abs(k) < EPS:
-            b = 0.0
+            raw = data.read() if isinstance(data, ZipMember) else data
+        # jak read_text(): utf-8 z zamianą błędnych bajtów, uniwersalne końce linii
+        txt = raw.decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", "\n")
+    except Exception as e:
+        log.append((True, f"⚠️  {p.name}: błąd odczytu ({e})"))
+        res["errors"] = 1
+        return res
+
+    key = source_key(txt.encode("utf-8")) if cache is not None else None
+    cached = cache.get(key) if cache is not None else None
+    if cached is not None:
+        header, geometry = cached
+    else:
+        header, geometry = read_nc_header(txt), None
+    name = header["name"] or sanitize(p.stem)
+    thickness, grade, qty = header["thickness"], header["grade"], header["qty"]
+    new_stem = f"{grade}-{thickness}-({name})-{qty}"
+    new_name = sanitize(new_stem) + TARGET_EXT
+    target = p.with_name(new_name)
+
+    final_nc_path = p
+    if rename and emit:
+        if target.name != p.name:
+            log.append((False, f"✅ {p.name}  ->  {target.name}"))
+            res["renamed"] = 1
         else:
-            r = abs(k)
-            ccw = (k > 0)
-            b = bulge_from_points_radius((x,y),(x2,y2), r, ccw=ccw)
-        out.append((x,y,b))
-    return out
-
-def add_slot_capsule(msp, c1, c2, dia, layer="cutout"):
-    x1, y1 = c1
-    x2, y2 = c2
-    r = dia / 2.0
-    dx, dy = (x2 - x1, y2 - y1)
-    L = math.hypot(dx, dy)
-    if L < EPS:
-        if r > 0:
-            msp.add_circle((x1, y1), r, dxfattribs={"layer": layer})
-        return
-    nx, ny = -dy / L, dx / L   # normalny CCW
-    P0 = (x1 - nx*r, y1 - ny*r)
-    P1 = (x2 - nx*r, y2 - ny*r)
-    P2 = (x2 + nx*r, y2 + ny*r)
-    P3 = (x1 + nx*r, y1 + ny*r)
-    verts_xyb = [
-        (P0[0], P0[1], 0.0),
-        (P1[0], P1[1], 1.0),
-        (P2[0], P2[1], 0.0),
-        (P3[0], P3[1], 1.0),
-    ]
-    msp.add_lwpolyline(verts_xyb, format="xyb", close=True, dxfattribs={"layer": layer})
-
-def add_doc_metadata(doc: Drawing, msp, lic_payload: dict) -> None:
-    """Ustawia $LASTSAVEDBY i XDATA (appid NCTODXF) z informacjami o pochodzeniu."""
-    # 1) $LASTSAVEDBY
-    try:
-        doc.header["$LASTSAVEDBY"] = f"{PROGRAM_OWNER} / {PROGRAM_NAME}"
-    except Exception:
-        pass
+            log.append((False, f"=  {p.name} (już poprawna)"))
+        final_nc_path = PurePosixPath(target.name)
+        res["outputs"].append((target.name, raw))
+    elif rename:
+        try:
+            if target.name != p.name:
+                if target.exists() and target != p:
+                    target.unlink()
+                if before_rename is not None:
+                    before_rename(p, target)
+                p.rename(target)
+                log.append((False, f"✅ {p.name}  ->  {target.name}"))
+                res["renamed"] = 1
+                final_nc_path = target
+            else:
+                log.append((False, f"=  {p.name} (już poprawna)"))
+        except Exception as e:
+            log.append((True, f"❌ {p.name}: błąd zmiany nazwy ({e})"))
+            res["errors"] += 1
+
+    # DXF obok NC (nazwa po zmianie) albo w out_dir; bez zmiany nazw – nazwa docelowa
+    dxf_name = (final_nc_path if rename else target).stem + ".dxf"
+    out_dxf = PurePosixPath(dxf_name) if emit else (out_dir or final_nc_path.parent) / dxf_name
+    row = {"source": p.name, "nc": final_nc_path.name, "dxf": out_dxf.name if dxf else "",
+           "name": name, "grade": grade, "thickness": thickness, "qty": qty}
+    res.update(row=row, header={**header, "piece": header["piece"] or name},
+               nc_path=final_nc_path, dxf_path=out_dxf if dxf else None)
+    if not dxf:
+        row.update(status="ok")
+        return res
 
-    # 2) AppID do XDATA
     try:
-        doc.appids.add("NCTODXF")
-    except ezdxf.DXFTableEntryError:
-        pass  # już istnieje
-
-    # 3) Zestaw metadanych jako XDATA na block_record modelspace (nie-rysowalne)
+        if cache is not None and geometry is None:
+            geometry = parse_nc_geometry(txt)
+            cache.put(key, header, geometry)
+        part = build_part(txt, thickness=thickness, grade=grade, geometry=geometry)
+        if emit:
+            doc, info = build_dxf_doc(part, lic)
+            blob = serialize(doc, DXF_FORMAT)
+            info["dxf_bytes"] = len(blob)
+            res["outputs"].append((dxf_name, blob))
+        elif stage_dir is not None:
+            local = stage_path(stage_dir, out_dxf, res["staged_dirs"])
+            info = generate_dxf_from_nc_text(txt, local, lic_payload=lic, dedup=dedup, part=part)
+            res["staged"].append((local, out_dxf))
+        else:
+            if out_dir is not None:
+                out_dir.mkdir(parents=True, exist_ok=True)
+            info = generate_dxf_from_nc_text(txt, out_dxf, lic_payload=lic, dedup=dedup, part=part)
+        res["part"] = part
+        log.append((False, f"   ↳ DXF: {out_dxf.name} ✔  ({format_metrics(info)})"))
+        if info.get("vertices_removed"):
+            log.append((False, f"   ↳ uproszczono kontury: -{info['vertices_removed']} wierzchołków"))
+        if info.get("hole_blocks"):
+            log.append((False, f"   ↳ bloki otworów: {info['hole_blocks']} (INSERT {info['hole_inserts']}, "
+                               f"MINSERT {info['hole_arrays']})"))
+        if "dxf_bytes_full" in info:
+            full, size = info["dxf_bytes_full"], info["dxf_bytes"]
+            log.append((False, f"   ↳ compact: {full / 1024:.1f} → {size / 1024:.1f} KiB "
+                               f"(-{100.0 * (full - size) / max(full, 1):.0f}%)"))
+        if "travel_after_mm" in info:
+            log.append((False, f"   ↳ kolejność cięcia: przejazdy {info['travel_before_mm']:.0f} → "
+                               f"{info['travel_after_mm']:.0f} mm"))
+        issues = info.pop("issues", None)
+        if issues is not None:
+            for msg in issues:
+                log.append((False, f"   ⚠️  {msg}"))
+            info["issues"] = len(issues)
+            info["issue_details"] = " | ".join(issues)
+        row.update(status="ok", **info)
+    except Exception as e:
+        log.append((True, f"   ↳ DXF: {out_dxf.name} ✖  ({e})"))
+        res["errors"] += 1
+        row.update(status=f"błąd: {e}")
+    return res
+
+def _process_file_job(job, cache: PartCache | None = None) -> dict:
+    """process_file w procesie/wątku roboczym (argumenty w krotce – dla Executor.map)."""
+    p, lic, rename, dxf, out_dir, cache_dir, data, emit, stage_dir = job
+    if cache is None and cache_dir:
+        cache = PartCache(cache_dir)
+    return process_file(p, lic, rename, dxf, out_dir, cache=cache, data=data, emit=emit, stage_dir=stage_dir)
+
+def _process_chunk_job(jobs, cache: PartCache | None = None) -> list[dict]:
+    """Paczka zadań w jednym wywołaniu (mniej narzutu na drobne pliki)."""
+    return [_process_file_job(job, cache) for job in jobs]
+
+def _load_job(job, zips: ZipReaders | None = None):
+    """
+    Odczyt treści NC (plik albo ZipMember) przed wysłaniem do puli (wątki I/O);
+    błąd odczytu zgłosi process_file. zips: archiwa otwarte raz na przebieg.
+    """
+    data = job[6]
+    if isinstance(data, bytes):
+        return job
     try:
-        lic_name    = lic_payload.get("name", "")
-        lic_fp      = lic_payload.get("fp", "")
-        lic_expires = lic_payload.get("expires") or "bezterminowo"
-        now_iso     = datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
-
-        xdata = [
-            (1000, f"program={PROGRAM_NAME}"),
-            (1000, f"owner={PROGRAM_OWNER}"),
-            (1000, f"version={PROGRAM_VERSION}"),
-            (1000, f"license_to={lic_name}"),
-            (1000, f"license_fp={lic_fp}"),
-            (1000, f"license_expires={lic_expires}"),
-            (1000, f"generated={now_iso}"),
-        ]
-        msp.block_record.set_xdata("NCTODXF", xdata)
-    except Exception:
-        pass
-
-def generate_dxf_from_nc_text(txt: str, out_path: Path, lic_payload: dict):
-    outer_pts = None
-    inner_contours = []
-    bo_items = []
-
-    for tag, lines in tokenize_blocks(txt):
-        if tag == "AK":
-            outer_pts = parse_points_k(lines)
-        elif tag == "IK":
-            pts = parse_points_k(lines)
-            if pts:
-                inner_contours.append(pts)
-        elif tag == "BO":
-            for ln in lines:
-                nums = re.findall(FLOAT_RE, ln)
-                is_slot = ("l" in ln.lower())
-                if is_slot and len(nums) >= 6:
-                    x = fnum(nums[0]); y = fnum(nums[1]); dia = fnum(nums[2])
-                    dx = fnum(nums[4]); dy = fnum(nums[5])
-                    c1 = (x, y); c2 = (x + dx, y + dy)
-                    bo_items.append(("slot", c1, c2, dia))
-                elif len(nums) >= 3:
-                    x = fnum(nums[0]); y = fnum(nums[1]); dia = fnum(nums[2])
-                    bo_items.append(("circle", (x, y), None, dia))
-
-    doc = ezdxf.new("R2010")
-    msp = doc.modelspace()
-
-    # Warstwy
-    if "OUTER" not in doc.layers:
-        doc.layers.add("OUTER")
-    if "cutout" not in doc.layers:
-        doc.layers.add("cutout", color=4)  # cyan
+        if data is None:
+            data = job[0].read_bytes()
+        else:
+            data = zips.read(data) if zips is not None else data.read()
+    except (OSError, KeyError, zipfile.BadZipFile):
+        return job
+    return job[:6] + (data,) + job[7:]
+
+def _scan_job_cost(job, zips: ZipReaders | None = None) -> float:
+    """scan_cost pliku – treść czytana i od razu zwalniana (w pamięci tylko pliki w odczycie)."""
+    data = _load_job(job, zips)[6]
+    return scan_cost(data if isinstance(data, bytes) else b"")
+
+def job_costs(jobs, schedule: str | None = None, io_workers: int | None = None,
+              zips: ZipReaders | None = None) -> list[float]:
+    """
+    Przewidywany koszt zadań (jednostki schedule.py); "scan" czyta pliki strumieniowo.
+    schedule/io_workers None → SCHEDULE/IO_WORKERS w chwili wywołania.
+    """
+    schedule = SCHEDULE if schedule is None else schedule
+    io_workers = IO_WORKERS if io_workers is None else io_workers
+    if schedule == "scan":
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=max(1, io_workers)) as io:
+            return list(io.map(functools.partial(_scan_job_cost, zips=zips), jobs))
+    costs = []
+    for job in jobs:
+        data = job[6]
+        try:
+            if data is None:
+                size = job[0].stat().st_size
+            else:
+                size = data.size if isinstance(data, ZipMember) else len(data)
+        except OSError:
+            size = 0
+        costs.append(size_cost(size))
+    return costs
+
+def resolve_backend(backend: str | None = None) -> str:
+    """"auto" -> "thread" na CPython bez GIL (3.13t), inaczej "process"; None → BACKEND."""
+    backend = BACKEND if backend is None else backend
+    if backend == "auto":
+        gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+        return "process" if gil else "thread"
+    if backend not in ("process", "thread"):
+        raise ValueError(f"nieznany backend: {backend!r}")
+    return backend
+
+def run_batch(roots, lic: dict, recursive: bool | None = None, out_dir: Path | None = None,
+              rename: bool = True, dxf: bool = True, workers: int = 1, cache: bool | None = None,
+              report_path: Path | None = None, quiet: bool = False, zip_out: Path | None = None,
+              staging: Path | None = None, staging_move: str | None = None,
+              backend: str | None = None, schedule: str | None = None) -> dict:
+    """
+    Przebieg wsadowy po katalogach i archiwach .zip roots (bez okien i input()).
+    out_dir: DXF w drzewie podkatalogów jak wejście; raporty, indeks, cache i arkusze
+    w out_dir albo w pierwszym katalogu.
+    workers > 1: pliki w puli procesów lub wątków (backend, patrz BACKEND; DEDUP_OUTPUT wtedy wyłączone),
+    w kolejności wg kosztu (schedule, patrz SCHEDULE).
+    zip_out: NC po zmianie nazwy i DXF do jednego archiwum (źródła bez zmian);
+    archiwum na wejściu bez zip_out – wyniki do out_dir albo katalogu o nazwie archiwum.
+    Przy kilku roots ścieżki w zip_out/out_dir dostają przedrostek nazwy katalogu/archiwum.
+    staging: DXF/NC/ZIP zapisywane lokalnie i przenoszone do celu partiami – w tle
+    (staging_move="background") albo po przebiegu ("end"; wymuszone przy DEDUP_OUTPUT).
+    Parametry None → stałe KONFIG (RECURSIVE, PARSE_CACHE, STAGING_DIR, STAGING_MOVE, BACKEND,
+    SCHEDULE) czytane w chwili wywołania, jak BOM czy PART_INDEX.
+    -> {"files", "renamed", "dxf_ok", "dxf_err", "errors"}
+    """
+    recursive = RECURSIVE if recursive is None else recursive
+    cache = PARSE_CACHE if cache is None else cache
+    staging = STAGING_DIR if staging is None else staging
+    staging_move = STAGING_MOVE if staging_move is None else staging_move
+    backend = BACKEND if backend is None else backend
+    schedule = SCHEDULE if schedule is None else schedule
+
+    def say(*args):
+        if not quiet:
+            print(*args)
+
+    def warn(msg):
+        print(msg, file=sys.stderr if quiet else sys.stdout)
+
+    roots = [Path(r) for r in roots]
+    if out_dir is None and zip_out is not None:
+        base = zip_out.parent
+    elif out_dir is None and is_zip(roots[0]):
+        base = roots[0].with_suffix("")
+    else:
+        base = out_dir or roots[0]
+    stats = {"files": 0, "renamed": 0, "dxf_ok": 0, "dxf_err": 0, "errors": 0}
+    listing = {}
+    for root in roots:
+        try:
+            listing[root] = zip_members(root, NC_SUFFIXES) if is_zip(root) else find_candidates([root], recursive)
+        except Exception as e:
+            warn(f"⚠️  {root.name}: błąd odczytu archiwum ({e})")
+            stats["errors"] += 1
+    if not any(listing.values()):
+        say("Brak plików .nc/.nc1/.dstv w wybranym katalogu.")
+        return stats
+    if dxf and HOLE_BLOCKS and HOLE_ARRAYS and CUT_ORDER:
+        say("ℹ️  HOLE_ARRAYS pominięte: przy CUT_ORDER otwory idą jako INSERT w kolejności cięcia.")
+    base.mkdir(parents=True, exist_ok=True)
+
+    def sources(lazy: bool = False):
+        """
+        (ścieżka, treść | None, cel "outputs" | None, katalog DXF | None = obok NC);
+        lazy: pozycje ZIP jako ZipMember – treść czyta dopiero okno puli (_load_job).
+        """
+        for root, items in listing.items():
+            top = PurePosixPath(root.stem if is_zip(root) else root.name) if len(roots) > 1 else PurePosixPath()
+            if is_zip(root):
+                members = zip(items, lazy_members(root, items)) if lazy else read_members(root, items)
+                for name, data in members:
+                    rel = top / PurePosixPath(name).parent
+                    dest = rel if zip_out is not None else (out_dir or root.with_suffix("")) / rel
+                    yield PurePosixPath(name), data, dest, None
+            else:
+                for p in items:
+                    rel = top / PurePosixPath(p.parent.relative_to(root).as_posix())
+                    if zip_out is not None:
+                        yield p, None, rel, None
+                    else:
+                        yield p, None, None, out_dir / rel if out_dir is not None else None
+
+    stager = None
+    if staging is not None:
+        staging = Path(staging)
+        stager = Stager(staging, background=staging_move == "background" and not DEDUP_OUTPUT,
+                        link_methods=DEDUP_METHODS if DEDUP_OUTPUT and workers <= 1 else None)
+    zip_writer = None
+    if zip_out is not None:
+        try:
+            zip_writer = ZipOutput(stager.local_path(zip_out) if stager is not None else zip_out)
+        except Exception as e:
+            warn(f"⚠️  ZIP: błąd otwarcia {zip_out} ({e})")
+            stats["errors"] += 1
+            return stats
+
+    report = []
+    # przy staging linki powstają najpierw lokalnie (hardlink), a w celu odtwarza je Stager
+    dedup = None
+    if DEDUP_OUTPUT and workers <= 1:
+        dedup = OutputDeduper(("hardlink",) if stager is not None else DEDUP_METHODS)
+    sheets = SheetGroups() if dxf and (SHEET_GROUPS or PRENEST) else None
+    index = None
+    if PART_INDEX:
+        try:
+            index = PartIndex(base / INDEX_NAME, base)
+        except Exception as e:
+            warn(f"⚠️  Indeks części: błąd otwarcia ({e})")
+            stats["errors"] += 1
+    part_cache = PartCache(base / CACHE_DIR) if cache else None
+    bom = None
+    if BOM:
+        try:
+            bom = BomWriter(base / BOM_NAME, None if BOM_FORMAT == "auto" else BOM_FORMAT)
+        except Exception as e:
+            warn(f"⚠️  BOM: błąd otwarcia ({e})")
+            stats["errors"] += 1
+
+    threads = workers > 1 and resolve_backend(backend) == "thread"
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+        cache_dir = base / CACHE_DIR if cache else None
+        zips = ZipReaders()
+        srcs = list(sources(lazy=True))   # plan kosztów potrzebuje pełnej listy (ZIP: bez treści)
+        jobs = [(p, lic, rename, dxf, odir, cache_dir, data, dest is not None, staging)
+                for p, data, dest, odir in srcs]
+        dests = [dest for _, _, dest, _ in srcs]
+        del srcs
+        if schedule == "fifo":
+            chunks = fifo_plan(len(jobs), workers)
+        else:
+            costs = job_costs(jobs, schedule, IO_WORKERS, zips=zips)
+            chunks = plan(costs, workers)
+        if threads:                   # wspólny PartCache, bez pickle argumentów i wyników
+            pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=PROGRAM_NAME)
+            fn = functools.partial(_process_chunk_job, cache=part_cache)
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=apply_settings,
+                                       initargs=(current_settings(),))
+            fn = _process_chunk_job
+        # wyniki w kolejności ukończenia (log, BOM, zapis od razu – w pamięci tylko okno paczek);
+        # raport i arkusze porządkowane wg indeksu wejścia po przebiegu
+        load = functools.partial(_load_job, zips=zips)
+        results = ((i, dests[i], res) for i, res in run_plan(pool, fn, jobs, chunks, load=load,
+                                                            io_workers=IO_WORKERS, window=4 * workers))
     else:
-        doc.layers.get("cutout").dxf.color = 4
-
-    # OUTER
-    if outer_pts:
-        verts = build_xyb_from_points(outer_pts)
-        if verts:
-            msp.add_lwpolyline(verts, format="xyb", close=True, dxfattribs={"layer": "OUTER"})
-
-    # IK
-    for pts in inner_contours:
-        iverts = build_xyb_from_points(pts)
-        if iverts:
-            msp.add_lwpolyline(iverts, format="xyb", close=True, dxfattribs={"layer": "cutout"})
-
-    # BO
-    for item in bo_items:
-        kind = item[0]
-        if kind == "circle":
-            _, (x, y), _, dia = item
-            r = dia / 2.0
-            if r > 0:
-                msp.add_circle((x, y), r, dxfattribs={"layer": "cutout"})
-        elif kind == "slot":
-            _, c1, c2, dia = item
-            add_slot_capsule(msp, c1, c2, dia, layer="cutout")
+        pool = None
+        results = ((i, dest, process_file(p, lic, rename, dxf, odir, dedup, part_cache,
+                                          data=data, emit=dest is not None, stage_dir=staging))
+                   for i, (p, data, dest, odir) in enumerate(sources()))
 
-    # Metadane dokumentu
-    add_doc_metadata(doc, msp, lic_payload)
+    report_order = []            # indeks wejścia wiersza raportu
+    sheet_parts = []             # (indeks, gatunek, grubość, nazwa, szt., część)
+    try:
+        for i, dest, res in results:
+            stats["files"] += 1
+            for is_err, msg in res["log"]:
+                if is_err:
+                    warn(msg)
+                else:
+                    say(msg)
+            stats["renamed"] += res["renamed"]
+            stats["errors"] += res["errors"]
+            for name, blob in res["outputs"]:
+                try:
+                    if zip_writer is not None:
+                        zip_writer.write(str(dest / name), blob)
+                    elif stager is not None:
+                        local = stager.local_path(dest / name)
+                        local.write_bytes(blob)
+                        stager.done(local, dest / name)
+                    else:
+                        dest.mkdir(parents=True, exist_ok=True)
+                        (dest / name).write_bytes(blob)
+                except Exception as e:
+                    warn(f"   ⚠️  {name}: błąd zapisu ({e})")
+                    stats["errors"] += 1
+            if stager is not None:
+                stager.add_dirs(res["staged_dirs"])
+                for local, final in res["staged"]:
+                    stager.done(local, final)
+            row, part = res["row"], res["part"]
+            if row is None:
+                continue
+            if dxf:
+                if part is not None:
+                    stats["dxf_ok"] += 1
+                else:
+                    stats["dxf_err"] += 1
+            report.append(row)
+            report_order.append(i)
+            if sheets is not None and part is not None:
+                sheet_parts.append((i, row["grade"], row["thickness"], row["name"], row["qty"], part))
+
+            header = res["header"]
+            if bom is not None:
+                bom.add({**header, **(part["metrics"] if part else {}),
+                         "nc": res["nc_path"].name, "dxf": res["dxf_path"].name if part else ""})
+            if index is not None and dest is None:     # indeks – tylko pliki na dysku obok NC
+                try:
+                    index.put(res["nc_path"], res["dxf_path"], row["source"], header, part)
+                except Exception as e:
+                    warn(f"   ⚠️  indeks: {e}")
+    except BaseException:
+        if bom is not None:             # przerwany przebieg – BOM domknięty do ostatniego wiersza
+            with contextlib.suppress(Exception):
+                bom.close()
+        raise
+    if pool is not None:
+        pool.shutdown()
+        zips.close()
+        report = [row for _, row in sorted(zip(report_order, report), key=lambda t: t[0])]
+    for _, *args in sorted(sheet_parts, key=lambda t: t[0]):
+        sheets.add(*args)
+    del sheet_parts
+    if zip_writer is not None:
+        try:
+            zip_writer.close()
+            if stager is not None:
+                stager.done(zip_writer.path, zip_out)
+            say(f"ZIP: {zip_writer.files} plików ({zip_writer.bytes / 1024:.0f} KiB przed kompresją) → {zip_out}")
+        except Exception as e:
+            warn(f"⚠️  ZIP: błąd zapisu {zip_out} ({e})")
+            stats["errors"] += 1
+    if stager is not None:
+        stager.close()
+        say(f"Przeniesiono z {staging}: {stager.moved} plików ({stager.bytes / 1024:.0f} KiB)")
+        for final, msg in stager.errors:
+            warn(f"⚠️  {final}: błąd przeniesienia ({msg})")
+        stats["errors"] += len(stager.errors)
+
+    say(f"\nGotowe. Zmieniono nazw: {stats['renamed']}. DXF OK: {stats['dxf_ok']}, błędów DXF: {stats['dxf_err']}.")
+    if part_cache is not None and (workers <= 1 or threads):
+        say(f"Cache części: trafienia {part_cache.hits}, nowe {part_cache.misses} ({base / CACHE_DIR})")
+    if bom is not None:
+        try:
+            bom.close()
+            say(f"BOM ({bom.fmt}): {bom.rows} pozycji → {bom.path}")
+        except Exception as e:
+            warn(f"⚠️  BOM: błąd zapisu ({e})")
+            stats["errors"] += 1
+    if index is not None:
+        try:
+            index.flush()
+            pruned = index.prune()
+            index.close()
+            say(f"Indeks części: zapisano {index.written}, bez zmian {index.skipped}, "
+                f"usunięto {pruned} → {base / INDEX_NAME}")
+        except Exception as e:
+            warn(f"⚠️  Indeks części: błąd zapisu ({e})")
+            stats["errors"] += 1
+    def finish_sheet(doc, msp, path):
+        add_doc_metadata(doc, msp, lic)
+        if DXF_PROFILE == "compact":
+            compact_doc(doc, DXF_DECIMALS)
+        doc.saveas(path, fmt=DXF_FORMAT)
+
+    if SHEET_GROUPS and sheets is not None:
+        try:
+            written = sheets.write_all(base / SHEET_DIR, new_dxf_doc, draw_part, finish_sheet)
+            say(f"Arkusze (gatunek/grubość): {len(written)} plików w {base / SHEET_DIR}")
+        except Exception as e:
+            warn(f"⚠️  Arkusze: błąd zapisu ({e})")
+            stats["errors"] += 1
+
+    if PRENEST and sheets is not None:
+        nest_rows = []
+        say("Pre-nesting (bbox):  gatunek-grubość  arkusz  szt.  arkuszy  wykorzystanie")
+        for (grade, thickness), group in sheets.groups.items():
+            parts = [(name, int(qty or 1), part_bbox(part),
+                      part["metrics"].get("area_mm2", 0.0)) for name, qty, part in group]
+            res = prenest_group(parts, PRENEST_SHEETS)
+            size = f"{res['sheet'][0]:g}x{res['sheet'][1]:g}"
+            util = round(100.0 * res["utilization"], 1)
+            say(f"  {grade}-{thickness:<14} {size:>10} {res['instances']:5d} {len(res['sheets']):8d} {util:12.1f}%")
+            if res["too_big"]:
+                say(f"  ⚠️  za duże na arkusz: {', '.join(sorted({parts[i][0] for i in res['too_big']}))}")
+            nest_rows.append({"grade": grade, "thickness": thickness, "sheet": size,
+                              "sheets": len(res["sheets"]), "instances": res["instances"],
+                              "too_big": len(res["too_big"]), "utilization_pct": util})
+            if PRENEST_DXF and res["sheets"]:
+                try:
+                    (base / SHEET_DIR).mkdir(parents=True, exist_ok=True)
+                    write_layout_dxf(base / SHEET_DIR / f"{grade}-{thickness}-nest.dxf", res, parts,
+                                     [part for _, _, part in group], new_dxf_doc, draw_part, finish_sheet)
+                except Exception as e:
+                    warn(f"⚠️  Układ arkuszy {grade}-{thickness}: błąd zapisu ({e})")
+                    stats["errors"] += 1
+        try:
+            write_prenest_report(nest_rows, base / PRENEST_NAME)
+            say(f"Raport pre-nestingu: {base / PRENEST_NAME}")
+        except Exception as e:
+            warn(f"⚠️  Pre-nesting: błąd zapisu ({e})")
+            stats["errors"] += 1
+
+    if DXF_PROFILE == "compact" and dxf:
+        full = sum(r.get("dxf_bytes_full", 0) for r in report)
+        size = sum(r.get("dxf_bytes", 0) for r in report if "dxf_bytes_full" in r)
+        say(f"DXF compact: {full / 1024:.0f} → {size / 1024:.0f} KiB "
+            f"(-{100.0 * (full - size) / max(full, 1):.0f}%).")
+
+    if DXF_BENCHMARK and dxf:
+        rows = [r for r in report if "asc_bytes" in r]
+        say("Benchmark DXF (suma):      ASCII      binarny")
+        for key, label, unit in (("bytes", "rozmiar", "KiB"), ("write_ms", "zapis", "ms"), ("read_ms", "odczyt", "ms")):
+            asc = sum(r[f"asc_{key}"] for r in rows)
+            bn = sum(r[f"bin_{key}"] for r in rows)
+            if unit == "KiB":
+                asc, bn = asc / 1024, bn / 1024
+            say(f"  {label:<8} [{unit:>3}]  {asc:12.1f} {bn:12.1f}")
+
+    if dedup is not None:
+        counts, saved = dedup.counts, dedup.bytes_saved
+        if stager is not None:                 # wynik w celu, nie w katalogu roboczym
+            counts = {"write": counts.get("write", 0), **stager.linked}
+            counts["copy"] = counts.get("copy", 0) + dedup.counts.get("copy", 0)
+            saved = stager.bytes_saved
+        linked = ", ".join(f"{m}: {n}" for m, n in sorted(counts.items()) if n)
+        say(f"Deduplikacja DXF: {linked or '-'}; zaoszczędzono {saved / 1024:.0f} KiB zapisu.")
+
+    if DUPLICATES and dxf:
+        merged = group_duplicates(report)
+        dups = sum(1 for g in merged if g["count"] > 1)
+        say(f"Unikalnych części: {len(merged)}, grup z duplikatami: {dups}.")
+        try:
+            write_merged_parts(merged, base / MERGED_NAME)
+            say(f"Scalona lista części: {base / MERGED_NAME}")
+        except Exception as e:
+            warn(f"⚠️  Lista części: błąd zapisu ({e})")
+            stats["errors"] += 1
 
-    # Zapis
+    report_path = report_path or base / REPORT_NAME
     try:
-        if out_path.exists():
-            out_path.unlink()
-    except Exception:
-        pass
-    doc.saveas(out_path)
+        write_run_report(report, report_path)
+        say(f"Raport: {report_path}")
+    except Exception as e:
+        warn(f"⚠️  Raport: błąd zapisu ({e})")
+        stats["errors"] += 1
+    return stats
 
 # ---------- main ----------
-def main():
+def main(pick_folder=None):
+    """
+    Tryb okienkowy: licencja, wybór katalogu, przebieg wsadowy (run_batch), "Naciśnij Enter".
+    pick_folder() -> ścieżka | None – własne okno wyboru (main_WIn.py); domyślnie tkinter.
+    """
     lic = verify_license_or_exit()
 
     # Komunikat branding/licencja:
@@ -433,64 +849,90 @@ def main():
     print(f"{PROGRAM_NAME} — właściciel: {PROGRAM_OWNER}")
     print(f"Licencja przypisana dla: {lic_to} — okres: {period}\n")
 
-    Tk().withdraw()
-    folder = filedialog.askdirectory(title="Wybierz katalog z plikami DSTV/NC")
+    if pick_folder is None:
+        from tkinter import Tk, filedialog      # tylko tryb okienkowy (api/serwer/CLI bez Tk)
+        Tk().withdraw()
+        folder = filedialog.askdirectory(title="Wybierz katalog z plikami DSTV/NC")
+    else:
+        folder = pick_folder()
     if not folder:
         print("❌ Nie wybrano katalogu – koniec programu.")
         sys.exit(0)
 
-    root = Path(folder)
-    globber = "**/*" if RECURSIVE else "*"
-    candidates = [p for p in root.glob(globber)
-                  if p.is_file() and p.suffix.lower() in (".nc", ".nc1", ".dstv")]
-
-    if not candidates:
-        print("Brak plików .nc/.nc1/.dstv w wybranym katalogu.")
-        input("\nNaciśnij Enter, aby zamknąć...")
-        return
-
-    renamed = 0
-    dxf_ok = 0
-    dxf_err = 0
-
-    for p in candidates:
-        try:
-            txt = p.read_text(encoding="utf-8", errors="replace")
-        except Exception as e:
-            print(f"⚠️  {p.name}: błąd odczytu ({e})")
-            continue
-
-        name, thickness, grade, qty = parse_nc1_for_name(txt, fallback_stem=p.stem)
-        new_stem = f"{grade}-{thickness}-({name})-{qty}"
-        new_name = sanitize(new_stem) + TARGET_EXT
-        target = p.with_name(new_name)
-
-        try:
-            if target.name != p.name:
-                if target.exists() and target != p:
-                    target.unlink()
-                p.rename(target)
-                print(f"✅ {p.name}  ->  {target.name}")
-                renamed += 1
-                final_nc_path = target
-            else:
-                print(f"=  {p.name} (już poprawna)")
-                final_nc_path = p
-        except Exception as e:
-            print(f"❌ {p.name}: błąd zmiany nazwy ({e})")
-            final_nc_path = p
-
-        out_dxf = final_nc_path.with_suffix(".dxf")
-        try:
-            generate_dxf_from_nc_text(txt, out_dxf, lic_payload=lic)
-            print(f"   ↳ DXF: {out_dxf.name} ✔")
-            dxf_ok += 1
-        except Exception as e:
-            print(f"   ↳ DXF: {out_dxf.name} ✖  ({e})")
-            dxf_err += 1
-
-    print(f"\nGotowe. Zmieniono nazw: {renamed}. DXF OK: {dxf_ok}, błędów DXF: {dxf_err}.")
+    run_batch([Path(folder)], lic, out_dir=OUTPUT_ROOT)
     input("\nNaciśnij Enter, aby zamknąć...")
 
+def cli(argv=None) -> int:
+    """
+    Tryb wsadowy bez okien, np. z harmonogramu zadań:
+      nctodxf.exe D:/proj1 D:/proj2 -r -o D:/dxf -j 4 --cache --report D:/raport.csv -q
+      nctodxf.exe D:/paczka.zip --zip-out D:/wynik.zip
+    Kod wyjścia: 0 – bez błędów, 1 – błędy odczytu/zmiany nazwy/DXF/zapisu raportów, 2 – licencja/argumenty.
+    """
+    import argparse
+
+    ap = argparse.ArgumentParser(prog=PROGRAM_NAME, description="Zmiana nazw NC1 + generowanie DXF (bez okien).")
+    ap.add_argument("roots", nargs="+", type=Path, help="Katalogi lub archiwa .zip z plikami .nc/.nc1/.dstv")
+    ap.add_argument("-r", "--recursive", action="store_true", default=RECURSIVE, help="Także podkatalogi")
+    ap.add_argument("-o", "--output-dir", type=Path, default=OUTPUT_ROOT,
+                    help="Katalog na DXF (drzewo jak wejście) i raporty (domyślnie obok NC)")
+    ap.add_argument("--staging", type=Path, default=STAGING_DIR,
+                    help="Lokalny katalog roboczy; wyniki przenoszone do celu partiami")
+    ap.add_argument("--staging-move", choices=("background", "end"), default=STAGING_MOVE,
+                    help="Przenoszenie w tle w trakcie przebiegu albo po przebiegu")
+    mode = ap.add_mutually_exclusive_group()
+    mode.add_argument("--rename-only", action="store_true", help="Tylko zmiana nazw NC, bez DXF")
+    mode.add_argument("--dxf-only", action="store_true", help="Tylko DXF (nazwa docelowa), bez zmiany nazw NC")
+    ap.add_argument("--zip-out", type=Path, help="Archiwum .zip na NC po zmianie nazw i DXF (źródła bez zmian)")
+    ap.add_argument("-j", "--workers", type=int, default=1, help="Liczba procesów/wątków roboczych (domyślnie 1)")
+    ap.add_argument("--schedule", choices=("size", "scan", "fifo"), default=SCHEDULE,
+                    help="Kolejność przy -j > 1: najdroższe pliki pierwsze (wg rozmiaru/treści) albo fifo")
+    ap.add_argument("--backend", choices=("auto", "process", "thread"), default=BACKEND,
+                    help="Pula przy -j > 1: procesy albo wątki (auto: wątki na Pythonie bez GIL)")
+    ap.add_argument("--cache", action=argparse.BooleanOptionalAction, default=PARSE_CACHE,
+                    help="Cache sparsowanych części (CACHE_DIR)")
+    ap.add_argument("--report", type=Path, help=f"Ścieżka raportu CSV (domyślnie {REPORT_NAME})")
+    ap.add_argument("-q", "--quiet", action="store_true", help="Tylko błędy (na stderr)")
+    args = ap.parse_args(argv)
+
+    missing = [str(r) for r in args.roots if not (r.is_dir() or is_zip(r))]
+    if missing:
+        ap.error(f"brak katalogu/archiwum: {', '.join(missing)}")
+
+    out = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(out):
+            lic = verify_license_or_exit(wait=False)
+    except SystemExit:
+        print(out.getvalue().strip(), file=sys.stderr)
+        return 2
+    if not args.quiet:
+        print(f"{PROGRAM_NAME} — licencja: {lic.get('name', '(brak)')}")
+
+    stats = run_batch(args.roots, lic, recursive=args.recursive, out_dir=args.output_dir,
+                      rename=not args.dxf_only, dxf=not args.rename_only, workers=max(1, args.workers),
+                      cache=args.cache, report_path=args.report, quiet=args.quiet, zip_out=args.zip_out,
+                      staging=args.staging, staging_move=args.staging_move, backend=args.backend,
+                      schedule=args.schedule)
+    return 1 if stats["errors"] else 0
+
+def run(pick_folder=None) -> None:
+    """Punkt wejścia EXE: --serve / --shard / --stream / argumenty CLI; bez argumentów – main(pick_folder)."""
+    import multiprocessing
+    multiprocessing.freeze_support()        # procesy robocze w EXE (PyInstaller)
+    if sys.argv[1:2] == ["--serve"]:
+        from server import main as serve_main
+        serve_main(sys.argv[2:])
+    elif sys.argv[1:2] == ["--shard"]:
+        from shard import main_cli as shard_main
+        sys.exit(shard_main(sys.argv[2:]))
+    elif sys.argv[1:2] == ["--stream"]:
+        from stream import main_cli as stream_main
+        sys.exit(stream_main(sys.argv[2:]))
+    elif len(sys.argv) > 1:
+        sys.exit(cli())
+    else:
+        main(pick_folder)
+
 if __name__ == "__main__":
-    main()
+    run()
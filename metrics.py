@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Metryki geometrii części (kalkulacja kosztu cięcia):
+- pole netto [mm²]   = OUTER − IK − BO
+- długość cięcia [mm] zewnętrzna (AK) i wewnętrzna (IK + BO), łuki z bulge
+- liczba przebić     = 1 (OUTER) + liczba IK + liczba BO
+- masa [kg]          = pole netto × grubość × gęstość (wg gatunku)
+
+Wzory na całe kontury naraz (numpy; ezdxf i tak go wymaga):
+  segment (x,y,b) -> (x2,y2):  c = cięciwa, θ = 4·atan(|b|)
+    r = c / (2·sin(θ/2)),  łuk = r·θ,  odcinek koła = r²/2·(θ − sin θ)
+  pole konturu = shoelace + Σ sign(b)·odcinek koła  (bulge > 0 = CCW)
+"""
+
+import math
+import numpy as np
+
+EPS = 1e-9
+
+# Gęstość [kg/m³] wg prefiksu gatunku (pierwsze dopasowanie), domyślnie stal
+DENSITY_DEFAULT = 7850.0
+DENSITY_BY_GRADE = [
+    ("1.4",   7930.0),   # nierdzewne (1.4301, 1.4404, ...)
+    ("EN AW", 2700.0),   # aluminium
+    ("AW",    2700.0),
+    ("AL",    2700.0),
+    ("CU",    8940.0),
+]
+
+def density_for_grade(grade: str) -> float:
+    g = (grade or "").strip().upper()
+    for prefix, rho in DENSITY_BY_GRADE:
+        if g.startswith(prefix):
+            return rho
+    return DENSITY_DEFAULT
+
+def xyb_area_length(verts):
+    """
+    Zamknięta polilinia [(x,y,bulge), ...] -> (pole ze znakiem, obwód).
+    Pole > 0 dla konturu CCW.
+    """
+    if len(verts) < 2:
+        return 0.0, 0.0
+    a = np.asarray(verts, dtype=float)
+    x, y, b = a[:, 0], a[:, 1], a[:, 2]
+    x2, y2 = np.roll(x, -1), np.roll(y, -1)
+    c = np.hypot(x2 - x, y2 - y)
+    area = 0.5 * float(np.sum(x * y2 - x2 * y))
+
+    arc = np.abs(b) >= EPS
+    if not arc.any():
+        return area, float(c.sum())
+    theta = 4.0 * np.arctan(np.abs(b[arc]))
+    r = c[arc] / (2.0 * np.sin(theta / 2.0))
+    seg = 0.5 * r * r * (theta - np.sin(theta))
+    area += float(np.sum(np.sign(b[arc]) * seg))
+    length = float(c[~arc].sum() + np.sum(r * theta))
+    return area, length
+
+def bo_area_length(bo_items):
+    """BO (okręgi + sloty) -> (pole, długość cięcia, liczba otworów)."""
+    rows = []
+    for kind, c1, c2, dia in bo_items:
+        if dia <= 0:
+            continue
+        L = math.dist(c1, c2) if kind == "slot" else 0.0
+        rows.append((dia, L))
+    if not rows:
+        return 0.0, 0.0, 0
+    a = np.asarray(rows, dtype=float)
+    dia, L = a[:, 0], a[:, 1]
+    r = dia / 2.0
+    area = float(np.sum(math.pi * r * r + L * dia))
+    length = float(np.sum(math.pi * dia + 2.0 * L))
+    return area, length, len(rows)
+
+def compute_part_metrics(outer_verts, inner_verts, bo_items, thickness=None, grade=None) -> dict:
+    """
+    outer_verts: [(x,y,b), ...] lub None, inner_verts: lista konturów IK (xyb),
+    bo_items: jak w generate_dxf_from_nc_text, thickness: mm (str/float) lub None.
+    """
+    outer_area, outer_len = xyb_area_length(outer_verts or [])
+    inner_area = 0.0
+    inner_len = 0.0
+    for verts in inner_verts:
+        a, l = xyb_area_length(verts)
+        inner_area += abs(a)
+        inner_len += l
+    bo_area, bo_len, bo_count = bo_area_length(bo_items)
+
+    net_area = abs(outer_area) - inner_area - bo_area
+    pierces = (1 if outer_verts else 0) + len(inner_verts) + bo_count
+
+    try:
+        t = float(str(thickness).replace(",", "."))
+    except (TypeError, ValueError):
+        t = None
+    rho = density_for_grade(grade)
+    mass = net_area * t * rho * 1e-9 if t else None
+
+    return {
+        "area_mm2":      round(net_area, 2),
+        "cut_outer_mm":  round(outer_len, 2),
+        "cut_inner_mm":  round(inner_len + bo_len, 2),
+        "pierces":       pierces,
+        "mass_kg":       round(mass, 3) if mass is not None else None,
+    }
+
+def format_metrics(m: dict) -> str:
+    mass = f"{m['mass_kg']:.3f} kg" if m.get("mass_kg") is not None else "? kg"
+    return (f"pole {m['area_mm2']:.0f} mm², cięcie {m['cut_outer_mm']:.0f}+{m['cut_inner_mm']:.0f} mm, "
+            f"przebicia {m['pierces']}, masa {mass}")
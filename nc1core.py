@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Wspólny rdzeń NC1 (DSTV) dla wszystkich punktów wejścia: main.py, main_WIn.py,
+Pomocnicze/ncTodxf.py, Pomocnicze/nc1_to_dxf.py, Pomocnicze/nc-renamer.py.
+
+- nagłówek: parse_nc1_for_name -> (name, thickness, grade, qty) do nazwy pliku,
+- geometria: parse_nc_geometry -> PartModel (AK, IK, BO), build_xyb_from_points (k -> bulge),
+- rysunek: part_geometry -> draw_part (jedyna ścieżka rysowania: pliki, arkusze, bloki),
+  new_dxf_doc (warstwy OUTER + cutout), nc_to_dxf_doc, add_doc_metadata, save_dxf.
+
+Łuki (AK/IK): bulge > 0 = CCW gdy k > 0. XY 1:1 z NC1.
+Funkcje bez stanu (wzorce niezmienne) – bezpieczne dla wątków.
+"""
+
+import math
+import re
+from datetime import datetime
+from pathlib import Path
+
+import ezdxf
+
+from hole_blocks import HoleBlocks
+from part_model import Contour, Hole, Slot, PartModel
+
+EPS = 1e-9
+FLOAT_RE = r"[+-]?\d+(?:[.,]\d+)?"
+FLOAT_PAT = re.compile(FLOAT_RE)
+UNSAFE_RE = re.compile(r'[\\/:*?"<>|\r\n]+')
+GRADE_RES = tuple(re.compile(rx, re.IGNORECASE)
+             for rx in (r'\bS[2-9][0-9]{2}[A-Z0-9]{0,3}\b', r'\bA36\b', r'\b1\.[0-9]{4}\b'))
+
+# ---------- nagłówek ----------
+def sanitize(text: str) -> str:
+    if not text:
+        return "NA"
+    return UNSAFE_RE.sub("_", text.strip())
+
+def fnum(s: str) -> float:
+    return float(s.replace(",", "."))
+
+def to_float(s: str):
+    try:
+        return float(s.replace(",", "."))
+    except Exception:
+        return None
+
+def norm_num(s: str) -> str | None:
+    v = to_float(s)
+    if v is None:
+        return None
+    return f"{v:.3f}".rstrip("0").rstrip(".")
+
+def parse_header_fields(lines):
+    """
+    (piece, assembly, grade, qty, profile, type_code, idx_B) – układ typowy dla blach (typ 6):
+    ST, ** (opcjonalny komentarz), ID, TYPE, PIECE, ASSEMBLY, GRADE, QTY, PROFILE, ..., B
+    """
+    try:
+        st_idx = next(i for i, ln in enumerate(lines) if ln.strip().upper() == "ST")
+    except StopIteration:
+        st_idx = -1
+    seq = []
+    src = lines[st_idx+1:] if st_idx >= 0 else lines
+    for ln in src[:30]:
+        s = ln.strip()
+        if not s or s.startswith("**"):
+            continue
+        seq.append(s)
+        if len(seq) >= 9:
+            break
+    ID         = seq[0] if len(seq) > 0 else ""
+    type_code  = seq[1] if len(seq) > 1 else ""
+    piece      = seq[2] if len(seq) > 2 else ""
+    assembly   = seq[3] if len(seq) > 3 else ""
+    grade      = seq[4] if len(seq) > 4 else ""
+    qty        = seq[5] if len(seq) > 5 else ""
+    profile    = seq[6] if len(seq) > 6 else ""
+    try:
+        b_idx = next(i for i, ln in enumerate(lines) if ln.strip().upper() == "B")
+    except StopIteration:
+        b_idx = -1
+    return piece, assembly, grade, qty, profile, type_code, b_idx
+
+def parse_thickness_from_B(lines, b_idx):
+    """Grubość: 3. wartość bloku B (X-length, Y-length, S)."""
+    if b_idx < 0:
+        return None
+    vals = []
+    for ln in lines[b_idx+1:b_idx+1+20]:
+        s = ln.strip()
+        if not s:
+            continue
+        m = FLOAT_PAT.search(s)
+        if m:
+            vals.append(m.group(0))
+        if len(vals) >= 12:
+            break
+    if len(vals) >= 3:
+        return norm_num(vals[2])
+    return None
+
+def pick_qty_simple(qty_str: str) -> str:
+    try:
+        q = int(qty_str.strip())
+        return str(q if q > 0 else 1)
+    except Exception:
+        return "1"
+
+def pick_grade_simple(grade: str, lines):
+    if grade and grade.strip():
+        return grade.strip().upper()
+    # Fallback – typowy wzorzec na początku pliku
+    for pat in GRADE_RES:
+        for ln in lines[:60]:
+            m = pat.search(ln)
+            if m:
+                return m.group(0).upper()
+    return "NA"
+
+def parse_nc1_for_name(text: str, fallback_stem: str):
+    """(name, thickness, grade, qty) po sanitize – nazwa pliku {grade}-{thickness}-({name})-{qty}."""
+    lines = text.splitlines()
+    piece, assembly, grade_raw, qty_raw, profile, type_code, b_idx = parse_header_fields(lines)
+    name = piece if piece else fallback_stem
+    thickness = parse_thickness_from_B(lines, b_idx)
+    grade = pick_grade_simple(grade_raw, lines)
+    qty = pick_qty_simple(qty_raw)
+    name = sanitize(name)
+    grade = sanitize(grade)
+    thickness = sanitize(thickness if thickness else "NA")
+    return name, thickness, grade, qty
+
+# ---------- geometria ----------
+def is_block_tag(s: str) -> bool:
+    """Znacznik bloku (ST, AK, BO, EN, ...): dokładnie dwie litery A-Z (s po strip), bez regex."""
+    return len(s) == 2 and s.isascii() and s.isalpha() and s.isupper()
+
+def tokenize_blocks(text: str):
+    cur_tag = None
+    cur = []
+    for ln in text.splitlines():
+        s = ln.strip()
+        if is_block_tag(s):
+            if cur_tag is not None:
+                yield cur_tag, cur
+                cur = []
+            cur_tag = s
+            if cur_tag == "EN":
+                break
+        elif cur_tag is not None:
+            cur.append(ln)
+    if cur_tag is not None and cur_tag != "EN":
+        yield cur_tag, cur
+
+def parse_points_k(block_lines):
+    pts = Contour()
+    data = pts.data
+    for ln in block_lines:
+        nums = FLOAT_PAT.findall(ln)
+        if len(nums) >= 2:
+            data.append(fnum(nums[0])); data.append(fnum(nums[1]))
+            data.append(fnum(nums[2]) if len(nums) >= 3 else 0.0)
+    return pts
+
+def bulge_from_points_radius(p1, p2, r, ccw=True):
+    d = math.dist(p1, p2)
+    if r < EPS:
+        return 0.0
+    arg = max(-1.0, min(1.0, d/(2.0*r)))
+    theta = 2.0 * math.asin(arg)
+    b = math.tan(theta/4.0)
+    return b if ccw else -b
+
+def build_xyb_from_points(pts):
+    n = len(pts)
+    if n < 2:
+        return Contour()
+    out = Contour()
+    data = out.data
+    for i in range(n):
+        x,y,k = pts[i]
+        x2,y2,_ = pts[(i+1)%n]
+        if abs(k) < EPS:
+            b = 0.0
+        else:
+            r = abs(k)
+            ccw = (k > 0)
+            b = bulge_from_points_radius((x,y),(x2,y2), r, ccw=ccw)
+        data.append(x); data.append(y); data.append(b)
+    return out
+
+def parse_nc_geometry(txt: str):
+    """
+    Bloki AK/IK/BO -> PartModel (rozpakowuje się jak (outer_pts, inner_contours, bo_items)):
+      outer_pts      – Contour (x,y,k) lub None
+      inner_contours – list[Contour]
+      bo_items       – Hole / Slot (jak krotki ("circle", (x,y), None, dia) / ("slot", c1, c2, dia))
+    Slot BO: "X Y Ø (pole) l dx dy" – drugi środek = (X+dx, Y+dy).
+    """
+    outer_pts = None
+    inner_contours = []
+    bo_items = []
+
+    for tag, lines in tokenize_blocks(txt):
+        if tag == "AK":
+            outer_pts = parse_points_k(lines)
+        elif tag == "IK":
+            pts = parse_points_k(lines)
+            if pts:
+                inner_contours.append(pts)
+        elif tag == "BO":
+            for ln in lines:
+                nums = FLOAT_PAT.findall(ln)
+                is_slot = ("l" in ln.lower())
+                if is_slot and len(nums) >= 6:
+                    x = fnum(nums[0]); y = fnum(nums[1]); dia = fnum(nums[2])
+                    dx = fnum(nums[4]); dy = fnum(nums[5])
+                    bo_items.append(Slot(x, y, x + dx, y + dy, dia))
+                elif len(nums) >= 3:
+                    x = fnum(nums[0]); y = fnum(nums[1]); dia = fnum(nums[2])
+                    bo_items.append(Hole(x, y, dia))
+
+    return PartModel(outer_pts, inner_contours, bo_items)
+
+# ---------- zapis DXF ----------
+def add_slot_capsule(msp, c1, c2, dia, layer="cutout"):
+    x1, y1 = c1
+    x2, y2 = c2
+    r = dia / 2.0
+    dx, dy = (x2 - x1, y2 - y1)
+    L = math.hypot(dx, dy)
+    if L < EPS:
+        if r > 0:
+            msp.add_circle((x1, y1), r, dxfattribs={"layer": layer})
+        return
+    nx, ny = -dy / L, dx / L   # normalny CCW
+    P0 = (x1 - nx*r, y1 - ny*r)
+    P1 = (x2 - nx*r, y2 - ny*r)
+    P2 = (x2 + nx*r, y2 + ny*r)
+    P3 = (x1 + nx*r, y1 + ny*r)
+    verts_xyb = [
+        (P0[0], P0[1], 0.0),
+        (P1[0], P1[1], 1.0),
+        (P2[0], P2[1], 0.0),
+        (P3[0], P3[1], 1.0),
+    ]
+    msp.add_lwpolyline(verts_xyb, format="xyb", close=True, dxfattribs={"layer": layer})
+
+def add_bo_item(msp, item, layer="cutout"):
+    """BO: ("circle", (x,y), None, dia) -> CIRCLE, ("slot", c1, c2, dia) -> kapsuła."""
+    kind = item[0]
+    if kind == "circle":
+        _, (x, y), _, dia = item
+        r = dia / 2.0
+        if r > 0:
+            msp.add_circle((x, y), r, dxfattribs={"layer": layer})
+    elif kind == "slot":
+        _, c1, c2, dia = item
+        add_slot_capsule(msp, c1, c2, dia, layer=layer)
+
+def new_dxf_doc():
+    """Pusty dokument R2010 z warstwami OUTER i cutout (cyan) -> (doc, msp)."""
+    doc = ezdxf.new("R2010")
+    msp = doc.modelspace()
+    if "OUTER" not in doc.layers:
+        doc.layers.add("OUTER")
+    if "cutout" not in doc.layers:
+        doc.layers.add("cutout", color=4)  # cyan
+    else:
+        doc.layers.get("cutout").dxf.color = 4
+    return doc, msp
+
+def part_geometry(outer_pts, inner_contours, bo_items) -> dict:
+    """
+    Punkty (x,y,k) -> część do rysowania:
+      {"outer": Contour (x,y,b) | [], "inner": [Contour] (indeks = IK #n, pusty dla konturu
+       zdegenerowanego), "cutouts": [("IK", Contour) | ("BO", Hole/Slot), ...] w kolejności z pliku}
+    """
+    outer_verts = build_xyb_from_points(outer_pts) if outer_pts else []
+    inner = [build_xyb_from_points(pts) for pts in inner_contours]
+    cutouts = [("IK", v) for v in inner if v]
+    cutouts += [("BO", item) for item in bo_items if item[0] == "slot" or item[3] > 0]
+    return {"outer": outer_verts, "inner": inner, "cutouts": cutouts}
+
+def draw_part(doc, layout, part: dict, outer_last: bool = False,
+              hole_blocks: bool = False, hole_arrays: bool = False) -> dict:
+    """
+    Rysuje część (OUTER + wycięcia) w layout (modelspace lub blok); zwraca statystyki bloków BO.
+    outer_last: OUTER po wycięciach (cięty jako ostatni); hole_blocks/hole_arrays: powtarzalne
+    BO jako INSERT/MINSERT wspólnego bloku (hole_blocks.HoleBlocks).
+    """
+    outer_verts = part["outer"]
+    cutouts = part["cutouts"]
+
+    if outer_verts and not outer_last:
+        layout.add_lwpolyline(outer_verts, format="xyb", close=True, dxfattribs={"layer": "OUTER"})
+
+    blocks = None
+    if hole_blocks:
+        blocks = HoleBlocks(doc, [obj for kind, obj in cutouts if kind == "BO"],
+                            draw=add_bo_item, layer="cutout", arrays=hole_arrays)
+    for kind, obj in cutouts:
+        if kind == "IK":
+            layout.add_lwpolyline(obj, format="xyb", close=True, dxfattribs={"layer": "cutout"})
+        elif blocks is None or not blocks.add(layout, obj):
+            add_bo_item(layout, obj, layer="cutout")
+
+    if outer_verts and outer_last:
+        layout.add_lwpolyline(outer_verts, format="xyb", close=True, dxfattribs={"layer": "OUTER"})
+
+    if blocks is None:
+        return {}
+    return {"hole_blocks": blocks.count, "hole_inserts": blocks.inserts, "hole_arrays": blocks.arrays}
+
+def nc_to_dxf_doc(txt: str):
+    """Tekst NC1 -> (doc, msp) z narysowaną częścią (bez metadanych i zapisu)."""
+    doc, msp = new_dxf_doc()
+    draw_part(doc, msp, part_geometry(*parse_nc_geometry(txt)))
+    return doc, msp
+
+def add_doc_metadata(doc, msp, lic_payload: dict, brand, extra: dict | None = None) -> None:
+    """
+    $LASTSAVEDBY i XDATA (appid NCTODXF) na block_record modelspace z informacjami o pochodzeniu.
+    brand: (program, właściciel, wersja); extra: dodatkowe pary klucz=wartość (np. metryki).
+    """
+    program, owner, version = brand
+    try:
+        doc.header["$LASTSAVEDBY"] = f"{owner} / {program}"
+    except Exception:
+        pass
+    try:
+        doc.appids.add("NCTODXF")
+    except ezdxf.DXFTableEntryError:
+        pass  # już istnieje
+    try:
+        lic_name    = lic_payload.get("name", "")
+        lic_fp      = lic_payload.get("fp", "")
+        lic_expires = lic_payload.get("expires") or "bezterminowo"
+        now_iso     = datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
+        xdata = [
+            (1000, f"program={program}"),
+            (1000, f"owner={owner}"),
+            (1000, f"version={version}"),
+            (1000, f"license_to={lic_name}"),
+            (1000, f"license_fp={lic_fp}"),
+            (1000, f"license_expires={lic_expires}"),
+            (1000, f"generated={now_iso}"),
+        ]
+        for key, val in (extra or {}).items():
+            xdata.append((1000, f"{key}={val}"))
+        msp.block_record.set_xdata("NCTODXF", xdata)
+    except Exception:
+        pass
+
+def save_dxf(doc, out_path: Path, fmt: str = "asc") -> None:
+    """Zapis z nadpisaniem istniejącego pliku."""
+    try:
+        if out_path.exists():
+            out_path.unlink()
+    except Exception:
+        pass
+    doc.saveas(out_path, fmt=fmt)
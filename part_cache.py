@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Binarny cache sparsowanych części (nagłówek + PartModel), klucz = hash treści NC1.
+
+Jeden plik na część: CACHE_DIR/ab/abcdef....ncp, czytany przez mmap; współrzędne
+konturów trafiają wprost do array('d') (memcpy), więc ponowny przebieg/kolejne
+etapy nie parsują tekstu regexami.
+Układ pliku (little-endian, sekcje wyrównane do 8 B):
+  nagłówek _HEAD: magic "NCPC", wersja, jest_AK, liczba konturów/punktów/BO, długość JSON
+  JSON pól nagłówka NC1 (utf-8)
+  uint32[liczba konturów]   – liczba punktów każdego konturu (pierwszy = AK, gdy jest)
+  float64[punkty × 3]       – x, y, k
+  float64[BO × 6]           – rodzaj (0 okrąg, 1 fasolka), x1, y1, x2, y2, średnica
+Zmiana VERSION (np. po zmianie parsera) unieważnia stare pliki.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from pathlib import Path
+
+import numpy as np
+
+from part_model import Contour, Hole, Slot, PartModel
+
+MAGIC = b"NCPC"
+VERSION = 1
+_HEAD = struct.Struct("<4sHBxIIII")
+
+def source_key(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+def _pad(n: int) -> int:
+    return (8 - n % 8) % 8
+
+def encode(header: dict, outer_pts, inner_contours, bo_items) -> bytes:
+    contours = [Contour.from_points(c) for c in
+                ([outer_pts] if outer_pts is not None else []) + list(inner_contours)]
+    counts = np.array([len(c) for c in contours], dtype="<u4")
+    pts = array("d")
+    for c in contours:
+        pts.extend(c.data)
+    bo = np.array([(0.0 if kind == "circle" else 1.0, c1[0], c1[1],
+                    (c2 or c1)[0], (c2 or c1)[1], dia) for kind, c1, c2, dia in bo_items],
+                  dtype="<f8").reshape(-1, 6)
+    if sys.byteorder == "big":
+        pts.byteswap()
+    meta = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    head = _HEAD.pack(MAGIC, VERSION, outer_pts is not None, len(contours), len(pts) // 3, len(bo), len(meta))
+    return b"".join([head, meta, b"\0" * _pad(len(meta)),
+                     counts.tobytes(), b"\0" * _pad(counts.nbytes),
+                     pts.tobytes(), bo.tobytes()])
+
+def decode(buf):
+    """buf: bytes/mmap -> (header, PartModel) lub None (inna wersja)."""
+    magic, version, has_outer, n_cont, n_pts, n_bo, n_meta = _HEAD.unpack_from(buf, 0)
+    if magic != MAGIC or version != VERSION:
+        return None
+    off = _HEAD.size
+    header = json.loads(bytes(buf[off:off + n_meta]).decode("utf-8"))
+    off += n_meta + _pad(n_meta)
+    counts = np.frombuffer(buf, dtype="<u4", count=n_cont, offset=off).tolist()
+    off += 4 * n_cont + _pad(4 * n_cont)
+    if len(buf) < off + 24 * n_pts + 48 * n_bo or sum(counts) != n_pts:
+        raise ValueError("niepełny plik cache")
+    contours = []
+    for n in counts:
+        data = array("d")
+        data.frombytes(buf[off:off + 24 * n])
+        if sys.byteorder == "big":
+            data.byteswap()
+        contours.append(Contour(data))
+        off += 24 * n
+    bo = np.frombuffer(buf, dtype="<f8", count=6 * n_bo, offset=off).reshape(-1, 6).tolist()
+
+    outer_pts = contours.pop(0) if has_outer else None
+    bo_items = [Hole(x1, y1, dia) if kind == 0.0 else Slot(x1, y1, x2, y2, dia)
+                for kind, x1, y1, x2, y2, dia in bo]
+    return header, PartModel(outer_pts, contours, bo_items)
+
+class PartCache:
+    """Katalog cache; get/put po kluczu source_key(treść NC1). Bezpieczny dla wątków."""
+
+    def __init__(self, cache_dir: Path):
+        self.dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()      # liczniki (+= nie jest atomowe bez GIL)
+
+    def path_for(self, key: str) -> Path:
+        return self.dir / key[:2] / f"{key}.ncp"
+
+    def get(self, key: str):
+        """(header, PartModel) albo None."""
+        path = self.path_for(key)
+        try:
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                out = decode(mm)
+        except (OSError, ValueError, struct.error):
+            out = None
+        with self._lock:
+            if out is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return out
+
+    def put(self, key: str, header: dict, model) -> None:
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(encode(header, *model))
+        os.replace(tmp, path)          # atomowo – równoległe przebiegi/wątki nie widzą połówek
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Wykrywanie duplikatów części w całym projekcie (ta sama blacha pod kilkoma
+numerami pozycji) przez kanoniczny hash geometrii:
+- kontury upraszczane (duplikaty/współliniowe) z tolerancją HASH_TOL,
+- przesunięcie do (0,0) wg min. X/Y OUTER, współrzędne kwantowane do HASH_TOL,
+- kontur od najmniejszego punktu, zawsze CCW, otwory/IK posortowane,
+- opcjonalnie obrót (najdłuższa krawędź AK wzdłuż +X) i lustro (X -> -X):
+  hash = minimum po kandydatach.
+
+Grupowanie po (gatunek, grubość, hash) słownikiem – liniowo względem liczby części.
+"""
+
+import csv
+import hashlib
+import math
+from collections import defaultdict
+from pathlib import Path
+
+from simplify import simplify_points
+
+HASH_TOL = 0.01     # mm
+EPS = 1e-9
+
+def _transform(pts, cos_a, sin_a, mirror):
+    out = []
+    for x, y, k in pts:
+        if mirror:
+            x, k = -x, -k
+        out.append((x * cos_a - y * sin_a, x * sin_a + y * cos_a, k))
+    return out
+
+def _ccw(seq):
+    """Zamknięty kontur (x,y,k) w kierunku CCW (odwrócenie: k przechodzi na poprzedni punkt)."""
+    n = len(seq)
+    area = sum(seq[i][0] * seq[(i + 1) % n][1] - seq[(i + 1) % n][0] * seq[i][1] for i in range(n))
+    if abs(area) < EPS:
+        area = sum(k for _, _, k in seq)
+    if area >= 0:
+        return seq
+    rev = seq[::-1]
+    return [(x, y, -rev[(i + 1) % n][2]) for i, (x, y, _) in enumerate(rev)]
+
+def _canon_contour(pts, dx, dy, tol):
+    q = [(round((x - dx) / tol), round((y - dy) / tol), round(k / tol)) for x, y, k in pts]
+    q = _ccw(q)
+    m = min(q)
+    return min(tuple(q[i:] + q[:i]) for i, p in enumerate(q) if p == m)
+
+def _canon(outer, inners, holes, cos_a, sin_a, mirror, tol):
+    outer = _transform(outer, cos_a, sin_a, mirror) if outer else []
+    inners = [_transform(pts, cos_a, sin_a, mirror) for pts in inners]
+    holes = [(kind, _transform([(*c1, 0.0), (*(c2 or c1), 0.0)], cos_a, sin_a, mirror), dia)
+             for kind, c1, c2, dia in holes]
+    ref = outer or [p for pts in inners for p in pts] or [p for _, ends, _ in holes for p in ends]
+    if not ref:
+        return ()
+    dx = min(p[0] for p in ref)
+    dy = min(p[1] for p in ref)
+
+    def qp(p):
+        return (round((p[0] - dx) / tol), round((p[1] - dy) / tol))
+
+    bo = []
+    for kind, ends, dia in holes:
+        a, b = sorted((qp(ends[0]), qp(ends[1])))
+        bo.append((kind, a, b, round(dia / tol)))
+    return (
+        _canon_contour(outer, dx, dy, tol) if outer else (),
+        tuple(sorted(_canon_contour(pts, dx, dy, tol) for pts in inners if pts)),
+        tuple(sorted(bo)),
+    )
+
+def _rotations(outer, tol):
+    """Kąty ustawiające najdłuższe krawędzie AK wzdłuż +X (oba kierunki)."""
+    n = len(outer)
+    edges = []
+    for i in range(n):
+        x, y, _ = outer[i]
+        x2, y2, _ = outer[(i + 1) % n]
+        edges.append((math.hypot(x2 - x, y2 - y), math.atan2(y2 - y, x2 - x)))
+    longest = max(L for L, _ in edges)
+    angles = set()
+    for L, a in edges:
+        if L >= longest - tol:
+            angles.add(round(-a, 9))
+            angles.add(round(-a + math.pi, 9))
+    return sorted(angles)
+
+def geometry_hash(outer_pts, inner_contours, bo_items, tol=HASH_TOL, rotate=False, mirror=False) -> str:
+    """Kanoniczny hash geometrii części (hex, 32 znaki)."""
+    outer = simplify_points(outer_pts, tol)[0] if outer_pts else []
+    inners = [simplify_points(pts, tol)[0] for pts in inner_contours]
+    holes = [it for it in bo_items if it[3] > 0]
+
+    angles = _rotations(outer, tol) if rotate and len(outer) >= 2 else [0.0]
+    mirrors = (False, True) if mirror else (False,)
+    best = min(_canon(outer, inners, holes, math.cos(a), math.sin(a), m, tol)
+               for a in angles for m in mirrors)
+    return hashlib.blake2b(repr(best).encode("ascii"), digest_size=16).hexdigest()
+
+def group_duplicates(rows):
+    """
+    rows: słowniki z raportu (grade, thickness, qty, nc, geom_hash) ->
+    lista grup [{"grade","thickness","qty","parts","files","geom_hash"}],
+    qty zsumowane; kolejność wg pierwszego wystąpienia.
+    """
+    groups = defaultdict(list)
+    for row in rows:
+        h = row.get("geom_hash")
+        if h:
+            groups[(row.get("grade"), row.get("thickness"), h)].append(row)
+    merged = []
+    for (grade, thickness, h), members in groups.items():
+        merged.append({
+            "grade": grade,
+            "thickness": thickness,
+            "qty": sum(int(r.get("qty") or 1) for r in members),
+            "count": len(members),
+            "parts": ", ".join(str(r.get("name", "")) for r in members),
+            "files": ", ".join(str(r.get("nc", "")) for r in members),
+            "geom_hash": h,
+        })
+    return merged
+
+def write_merged_parts(merged, path: Path) -> None:
+    """Scalona lista części (CSV ;) – jedna pozycja na unikalną geometrię."""
+    fields = ["grade", "thickness", "qty", "count", "parts", "files", "geom_hash"]
+    with path.open("w", encoding="utf-8-sig", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=fields, delimiter=";")
+        w.writeheader()
+        w.writerows(merged)
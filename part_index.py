@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Indeks części projektu w SQLite (plik w wybranym katalogu, aktualizowany przy każdym przebiegu).
+
+Wiersz = jeden plik NC1: pola nagłówka (parse_header_fields), grubość, bbox,
+liczba otworów/fasolek/konturów IK, pole, masa, ścieżki NC1/DXF (względem katalogu).
+Aktualizacja przyrostowa: pliki o niezmienionym mtime/rozmiarze nie są przepisywane
+(chyba że wiersz nie ma geometrii/DXF, a bieżący przebieg je ma),
+zapisy idą paczkami po BATCH w jednej transakcji, wpisy usuniętych plików są czyszczone.
+
+Zapytania bez ponownego parsowania NC1, np.:
+  python part_index.py D:/projekt/nctodxf_index.sqlite --grade S355 --thickness 12 --slots
+  python part_index.py D:/projekt/nctodxf_index.sqlite --sql "SELECT grade, SUM(qty) FROM parts GROUP BY grade"
+"""
+
+import argparse
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+from sheets import part_bbox
+
+BATCH = 500
+
+COLUMNS = [
+    "nc_path", "source", "dxf_path", "mtime", "size",
+    "piece", "assembly", "grade", "qty", "profile", "type_code", "thickness",
+    "xmin", "ymin", "xmax", "ymax", "width", "height",
+    "holes", "slots", "contours", "area_mm2", "mass_kg",
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS parts (
+    nc_path   TEXT PRIMARY KEY,
+    source    TEXT,
+    dxf_path  TEXT,
+    mtime     REAL,
+    size      INTEGER,
+    piece     TEXT,
+    assembly  TEXT,
+    grade     TEXT,
+    qty       INTEGER,
+    profile   TEXT,
+    type_code TEXT,
+    thickness REAL,
+    xmin REAL, ymin REAL, xmax REAL, ymax REAL,
+    width     REAL,
+    height    REAL,
+    holes     INTEGER,
+    slots     INTEGER,
+    contours  INTEGER,
+    area_mm2  REAL,
+    mass_kg   REAL
+);
+CREATE INDEX IF NOT EXISTS parts_grade_thk ON parts (grade, thickness);
+CREATE INDEX IF NOT EXISTS parts_piece ON parts (piece);
+CREATE INDEX IF NOT EXISTS parts_assembly ON parts (assembly);
+"""
+
+def _num(s):
+    try:
+        return float(str(s).replace(",", "."))
+    except (TypeError, ValueError):
+        return None
+
+class PartIndex:
+    """Indeks jednego katalogu; ścieżki zapisywane względem root (posix)."""
+
+    def __init__(self, db_path: Path, root: Path, batch: int = BATCH):
+        self.root = root
+        self.batch = batch
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        # nc_path -> (mtime, size, czy geometria (bbox), dxf_path)
+        self.known = {p: (m, s, g, d) for p, m, s, g, d in self.conn.execute(
+            "SELECT nc_path, mtime, size, xmin IS NOT NULL, dxf_path FROM parts")}
+        self.pending = []
+        self.seen = set()
+        self.written = 0
+        self.skipped = 0
+
+    def rel(self, path: Path) -> str:
+        try:
+            return path.relative_to(self.root).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def is_current(self, nc_path: Path, geometry: bool = False, dxf_path: Path | None = None) -> bool:
+        """
+        True, gdy plik jest w indeksie z tym samym mtime i rozmiarem, a wiersz ma to, co niesie
+        bieżący zapis: geometrię (geometry=True) i ścieżkę DXF (dxf_path) – wiersz z przebiegu
+        tylko zmiany nazw jest uzupełniany przy pierwszym przebiegu z DXF.
+        """
+        known = self.known.get(self.rel(nc_path))
+        if known is None:
+            return False
+        st = nc_path.stat()
+        mtime, size, has_geometry, dxf = known
+        return ((mtime, size) == (st.st_mtime, st.st_size)
+                and (has_geometry or not geometry)
+                and (dxf_path is None or dxf == self.rel(dxf_path)))
+
+    def put(self, nc_path: Path, dxf_path: Path | None, source: str, header: dict, part: dict | None) -> None:
+        """
+        header: piece, assembly, grade, qty, profile, type_code, thickness;
+        part: wynik build_part (None → tylko nagłówek). Zapis paczkami.
+        """
+        key = self.rel(nc_path)
+        self.seen.add(key)
+        if self.is_current(nc_path, part is not None, dxf_path):
+            self.skipped += 1
+            return
+        st = nc_path.stat()
+        row = {"nc_path": key, "source": source, "dxf_path": self.rel(dxf_path) if dxf_path else None,
+               "mtime": st.st_mtime, "size": st.st_size}
+        row.update({k: header.get(k) for k in ("piece", "assembly", "grade", "profile", "type_code")})
+        row["qty"] = int(_num(header.get("qty")) or 1)
+        row["thickness"] = _num(header.get("thickness"))
+        if part is not None:
+            box = part_bbox(part)
+            row.update(xmin=box[0], ymin=box[1], xmax=box[2], ymax=box[3],
+                       width=box[2] - box[0], height=box[3] - box[1])
+            bo = [obj for kind, obj in part["cutouts"] if kind == "BO"]
+            row["holes"] = sum(1 for item in bo if item[0] == "circle")
+            row["slots"] = sum(1 for item in bo if item[0] == "slot")
+            row["contours"] = sum(1 for kind, _ in part["cutouts"] if kind == "IK")
+            row["area_mm2"] = part["metrics"].get("area_mm2")
+            row["mass_kg"] = part["metrics"].get("mass_kg")
+        self.pending.append(tuple(row.get(c) for c in COLUMNS))
+        self.known[key] = (st.st_mtime, st.st_size, part is not None, row["dxf_path"])
+        if len(self.pending) >= self.batch:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.pending:
+            return
+        sql = (f"INSERT OR REPLACE INTO parts ({', '.join(COLUMNS)}) "
+               f"VALUES ({', '.join('?' * len(COLUMNS))})")
+        with self.conn:
+            self.conn.executemany(sql, self.pending)
+        self.written += len(self.pending)
+        self.pending = []
+
+    def prune(self) -> int:
+        """Usuwa wpisy plików, których już nie ma (np. po zmianie nazwy)."""
+        gone = [(p,) for p in self.known if p not in self.seen and not (self.root / p).exists()]
+        with self.conn:
+            self.conn.executemany("DELETE FROM parts WHERE nc_path = ?", gone)
+        for (p,) in gone:
+            del self.known[p]
+        return len(gone)
+
+    def close(self) -> None:
+        self.flush()
+        self.conn.close()
+
+def query(db_path: Path, grade=None, thickness=None, slots=False, holes=False,
+          piece=None, assembly=None, profile=None):
+    """Filtry AND; piece/assembly/profile jako wzorce LIKE (np. "B1%"). -> (kolumny, wiersze)"""
+    where, args = [], []
+    if grade:
+        where.append("grade = ?")
+        args.append(grade.upper())
+    if thickness is not None:
+        where.append("thickness = ?")
+        args.append(float(thickness))
+    if slots:
+        where.append("slots > 0")
+    if holes:
+        where.append("holes > 0")
+    for col, pat in (("piece", piece), ("assembly", assembly), ("profile", profile)):
+        if pat:
+            where.append(f"{col} LIKE ?")
+            args.append(pat)
+    sql = ("SELECT piece, assembly, grade, thickness, qty, width, height, holes, slots, "
+           "area_mm2, mass_kg, nc_path, dxf_path FROM parts")
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY grade, thickness, piece"
+    return run_sql(db_path, sql, args)
+
+def run_sql(db_path: Path, sql: str, args=()):
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        cur = conn.execute(sql, args)
+        return [d[0] for d in cur.description or []], cur.fetchall()
+    finally:
+        conn.close()
+
+def main():
+    ap = argparse.ArgumentParser(description="Zapytania do indeksu części (nctodxf_index.sqlite)")
+    ap.add_argument("db", help="Plik indeksu SQLite")
+    ap.add_argument("--grade", help="Gatunek, np. S355")
+    ap.add_argument("--thickness", type=float, help="Grubość w mm")
+    ap.add_argument("--slots", action="store_true", help="Tylko części z fasolkami")
+    ap.add_argument("--holes", action="store_true", help="Tylko części z otworami")
+    ap.add_argument("--piece", help="Wzorzec LIKE nazwy części, np. P1%%")
+    ap.add_argument("--assembly", help="Wzorzec LIKE zespołu")
+    ap.add_argument("--profile", help="Wzorzec LIKE profilu")
+    ap.add_argument("--sql", help="Własne zapytanie SELECT (tabela parts)")
+    ap.add_argument("--count", action="store_true", help="Tylko liczba wierszy i suma sztuk")
+    args = ap.parse_args()
+
+    db = Path(args.db)
+    if not db.exists():
+        sys.exit(f"Brak indeksu: {db}")
+    t0 = time.perf_counter()
+    if args.sql:
+        cols, rows = run_sql(db, args.sql)
+    else:
+        cols, rows = query(db, args.grade, args.thickness, args.slots, args.holes,
+                           args.piece, args.assembly, args.profile)
+    ms = (time.perf_counter() - t0) * 1000.0
+
+    if args.count and not args.sql:
+        qty = sum(r[cols.index("qty")] or 0 for r in rows)
+        print(f"części: {len(rows)}, sztuk: {qty}")
+    else:
+        print(";".join(cols))
+        for r in rows:
+            print(";".join("" if v is None else str(v) for v in r))
+    print(f"({len(rows)} wierszy, {ms:.1f} ms)", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Zwarty model części: współrzędne w array('d') zamiast list krotek.
+
+Contour – kontur AK/IK jako płaska tablica [x0, y0, k0, x1, y1, k1, ...]
+          (k = promień z NC1 albo bulge po build_xyb_from_points),
+Hole    – otwór BO (x, y, dia), Slot – fasolka BO (x1, y1, x2, y2, dia),
+PartModel – outer (Contour | None), inner [Contour], bo [Hole | Slot].
+
+Klasy mają __slots__; wierzchołek kosztuje 24 B zamiast ~150 B (krotka + 3 floaty),
+pickle tablic to surowe bajty (tanie przekazanie do procesów roboczych).
+Interfejs zgodny z dotychczasowym kodem: Contour zachowuje się jak lista (x, y, k),
+Hole/Slot jak krotka ("circle"|"slot", c1, c2, dia), PartModel rozpakowuje się
+jak wynik parse_nc_geometry, np.asarray(contour) to widok (n, 3) bez kopii.
+"""
+
+from array import array
+
+import numpy as np
+
+class Contour:
+    __slots__ = ("data",)
+
+    def __init__(self, data=None):
+        self.data = data if isinstance(data, array) else array("d", data or ())
+
+    @classmethod
+    def from_points(cls, pts):
+        """[(x, y, k), ...] -> Contour (Contour zwracany bez zmian)."""
+        if isinstance(pts, Contour):
+            return pts
+        data = array("d")
+        for x, y, k in pts:
+            data.append(x)
+            data.append(y)
+            data.append(k)
+        return cls(data)
+
+    def __len__(self):
+        return len(self.data) // 3
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("Contour index out of range")
+        d = self.data
+        return d[3 * i], d[3 * i + 1], d[3 * i + 2]
+
+    def __iter__(self):
+        d = self.data
+        return zip(d[0::3], d[1::3], d[2::3])
+
+    def __eq__(self, other):
+        if isinstance(other, Contour):
+            return self.data == other.data
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __array__(self, dtype=None, copy=None):
+        a = np.frombuffer(self.data, dtype=float).reshape(-1, 3)
+        return a.astype(dtype) if dtype is not None and dtype != a.dtype else a
+
+    def __repr__(self):
+        return f"Contour({len(self)} pkt)"
+
+class Hole:
+    __slots__ = ("x", "y", "dia")
+    kind = "circle"
+
+    def __init__(self, x, y, dia):
+        self.x, self.y, self.dia = x, y, dia
+
+    def astuple(self):
+        return ("circle", (self.x, self.y), None, self.dia)
+
+    def __iter__(self):
+        return iter(self.astuple())
+
+    def __getitem__(self, i):
+        # bez budowania krotki przy każdym dostępie (item[0], item[3] w pętlach rysowania)
+        if i == 0 or i == -4:
+            return "circle"
+        if i == 3 or i == -1:
+            return self.dia
+        if i == 1 or i == -3:
+            return (self.x, self.y)
+        if i == 2 or i == -2:
+            return None
+        return self.astuple()[i]        # wycinki; IndexError jak krotka
+
+    def __len__(self):
+        return 4
+
+    def __eq__(self, other):
+        if not isinstance(other, (tuple, Hole, Slot)):
+            return NotImplemented
+        return self.astuple() == tuple(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Hole({self.x}, {self.y}, {self.dia})"
+
+class Slot:
+    __slots__ = ("x1", "y1", "x2", "y2", "dia")
+    kind = "slot"
+
+    def __init__(self, x1, y1, x2, y2, dia):
+        self.x1, self.y1, self.x2, self.y2, self.dia = x1, y1, x2, y2, dia
+
+    def astuple(self):
+        return ("slot", (self.x1, self.y1), (self.x2, self.y2), self.dia)
+
+    def __iter__(self):
+        return iter(self.astuple())
+
+    def __getitem__(self, i):
+        if i == 0 or i == -4:
+            return "slot"
+        if i == 3 or i == -1:
+            return self.dia
+        if i == 1 or i == -3:
+            return (self.x1, self.y1)
+        if i == 2 or i == -2:
+            return (self.x2, self.y2)
+        return self.astuple()[i]
+
+    def __len__(self):
+        return 4
+
+    def __eq__(self, other):
+        if not isinstance(other, (tuple, Hole, Slot)):
+            return NotImplemented
+        return self.astuple() == tuple(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Slot({self.x1}, {self.y1}, {self.x2}, {self.y2}, {self.dia})"
+
+def bo_item(kind, c1, c2, dia):
+    """Krotka BO ("circle"|"slot", c1, c2, dia) -> Hole | Slot."""
+    if kind == "slot":
+        return Slot(c1[0], c1[1], c2[0], c2[1], dia)
+    return Hole(c1[0], c1[1], dia)
+
+class PartModel:
+    __slots__ = ("outer", "inner", "bo")
+
+    def __init__(self, outer=None, inner=None, bo=None):
+        self.outer = outer
+        self.inner = inner if inner is not None else []
+        self.bo = bo if bo is not None else []
+
+    def __iter__(self):
+        """outer_pts, inner_contours, bo_items = model"""
+        return iter((self.outer, self.inner, self.bo))
+
+    def __getstate__(self):
+        # pickle: same tablice; BO = rodzaje (0 otwór, 1 fasolka) + liczby (3 lub 5 na pozycję)
+        kinds, nums = array("b"), array("d")
+        for it in self.bo:
+            if it.kind == "slot":
+                kinds.append(1)
+                nums.extend((it.x1, it.y1, it.x2, it.y2, it.dia))
+            else:
+                kinds.append(0)
+                nums.extend((it.x, it.y, it.dia))
+        outer = self.outer.data if self.outer is not None else None
+        return outer, [c.data for c in self.inner], kinds, nums
+
+    def __setstate__(self, state):
+        outer, inner, kinds, nums = state
+        self.outer = Contour(outer) if outer is not None else None
+        self.inner = [Contour(d) for d in inner]
+        self.bo = []
+        i = 0
+        for kind in kinds:
+            if kind:
+                self.bo.append(Slot(*nums[i:i + 5]))
+                i += 5
+            else:
+                self.bo.append(Hole(*nums[i:i + 3]))
+                i += 3
+
+    def __repr__(self):
+        n = len(self.outer) if self.outer is not None else 0
+        return f"PartModel(AK {n} pkt, IK {len(self.inner)}, BO {len(self.bo)})"
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Szybki pre-nesting prostokątny (szacunek liczby arkuszy na gatunek + grubość).
+
+Każda sztuka = bbox części (+ GAP), ilość z nagłówka NC1. Pakowanie skyline
+bottom-left z obrotem o 90°, sztuki od największych; otwarte są tylko ostatnie
+OPEN_SHEETS arkusze, więc dziesiątki tysięcy sztuk liczą się w sekundach.
+Dla kilku formatów arkusza wybierany jest ten z najmniejszą łączną powierzchnią.
+To szacunek – właściwy nesting (kształty, wnęki) robi program do nestingu.
+"""
+
+import csv
+from pathlib import Path
+
+from sheets import block_name
+
+GAP = 10.0          # mm – odstęp między częściami
+MARGIN = 10.0       # mm – margines od krawędzi arkusza
+OPEN_SHEETS = 4
+ALLOW_ROTATE = True
+SHEET_LAYER = "SHEET"
+
+class Skyline:
+    """Arkusz W×H; skyline = lista [x, y, szerokość] od lewej do prawej."""
+
+    def __init__(self, width, height):
+        self.W, self.H = width, height
+        self.sky = [[0.0, 0.0, width]]
+        self.placed = []            # (id, x, y, obrócony)
+        self.area = 0.0
+
+    def _fit(self, i, w, h):
+        """Najniższe Y dla prostokąta w zaczynającego się w segmencie i (lub None)."""
+        x = self.sky[i][0]
+        if x + w > self.W + 1e-9:
+            return None
+        y = 0.0
+        rest = w
+        j = i
+        while rest > 1e-9:
+            if j >= len(self.sky):
+                return None
+            y = max(y, self.sky[j][1])
+            if y + h > self.H + 1e-9:
+                return None
+            rest -= self.sky[j][2]
+            j += 1
+        return y
+
+    def find(self, w, h, rotate=ALLOW_ROTATE):
+        """Najlepsze miejsce (y, x, i, w, h, obrót) – najniżej, potem najbardziej w lewo."""
+        best = None
+        for ww, hh, rot in ((w, h, False), (h, w, True)) if rotate and w != h else ((w, h, False),):
+            for i in range(len(self.sky)):
+                y = self._fit(i, ww, hh)
+                if y is not None and (best is None or (y + hh, self.sky[i][0]) < (best[0] + best[4], best[1])):
+                    best = (y, self.sky[i][0], i, ww, hh, rot)
+        return best
+
+    def place(self, item_id, spot, area):
+        y, x, i, w, h, rot = spot
+        new = [x, y + h, w]
+        # przytnij/usuń segmenty przykryte przez [x, x+w]
+        end = x + w
+        j = i
+        while j < len(self.sky) and self.sky[j][0] < end - 1e-9:
+            sx, sy, sw = self.sky[j]
+            if sx + sw <= end + 1e-9:
+                del self.sky[j]
+            else:
+                self.sky[j] = [end, sy, sx + sw - end]
+                break
+        self.sky.insert(i, new)
+        # scal sąsiadów o tej samej wysokości
+        k = 0
+        while k < len(self.sky) - 1:
+            if abs(self.sky[k][1] - self.sky[k + 1][1]) < 1e-9:
+                self.sky[k][2] += self.sky[k + 1][2]
+                del self.sky[k + 1]
+            else:
+                k += 1
+        self.placed.append((item_id, x, y, rot))
+        self.area += area
+
+def pack(items, sheet, gap=GAP, margin=MARGIN):
+    """
+    items: [(id, szer, wys, pole_netto), ...] (jedna pozycja = jedna sztuka),
+    sheet: (W, H). Zwraca (lista Skyline, lista id za dużych).
+    """
+    W, H = sheet[0] - 2 * margin + gap, sheet[1] - 2 * margin + gap
+    order = sorted(items, key=lambda it: (max(it[1], it[2]), it[1] * it[2]), reverse=True)
+    sheets = []
+    too_big = []
+    for item_id, w, h, area in order:
+        w, h = w + gap, h + gap
+        if not ((w <= W and h <= H) or (ALLOW_ROTATE and h <= W and w <= H)):
+            too_big.append(item_id)
+            continue
+        for sk in sheets[-OPEN_SHEETS:]:
+            spot = sk.find(w, h)
+            if spot is not None:
+                sk.place(item_id, spot, area)
+                break
+        else:
+            sk = Skyline(W, H)
+            sk.place(item_id, sk.find(w, h), area)
+            sheets.append(sk)
+    return sheets, too_big
+
+def prenest_group(parts, sheet_sizes, gap=GAP, margin=MARGIN):
+    """
+    parts: [(nazwa, ilość, (xmin,ymin,xmax,ymax), pole_netto), ...] jednej grupy.
+    Zwraca wynik dla najlepszego formatu: {"sheet", "sheets", "too_big", "utilization", "instances"}.
+    Id sztuki = indeks części w parts.
+    """
+    items = []
+    for idx, (_, qty, box, area) in enumerate(parts):
+        w, h = box[2] - box[0], box[3] - box[1]
+        items.extend((idx, w, h, area if area else w * h) for _ in range(int(qty)))
+    best = None
+    for size in sheet_sizes:
+        sheets, too_big = pack(items, size, gap, margin)
+        total = len(sheets) * size[0] * size[1]
+        used = sum(sk.area for sk in sheets)
+        res = {"sheet": size, "sheets": sheets, "too_big": too_big, "instances": len(items),
+               "utilization": used / total if total else 0.0, "total": total}
+        if best is None or (len(too_big), total) < (len(best["too_big"]), best["total"]):
+            best = res
+    return best
+
+def write_prenest_report(rows, path: Path) -> None:
+    fields = ["grade", "thickness", "sheet", "sheets", "instances", "too_big", "utilization_pct"]
+    with path.open("w", encoding="utf-8-sig", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=fields, delimiter=";")
+        w.writeheader()
+        w.writerows(rows)
+
+def write_layout_dxf(path: Path, result, parts, geoms, new_doc, draw_part, finish_doc,
+                     margin=MARGIN) -> None:
+    """
+    Układ arkuszy w DXF: prostokąty arkuszy (warstwa SHEET) obok siebie,
+    sztuki jako INSERT bloków części (parts jak w prenest_group, geoms[id] = build_part).
+    """
+    doc, msp = new_doc()
+    if SHEET_LAYER not in doc.layers:
+        doc.layers.add(SHEET_LAYER, color=8)
+    used = {b.name.upper() for b in doc.blocks}
+    blocks = {}
+    for idx in sorted({item_id for sk in result["sheets"] for item_id, *_ in sk.placed}):
+        blk = doc.blocks.new(block_name(parts[idx][0], used))
+        draw_part(doc, blk, geoms[idx])
+        blocks[idx] = (parts[idx][2], blk.name)
+    W, H = result["sheet"]
+    for n, sk in enumerate(result["sheets"]):
+        ox = n * (W + 100.0)
+        msp.add_lwpolyline([(ox, 0), (ox + W, 0), (ox + W, H), (ox, H)], close=True,
+                           dxfattribs={"layer": SHEET_LAYER})
+        for item_id, x, y, rot in sk.placed:
+            box, name = blocks[item_id]
+            px, py = ox + margin + x, margin + y
+            if rot:
+                # obrót o 90° CCW: lewy dolny róg bboxa -> (px, py)
+                ins = (px + box[3], py - box[0])
+                msp.add_blockref(name, ins, dxfattribs={"rotation": 90.0})
+            else:
+                msp.add_blockref(name, (px - box[0], py - box[1]))
+    finish_doc(doc, msp, path)
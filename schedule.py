@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Kolejność i podział pracy przebiegu równoległego wg przewidywanego kosztu plików.
+
+Koszt: rozmiar pliku (stat / ZIP – bez czytania treści) albo szybki przegląd treści:
+wierzchołki AK/IK + otwory BO z wagą (otwór = kilka encji i obliczeń metryk).
+Plan (LPT): najdroższe pliki pierwsze i pojedynczo, drobne łączone w paczki o
+podobnym łącznym koszcie (mniej narzutu na zadanie) – przebieg nie kończy się
+jednym procesem mielącym dużą blachę perforowaną, gdy reszta stoi.
+run_plan: odczyt NC (I/O, wolny udział) w osobnej puli wątków z własnym limitem,
+obliczenia w puli CPU; w toku najwyżej `window` paczek (pamięć ograniczona).
+"""
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+CHUNKS_PER_WORKER = 8    # docelowa liczba paczek na proces (drobne pliki)
+BO_WEIGHT = 4.0          # koszt otworu BO względem wierzchołka AK/IK
+BASE_COST = 500.0        # stały koszt pliku (nagłówek, dokument DXF, zapis) ≈ 120 otworów
+IO_WORKERS = 4           # równoległe odczyty plików NC (niezależnie od liczby procesów CPU)
+
+def scan_cost(data: bytes) -> float:
+    """Koszt z treści NC1: linie bloków AK/IK i BO (bez parsowania liczb)."""
+    vertices = holes = 0
+    block = b""
+    for ln in data.splitlines():
+        s = ln.strip()
+        if len(s) == 2 and s.isalpha() and s.isupper():
+            block = s
+        elif s and not s.startswith(b"**"):
+            if block in (b"AK", b"IK"):
+                vertices += 1
+            elif block == b"BO":
+                holes += 1
+    return BASE_COST + vertices + BO_WEIGHT * holes
+
+def size_cost(size: int) -> float:
+    """Koszt z rozmiaru pliku (linia BO ~38 B ≈ BO_WEIGHT jednostek)."""
+    return BASE_COST + size / 9.0
+
+def fifo_plan(n: int, workers: int) -> list[list[int]]:
+    """Dotychczasowy podział: kolejność wejścia, stała paczka (jak Executor.map z chunksize)."""
+    size = max(1, n // (workers * CHUNKS_PER_WORKER))
+    return [list(range(i, min(i + size, n))) for i in range(0, n, size)]
+
+def plan(costs, workers: int) -> list[list[int]]:
+    """Paczki indeksów w kolejności wysyłki: malejący koszt, drobne pliki łączone do ~równego kosztu."""
+    order = sorted(range(len(costs)), key=lambda i: costs[i], reverse=True)
+    target = sum(costs) / max(1, workers * CHUNKS_PER_WORKER)
+    chunks, cur, cur_cost = [], [], 0.0
+    for i in order:
+        if costs[i] >= target:
+            chunks.append([i])
+            continue
+        if cur and cur_cost + costs[i] > target:
+            chunks.append(cur)
+            cur, cur_cost = [], 0.0
+        cur.append(i)
+        cur_cost += costs[i]
+    if cur:
+        chunks.append(cur)
+    return chunks
+
+def simulate(times, chunks, workers: int, overhead: float = 0.0) -> float:
+    """Makespan planu: paczka idzie do pierwszego wolnego procesu; overhead – koszt wysłania paczki."""
+    free = [0.0] * workers
+    for chunk in chunks:
+        k = min(range(workers), key=free.__getitem__)
+        free[k] += overhead + sum(times[i] for i in chunk)
+    return max(free)
+
+def run_plan(pool, fn, jobs, chunks, load=None, io_workers: int = IO_WORKERS, window: int = 8):
+    """
+    Generator (indeks zadania, wynik) w kolejności ukończenia.
+    fn(lista zadań) -> lista wyników – wykonywane w pool (procesy lub wątki);
+    load(zadanie) -> zadanie – odczyt danych w puli io_workers wątków, przed wysłaniem paczki.
+    """
+    todo = deque(chunks)
+    loading = deque()        # (paczka, future z zadaniami) w kolejności planu
+    running = {}             # future -> paczka
+    with ThreadPoolExecutor(max_workers=max(1, io_workers)) as io:
+        def refill():
+            while todo and len(loading) + len(running) < window:
+                chunk = todo.popleft()
+                if load is None:
+                    loading.append((chunk, None))
+                else:
+                    loading.append((chunk, io.submit(lambda c=chunk: [load(jobs[i]) for i in c])))
+
+        refill()
+        while loading or running:
+            while loading and (loading[0][1] is None or loading[0][1].done()):
+                chunk, fut = loading.popleft()
+                batch = [jobs[i] for i in chunk] if fut is None else fut.result()
+                running[pool.submit(fn, batch)] = chunk
+            if not running:
+                loading[0][1].result()     # nic nie liczy – czekamy na odczyt
+                continue
+            done, _ = wait(list(running) + ([loading[0][1]] if loading else []), return_when=FIRST_COMPLETED)
+            for fut in done:
+                chunk = running.pop(fut, None)
+                if chunk is not None:
+                    yield from zip(chunk, fut.result())
+            refill()
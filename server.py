@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lokalny serwer konwersji NC1 -> DXF (HTTP, domyślnie tylko localhost).
+
+Licencja weryfikowana raz przy starcie; pula procesów roboczych trzyma załadowane
+ezdxf/parsery (rozgrzewka przykładową częścią), więc pojedyncza część to
+milisekundy zamiast startu EXE (rozpakowanie onefile, importy, wmic).
+
+  nctodxf.exe --serve [--port 8765] [--workers 4]      (albo: python server.py ...)
+  nctodxf.exe --serve --host 0.0.0.0 --root D:/NC      (sieć: {"path"} tylko wewnątrz --root)
+
+GET  /health                  -> {"status": "ok", "workers": N, "license_to": ...}
+POST /convert                 -> treść NC1 w body; odpowiedź: bajty DXF
+       ?stem=nazwa_pliku        (nazwa części, gdy brak jej w nagłówku)
+       ?format=json             (zamiast DXF: JSON z name/file_stem/header/info/dxf_base64)
+     nagłówki odpowiedzi DXF: X-NC-Name, X-NC-File-Stem (URL-encoded), X-NC-Header (JSON)
+POST /convert  Content-Type: application/json
+       {"path": "C:/.../P1.nc1"} lub {"text": "...", "stem": "P1"} -> JSON jak wyżej
+       "path" czyta plik serwera: przy --root tylko wewnątrz katalogu (względna = od --root),
+       bez --root tylko gdy serwer słucha na loopback (inaczej 403)
+Żądania obsługiwane równolegle (wątek na połączenie, konwersja w puli procesów);
+pula z martwym procesem roboczym (BrokenProcessPool) jest odtwarzana, żądanie ponawiane raz.
+"""
+
+import argparse
+import base64
+import ipaddress
+import json
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, quote, urlsplit
+
+HOST = "127.0.0.1"
+PORT = 8765
+WORKERS = max(1, (os.cpu_count() or 2) - 1)
+MAX_BODY = 32 * 1024 * 1024     # B – limit treści żądania
+TIMEOUT = 120.0                 # s – limit konwersji jednej części
+
+# mała część do rozgrzania procesu roboczego (importy, pierwsze wywołania ezdxf)
+WARMUP_NC = "ST\n** rozgrzewka\n  1\n  1\n  WARMUP\n  WARMUP\n  S355\n  1\n  BL10\n  B\nB\n  100\n  100\n  10\nAK\n  v 0 0 0\n  100 0 0\n  100 100 0\n  0 100 0\nBO\n  v 50 50 10\nEN\n"
+
+_lic = None
+_template = None      # dokument DXF procesu roboczego (jedno żądanie naraz na proces)
+
+def _init_worker(lic_payload: dict) -> None:
+    global _lic, _template
+    import main
+    _lic = lic_payload
+    _template = main.new_dxf_template()
+    main.nc_to_dxf_bytes(WARMUP_NC, _lic, "warmup", _template)
+
+def _convert(txt: str, stem: str) -> dict:
+    import main
+    return main.nc_to_dxf_bytes(txt, _lic, stem, _template)
+
+def _new_pool(workers: int, lic: dict) -> ProcessPoolExecutor:
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(lic,))
+    # wszystkie procesy startują i rozgrzewają się przed pierwszym żądaniem
+    list(pool.map(_convert, [WARMUP_NC] * workers, ["warmup"] * workers))
+    return pool
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False                    # nazwa hosta / "" – może wskazywać na interfejs sieciowy
+
+def _json_result(res: dict) -> dict:
+    return {"name": res["name"], "file_stem": res["file_stem"], "header": res["header"],
+            "info": res["info"], "dxf_base64": base64.b64encode(res["dxf"]).decode("ascii")}
+
+class ConvertHandler(BaseHTTPRequestHandler):
+    server_version = "nctodxf"
+    protocol_version = "HTTP/1.1"       # keep-alive – klienci nie otwierają połączenia na część
+
+    def log_message(self, fmt, *args):
+        if not self.server.quiet:
+            sys.stderr.write("%s - %s\n" % (self.address_string(), fmt % args))
+
+    def _send(self, code: int, body: bytes, ctype: str, headers: dict | None = None) -> None:
+        self.send_response(code)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, code: int, obj) -> None:
+        self._send(code, json.dumps(obj, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8")
+
+    def _allowed_path(self, raw: str) -> Path:
+        root = self.server.root
+        if root is None:
+            if not self.server.local:
+                raise PermissionError('{"path"} wyłączone: serwer słucha poza localhost bez --root')
+            return Path(raw)
+        path = (root / raw).resolve()
+        if not path.is_relative_to(root):
+            raise PermissionError(f'{{"path"}} poza katalogiem --root ({root})')
+        return path
+
+    def _run(self, txt: str, stem: str) -> dict:
+        """Konwersja w puli; po awarii procesu roboczego pula odtwarzana, jedna ponowna próba."""
+        for attempt in (1, 2):
+            pool = self.server.pool
+            try:
+                return pool.submit(_convert, txt, stem).result(timeout=TIMEOUT)
+            except BrokenProcessPool:
+                self.server.rebuild_pool(pool)
+                if attempt == 2:
+                    raise
+
+    def do_GET(self):
+        if urlsplit(self.path).path == "/health":
+            self._send_json(200, {"status": "ok", "workers": self.server.workers,
+                                  "license_to": self.server.lic.get("name", "")})
+        else:
+            self._send_json(404, {"error": "nieznany adres"})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != "/convert":
+            self._send_json(404, {"error": "nieznany adres"})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY:
+            self._send_json(413, {"error": f"treść większa niż {MAX_BODY} B"})
+            self.close_connection = True
+            return
+        body = self.rfile.read(length)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        as_json = query.get("format") == "json"
+        stem = query.get("stem", "")
+
+        try:
+            if (self.headers.get("Content-Type") or "").startswith("application/json"):
+                req = json.loads(body.decode("utf-8"))
+                as_json = True
+                if "path" in req:
+                    path = self._allowed_path(req["path"])
+                    txt = path.read_text(encoding="utf-8", errors="replace")
+                    stem = req.get("stem") or path.stem
+                else:
+                    txt = req["text"]
+                    stem = req.get("stem", stem)
+            else:
+                txt = body.decode("utf-8", errors="replace")
+        except PermissionError as e:
+            self._send_json(403, {"error": str(e)})
+            return
+        except (ValueError, KeyError, OSError) as e:
+            self._send_json(400, {"error": f"nieprawidłowe żądanie: {e}"})
+            return
+
+        try:
+            res = self._run(txt, stem)
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+            return
+
+        if as_json:
+            self._send_json(200, _json_result(res))
+        else:
+            self._send(200, res["dxf"], "application/dxf", {
+                "X-NC-Name": quote(res["name"]),
+                "X-NC-File-Stem": quote(res["file_stem"]),
+                "X-NC-Header": json.dumps(res["header"], ensure_ascii=True),
+            })
+
+class ConvertServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, host: str, port: int, workers: int, lic: dict, quiet: bool = False,
+                 root: str | None = None):
+        self.pool = _new_pool(workers, lic)
+        self.pool_lock = threading.Lock()
+        self.lic, self.workers, self.quiet = lic, workers, quiet
+        self.local = _is_loopback(host)
+        self.root = Path(root).resolve() if root else None
+        try:
+            super().__init__((host, port), ConvertHandler)
+        except BaseException:
+            self.pool.shutdown(cancel_futures=True)
+            raise
+
+    def rebuild_pool(self, broken: ProcessPoolExecutor) -> None:
+        """Nowa pula w miejsce zepsutej (raz – inne wątki z tą samą pulą już jej nie tworzą)."""
+        with self.pool_lock:
+            if self.pool is broken:
+                if not self.quiet:
+                    sys.stderr.write("proces roboczy zakończył się nieoczekiwanie – nowa pula\n")
+                broken.shutdown(wait=False, cancel_futures=True)
+                self.pool = _new_pool(self.workers, self.lic)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.pool.shutdown(cancel_futures=True)
+
+def serve(host: str = HOST, port: int = PORT, workers: int = WORKERS, quiet: bool = False,
+          root: str | None = None) -> None:
+    import main
+    lic = main.verify_license_or_exit(wait=False)
+    httpd = ConvertServer(host, port, workers, lic, quiet, root)
+    print(f"{main.PROGRAM_NAME}: serwer http://{host}:{port} (procesy: {workers}) – Ctrl+C kończy")
+    if httpd.root is None and not httpd.local:
+        print('  {"path"}: wyłączone (adres poza localhost, brak --root)')
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="Lokalny serwer konwersji NC1 -> DXF")
+    ap.add_argument("--host", default=HOST, help="Adres nasłuchu (domyślnie tylko localhost)")
+    ap.add_argument("--port", type=int, default=PORT)
+    ap.add_argument("--workers", type=int, default=WORKERS, help="Liczba procesów roboczych")
+    ap.add_argument("--root", help='Katalog, z którego wolno czytać {"path"} (wymagany poza localhost)')
+    ap.add_argument("--quiet", action="store_true", help="Bez logu żądań")
+    args = ap.parse_args(argv)
+    serve(args.host, args.port, max(1, args.workers), args.quiet, args.root)
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    main()
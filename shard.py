@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Jeden projekt konwertowany wspólnie przez kilka stanowisk – bez serwera, przez katalog kolejki.
+
+  nctodxf.exe --shard \\\\serwer\\kolejka \\\\serwer\\projekt -r -o \\\\serwer\\dxf   (na każdym stanowisku)
+  python shard.py KOLEJKA PROJEKT ...                    (lokalnie: kilka procesów = kilka węzłów)
+
+Katalog KOLEJKA:
+  manifest.json       – pliki NC (ścieżki względem PROJEKT) w paczkach po CHUNK; tworzy pierwszy węzeł
+  leases/NNNNN.lease  – dzierżawa paczki (treść = węzeł): tworzona atomowo (O_EXCL), mtime
+                        odświeżany co TTL/3; starsza niż TTL (węzeł padł) – przejmowana przez rename
+                        na *.stale; węzeł, który ją utracił, porzuca paczkę bez zapisu
+  journal/NNNNN.txt   – "stara<TAB>nowa" zapisywane przed każdą zmianą nazwy; węzeł przejmujący
+                        paczkę znajduje w nim pliki przemianowane przed awarią
+  reports/WĘZEŁ.jsonl – wiersze raportu węzła, dopisywane po ukończeniu całej paczki
+  done/NNNNN          – paczka gotowa; treść = węzeł, którego wiersze trafiają do raportu
+  nctodxf_raport.csv  – raport scalony przez węzeł, który jako pierwszy zobaczy wszystkie paczki
+Zegary stanowisk (mtime na udziale) muszą się zgadzać z dokładnością dużo lepszą niż TTL.
+Tylko zmiana nazw + DXF i raport; BOM/indeks/arkusze – zwykłym przebiegiem po zakończeniu.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from pathlib import Path, PurePosixPath
+
+import main
+
+CHUNK = 50          # plików na paczkę
+TTL = 300.0         # s – dzierżawa bez odświeżenia dłużej niż TTL jest przejmowana
+POLL = 10.0         # s – oczekiwanie na paczki innych węzłów (przejęcie po awarii)
+
+def _create_excl(path: Path, text: str) -> bool:
+    """Atomowe utworzenie pliku; False, gdy już istnieje."""
+    try:
+        fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return False
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(text)
+    return True
+
+def _write_atomic(path: Path, text: str) -> None:
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+class ShardQueue:
+    """Stan kolejki w katalogu work_dir; node – nazwa węzła (domyślnie host-pid)."""
+
+    def __init__(self, work_dir: Path, node: str | None = None, ttl: float = TTL):
+        self.dir = Path(work_dir)
+        self.node = node or f"{socket.gethostname()}-{os.getpid()}"
+        self.ttl = ttl
+        self.manifest = None
+        for sub in ("leases", "journal", "reports", "done"):
+            (self.dir / sub).mkdir(parents=True, exist_ok=True)
+
+    def ensure_manifest(self, root: Path, recursive: bool, chunk: int = CHUNK) -> dict:
+        path, lock = self.dir / "manifest.json", self.dir / "manifest.lock"
+        while not path.exists():
+            if _create_excl(lock, self.node):
+                files = [p.relative_to(root).as_posix() for p in main.find_candidates([root], recursive)]
+                _write_atomic(path, json.dumps({
+                    "created_by": self.node, "recursive": recursive, "files": len(files),
+                    "chunks": [files[i:i + chunk] for i in range(0, len(files), chunk)],
+                }, ensure_ascii=False))
+                break
+            if not path.exists() and self._expired(lock):     # twórca padł w trakcie listowania
+                lock.unlink(missing_ok=True)
+            time.sleep(0.5)
+        self.manifest = json.loads(path.read_text(encoding="utf-8"))
+        return self.manifest
+
+    def _lease(self, i: int) -> Path:
+        return self.dir / "leases" / f"{i:05d}.lease"
+
+    def _done(self, i: int) -> Path:
+        return self.dir / "done" / f"{i:05d}"
+
+    def _expired(self, path: Path) -> bool:
+        try:
+            return time.time() - path.stat().st_mtime > self.ttl
+        except FileNotFoundError:
+            return False
+
+    def _steal(self, lease: Path) -> bool:
+        """Przejęcie przeterminowanej dzierżawy – rename udaje się tylko jednemu węzłowi."""
+        stale = lease.with_name(f"{lease.name}.{self.node}.stale")
+        try:
+            os.replace(lease, stale)
+        except OSError:
+            return False
+        fresh = not self._expired(stale)
+        if fresh:           # między sprawdzeniem a rename ktoś założył nową – oddaj
+            _create_excl(lease, stale.read_text(encoding="utf-8"))
+        stale.unlink(missing_ok=True)
+        return not fresh
+
+    def pending(self) -> list[int]:
+        return [i for i in range(len(self.manifest["chunks"])) if not self._done(i).exists()]
+
+    def claim(self) -> int | None:
+        """Numer wolnej albo przejętej paczki; None, gdy nic do wzięcia."""
+        todo = self.pending()
+        if not todo:
+            return None
+        start = hash(self.node) % len(todo)        # węzły zaczynają w różnych miejscach
+        for i in todo[start:] + todo[:start]:
+            lease = self._lease(i)
+            if _create_excl(lease, self.node) or (self._expired(lease) and self._steal(lease)
+                                                   and _create_excl(lease, self.node)):
+                if self._done(i).exists():         # ukończona w międzyczasie
+                    lease.unlink(missing_ok=True)
+                    continue
+                return i
+        return None
+
+    def owns(self, i: int) -> bool:
+        """Dzierżawa paczki nadal należy do tego węzła (treść pliku = node)."""
+        try:
+            return self._lease(i).read_text(encoding="utf-8") == self.node
+        except OSError:
+            return False
+
+    @contextlib.contextmanager
+    def holding(self, i: int):
+        """
+        Odświeżanie dzierżawy w tle na czas przetwarzania paczki -> Event "utracona":
+        ustawiany, gdy dzierżawę przejął inny węzeł (jej mtime nie jest wtedy odświeżany).
+        """
+        lease, stop, lost = self._lease(i), threading.Event(), threading.Event()
+
+        def beat():
+            while not stop.wait(self.ttl / 3):
+                if not self.owns(i):
+                    lost.set()
+                    return
+                try:
+                    os.utime(lease)
+                except OSError:
+                    pass
+
+        t = threading.Thread(target=beat, daemon=True)
+        t.start()
+        try:
+            yield lost
+        finally:
+            stop.set()
+            t.join()
+
+    def journal(self, i: int, root: Path):
+        """-> (wcześniejsze zmiany nazw {stara: nowa}, plik dziennika, funkcja before_rename)."""
+        path = self.dir / "journal" / f"{i:05d}.txt"
+        renamed = {}
+        if path.exists():
+            for line in path.read_text(encoding="utf-8").splitlines():
+                src, _, dst = line.partition("\t")
+                if dst:
+                    renamed[src] = dst
+        f = path.open("a", encoding="utf-8")
+
+        def before_rename(p: Path, target: Path) -> None:
+            f.write(f"{p.relative_to(root).as_posix()}\t{target.relative_to(root).as_posix()}\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        return renamed, f, before_rename
+
+    def complete(self, i: int, rows: list[dict]) -> bool:
+        """Wiersze do raportu węzła, done/ i zwolnienie dzierżawy; False (nic nie zapisane), gdy
+        dzierżawa należy już do innego węzła – paczkę kończy on."""
+        if not self.owns(i):
+            return False
+        text = "".join(json.dumps({**r, "chunk": i, "node": self.node}, ensure_ascii=False) + "\n"
+                       for r in rows)
+        with (self.dir / "reports" / f"{self.node}.jsonl").open("a", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        _write_atomic(self._done(i), self.node)
+        self._lease(i).unlink(missing_ok=True)
+        return True
+
+    def merge(self, report_path: Path | None = None) -> tuple[Path, int]:
+        """Raport scalony z raportów węzłów (wiersze paczki tylko od węzła z done/)."""
+        owner = {i: self._done(i).read_text(encoding="utf-8") for i in range(len(self.manifest["chunks"]))
+                 if self._done(i).exists()}
+        rows = []
+        for path in sorted((self.dir / "reports").glob("*.jsonl")):
+            with path.open(encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        row = json.loads(line)
+                    except ValueError:          # urwana linia po awarii węzła
+                        continue
+                    if owner.get(row.get("chunk")) == row.get("node"):
+                        rows.append(row)
+        rows.sort(key=lambda r: r["chunk"])
+        report_path = report_path or self.dir / main.REPORT_NAME
+        main.write_run_report(rows, report_path)
+        return report_path, len(rows)
+
+def run_node(work_dir: Path, root: Path, lic: dict, recursive: bool | None = None,
+             out_dir: Path | None = None, rename: bool = True, dxf: bool = True, chunk: int = CHUNK,
+             ttl: float = TTL, node: str | None = None, quiet: bool = False) -> dict:
+    """
+    Węzeł: bierze paczki aż wszystkie będą gotowe; ostatni scala raport. -> statystyki węzła.
+    recursive None → main.RECURSIVE w chwili wywołania.
+    """
+    recursive = main.RECURSIVE if recursive is None else recursive
+
+    def say(*args):
+        if not quiet:
+            print(*args)
+
+    def warn(msg):
+        print(msg, file=sys.stderr if quiet else sys.stdout)
+
+    q = ShardQueue(work_dir, node, ttl)
+    manifest = q.ensure_manifest(root, recursive, chunk)
+    stats = {"chunks": 0, "files": 0, "renamed": 0, "errors": 0, "merged": None}
+    say(f"Węzeł {q.node}: {manifest['files']} plików w {len(manifest['chunks'])} paczkach")
+    while True:
+        i = q.claim()
+        if i is None:
+            if not q.pending():
+                break
+            time.sleep(min(POLL, ttl / 3))      # paczki u innych – czekamy na koniec albo awarię
+            continue
+        rows, done = [], False
+        with q.holding(i) as lost:
+            renamed, jf, before_rename = q.journal(i, root)
+            with jf:
+                for rel in manifest["chunks"][i]:
+                    if lost.is_set():               # przejęta (np. po przerwie > TTL) – nie ruszamy plików
+                        break
+                    p = root / rel
+                    if not p.exists() and rel in renamed:
+                        p = root / renamed[rel]
+                    odir = out_dir / PurePosixPath(rel).parent if out_dir is not None else None
+                    res = main.process_file(p, lic, rename, dxf, odir, before_rename=before_rename)
+                    for is_err, msg in res["log"]:
+                        if is_err:
+                            warn(msg)
+                        else:
+                            say(msg)
+                    stats["files"] += 1
+                    stats["renamed"] += res["renamed"]
+                    stats["errors"] += res["errors"]
+                    if res["row"] is not None:
+                        rows.append(res["row"])
+            done = not lost.is_set() and q.complete(i, rows)
+        if not done:
+            warn(f"⚠️  paczka {i}: dzierżawę przejął inny węzeł – porzucona")
+            continue
+        stats["chunks"] += 1
+        say(f"   ↳ paczka {i}: {len(rows)} plików gotowe")
+
+    if _create_excl(q.dir / "merge.lock", q.node):
+        path, n = q.merge()
+        stats["merged"] = str(path)
+        say(f"Raport scalony ({n} wierszy): {path}")
+    say(f"Węzeł {q.node}: paczek {stats['chunks']}, plików {stats['files']}, błędów {stats['errors']}.")
+    return stats
+
+def main_cli(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Konwersja jednego projektu na kilku stanowiskach "
+                                             "(kolejka w katalogu wspólnym)")
+    ap.add_argument("queue", type=Path, help="Katalog kolejki – ten sam dla wszystkich węzłów")
+    ap.add_argument("root", type=Path, help="Katalog projektu z plikami NC (ścieżka z tego stanowiska)")
+    ap.add_argument("-r", "--recursive", action="store_true", default=main.RECURSIVE, help="Także podkatalogi")
+    ap.add_argument("-o", "--output-dir", type=Path, help="Katalog na DXF (drzewo jak wejście)")
+    mode = ap.add_mutually_exclusive_group()
+    mode.add_argument("--rename-only", action="store_true", help="Tylko zmiana nazw NC, bez DXF")
+    mode.add_argument("--dxf-only", action="store_true", help="Tylko DXF, bez zmiany nazw NC")
+    ap.add_argument("--chunk", type=int, default=CHUNK, help="Plików na paczkę (przy tworzeniu manifestu)")
+    ap.add_argument("--ttl", type=float, default=TTL, help="Czas dzierżawy paczki [s]")
+    ap.add_argument("--node", help="Nazwa węzła (domyślnie host-pid)")
+    ap.add_argument("--merge", action="store_true", help="Tylko scal raporty węzłów i zakończ")
+    ap.add_argument("-q", "--quiet", action="store_true", help="Tylko błędy (na stderr)")
+    args = ap.parse_args(argv)
+
+    if args.merge:
+        q = ShardQueue(args.queue, args.node, args.ttl)
+        q.manifest = json.loads((q.dir / "manifest.json").read_text(encoding="utf-8"))
+        path, n = q.merge()
+        print(f"Raport scalony ({n} wierszy, brak paczek: {len(q.pending())}): {path}")
+        return 1 if q.pending() else 0
+    if not args.root.is_dir():
+        ap.error(f"brak katalogu: {args.root}")
+
+    out = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(out):
+            lic = main.verify_license_or_exit(wait=False)
+    except SystemExit:
+        print(out.getvalue().strip(), file=sys.stderr)
+        return 2
+    stats = run_node(args.queue, args.root, lic, args.recursive, args.output_dir,
+                     rename=not args.dxf_only, dxf=not args.rename_only, chunk=max(1, args.chunk),
+                     ttl=args.ttl, node=args.node, quiet=args.quiet)
+    return 1 if stats["errors"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Zbiorcze DXF "arkuszy": jeden plik na grupę gatunek + grubość.
+
+Każda część to nazwany blok (geometria 1:1 z NC1) z atrybutami NAME i QTY,
+wstawiony w prostą siatkę (komórka = największy bbox w grupie + GAP).
+CAM importuje jeden plik na grupę zamiast tysięcy pojedynczych DXF.
+Grupy budowane w tym samym przebiegu z już sparsowanych części (build_part).
+"""
+
+import math
+import re
+from collections import defaultdict
+from pathlib import Path
+
+from validate import flatten_xyb
+
+GAP = 20.0            # mm – odstęp między częściami w siatce
+LABEL_LAYER = "LABEL"
+LABEL_HEIGHT = 10.0
+
+def part_bbox(part):
+    """(xmin, ymin, xmax, ymax) części – z OUTER (łuki spłaszczone) lub z wycięć."""
+    pts = flatten_xyb(part["outer"]) if part["outer"] else []
+    if not pts:
+        for kind, obj in part["cutouts"]:
+            if kind == "IK":
+                pts.extend(flatten_xyb(obj))
+            else:
+                _, c1, c2, dia = obj
+                r = dia / 2.0
+                for x, y in (c1, c2 or c1):
+                    pts += [(x - r, y - r), (x + r, y + r)]
+    if not pts:
+        return (0.0, 0.0, 0.0, 0.0)
+    xs = [p[0] for p in pts]
+    ys = [p[1] for p in pts]
+    return (min(xs), min(ys), max(xs), max(ys))
+
+def block_name(name: str, used: set) -> str:
+    """Nazwa bloku DXF z nazwy części (bez znaków niedozwolonych, unikalna)."""
+    base = re.sub(r'[<>/\\":;?*|=`,]+', "_", name).strip() or "PART"
+    out, n = base, 1
+    while out.upper() in used:
+        n += 1
+        out = f"{base}_{n}"
+    used.add(out.upper())
+    return out
+
+class SheetGroups:
+    """Części zebrane w przebiegu: (gatunek, grubość) -> [(nazwa, ilość, part)]."""
+
+    def __init__(self):
+        self.groups = defaultdict(list)
+
+    def add(self, grade, thickness, name, qty, part) -> None:
+        self.groups[(grade, thickness)].append((name, qty, part))
+
+    def write_all(self, out_dir: Path, new_doc, draw_part, finish_doc) -> list[Path]:
+        """
+        Zapisuje DXF każdej grupy do out_dir/{gatunek}-{grubość}.dxf.
+        new_doc() -> (doc, msp), draw_part(doc, layout, part), finish_doc(doc, msp, path).
+        """
+        out_dir.mkdir(parents=True, exist_ok=True)
+        written = []
+        for (grade, thickness), parts in self.groups.items():
+            path = out_dir / f"{grade}-{thickness}.dxf"
+            self.write_group(path, parts, new_doc, draw_part, finish_doc)
+            written.append(path)
+        return written
+
+    @staticmethod
+    def write_group(path: Path, parts, new_doc, draw_part, finish_doc) -> None:
+        doc, msp = new_doc()
+        if LABEL_LAYER not in doc.layers:
+            doc.layers.add(LABEL_LAYER, color=2)
+
+        boxes = [part_bbox(part) for _, _, part in parts]
+        cell_w = max(b[2] - b[0] for b in boxes) + GAP
+        cell_h = max(b[3] - b[1] for b in boxes) + GAP + 2.0 * LABEL_HEIGHT
+        cols = max(1, math.ceil(math.sqrt(len(parts))))
+
+        used = {b.name.upper() for b in doc.blocks}
+        for n, ((name, qty, part), box) in enumerate(zip(parts, boxes)):
+            blk = doc.blocks.new(block_name(name, used))
+            draw_part(doc, blk, part)
+            blk.add_attdef("NAME", (box[0], box[1] - 1.5 * LABEL_HEIGHT),
+                           dxfattribs={"layer": LABEL_LAYER, "height": LABEL_HEIGHT})
+            blk.add_attdef("QTY", (box[0], box[1] - 3.0 * LABEL_HEIGHT),
+                           dxfattribs={"layer": LABEL_LAYER, "height": LABEL_HEIGHT})
+
+            # lewy dolny róg bboxa części w lewym dolnym rogu komórki
+            cx = (n % cols) * cell_w
+            cy = -(n // cols) * cell_h
+            ref = msp.add_blockref(blk.name, (cx - box[0], cy - box[1]), dxfattribs={"layer": "0"})
+            ref.add_auto_attribs({"NAME": name, "QTY": str(qty)})
+
+        finish_doc(doc, msp, path)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Upraszczanie konturów AK/IK (mniej wierzchołków w LWPOLYLINE):
+- usuwa zdublowane kolejne punkty (prosty odcinek zerowy, |p_i p_i+1| <= tol;
+  krótki łuk o cięciwie <= tol zostaje),
+- łączy współliniowe odcinki proste (k == 0), gdy pominięte punkty leżą
+  w odległości <= tol od nowego odcinka.
+
+Łuki (k != 0) nie są ruszane: punkt z łukiem wchodzącym lub wychodzącym zostaje.
+Wynik to podciąg punktów wejściowych – zachowane XY są 1:1 z NC1 (nic nie jest
+przesuwane, zmienić się może tylko k punktu przy usuwaniu duplikatu za łukiem).
+"""
+
+import math
+
+EPS = 1e-9
+
+def _near_segment(q, a, c, tol) -> bool:
+    ax, ay = a[0], a[1]
+    dx, dy = c[0] - ax, c[1] - ay
+    L2 = dx * dx + dy * dy
+    t = 0.0 if L2 < EPS else max(0.0, min(1.0, ((q[0] - ax) * dx + (q[1] - ay) * dy) / L2))
+    return math.hypot(q[0] - (ax + t * dx), q[1] - (ay + t * dy)) <= tol
+
+def _removable(a, run, c, tol) -> bool:
+    """Punkty run (między a i c) można pominąć: same proste i blisko odcinka a->c."""
+    if abs(a[2]) >= EPS or any(abs(q[2]) >= EPS for q in run):
+        return False
+    return all(_near_segment(q, a, c, tol) for q in run)
+
+def drop_duplicates(pts, tol):
+    out = []
+    for i, p in enumerate(pts):
+        if out and abs(out[-1][2]) < EPS and math.dist(out[-1][:2], p[:2]) <= tol:
+            q = out[-1]                          # q -> p prosty (łuk q -> p zostaje)
+            k_in = out[-2][2] if len(out) > 1 else pts[-1][2]
+            if abs(k_in) < EPS:
+                out[-1] = p                      # wejście proste – zostaje p
+            else:
+                out[-1] = (q[0], q[1], p[2])     # za łukiem – zostaje XY q
+            continue
+        out.append(p)
+    if len(out) > 1 and abs(out[-1][2]) < EPS and math.dist(out[-1][:2], out[0][:2]) <= tol:
+        out.pop()                                # ostatni = start konturu
+    return out
+
+def merge_collinear(pts, tol):
+    if len(pts) < 3:
+        return pts
+    kept = [pts[0]]                              # start konturu zostaje zawsze
+    run = []
+    for p in pts[1:]:
+        if run and not _removable(kept[-1], run, p, tol):
+            kept.append(run[-1])
+            run = []
+        run.append(p)
+    if run and not _removable(kept[-1], run, kept[0], tol):
+        kept.append(run[-1])
+    return kept
+
+def simplify_points(pts, tol):
+    """
+    Zamknięty kontur [(x,y,k), ...] -> (uproszczony kontur, liczba usuniętych punktów).
+    tol <= 0 wyłącza; kontur nie spada poniżej 3 punktów.
+    """
+    if tol <= 0 or not pts or len(pts) < 4:
+        return pts, 0
+    out = merge_collinear(drop_duplicates(pts, tol), tol)
+    if len(out) < 3:
+        return pts, 0
+    return out, len(pts) - len(out)
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Zapis wyników przez lokalny katalog roboczy (szybki dysk), potem przeniesienie do celu.
+
+Każdy DXF/NC trafia najpierw do stage_dir (ścieżka docelowa odwzorowana pod nim),
+a przeniesienia na wolny udział sieciowy idą partiami: w wątku w tle w trakcie
+przebiegu ("background") albo wszystkie po przebiegu ("end"). Opóźnienie udziału
+nie blokuje więc przetwarzania kolejnych części. Katalog docelowy jest tworzony
+raz na partię, nie raz na plik.
+"""
+
+import os
+import queue
+import shutil
+import threading
+from pathlib import Path
+
+from dedup_output import link_or_copy
+
+MOVE_BATCH = 200        # plików na partię przeniesień
+
+def make_dirs(path: Path, created=None) -> None:
+    """mkdir -p; katalogi utworzone tym wywołaniem (nie istniały, nikt nie uprzedził) -> created."""
+    missing = []
+    while not path.is_dir() and path != path.parent:
+        missing.append(path)
+        path = path.parent
+    for d in reversed(missing):
+        try:
+            os.mkdir(d)
+        except FileExistsError:
+            continue
+        if created is not None:
+            created.append(d)
+
+def stage_path(stage_dir: Path, final: Path, created=None) -> Path:
+    """
+    Ścieżka robocza pliku docelowego final (pełna ścieżka odwzorowana pod stage_dir).
+    created: lista – dopisywane katalogi robocze utworzone przy tym wywołaniu (do sprzątania).
+    """
+    final = Path(os.path.abspath(final))
+    local = Path(stage_dir) / final.relative_to(final.anchor)
+    make_dirs(local.parent, created)
+    return local
+
+class Stager:
+    """
+    local_path(cel) -> ścieżka robocza; done(robocza, cel) – do przeniesienia; close() czeka na koniec
+    i usuwa puste katalogi robocze – tylko utworzone przez ten przebieg (created, add_dirs).
+    link_methods: hardlinki robocze (DEDUP_OUTPUT) odtwarzane w celu jako reflink/hardlink
+    (linked, bytes_saved) zamiast kopiowania każdego osobno.
+    """
+
+    def __init__(self, stage_dir: Path, background: bool = True, batch: int = MOVE_BATCH,
+                 link_methods=None):
+        self.dir = Path(stage_dir)
+        self.batch = batch
+        self.link_methods = link_methods
+        self.moved = 0
+        self.bytes = 0
+        self.linked = {}          # metoda -> liczba plików odtworzonych jako link w celu
+        self.bytes_saved = 0
+        self.links = {}           # (st_dev, st_ino) roboczego hardlinku -> cel pierwszej kopii
+        self.errors = []          # (cel, komunikat)
+        self.pending = []
+        self.created = []         # katalogi robocze utworzone w tym przebiegu
+        self.queue = None
+        if background:
+            self.queue = queue.Queue()
+            self.thread = threading.Thread(target=self._mover, name="stager", daemon=True)
+            self.thread.start()
+
+    def local_path(self, final: Path) -> Path:
+        return stage_path(self.dir, final, self.created)
+
+    def add_dirs(self, dirs) -> None:
+        """Katalogi robocze utworzone poza local_path (stage_path w procesach roboczych)."""
+        self.created.extend(map(Path, dirs))
+
+    def done(self, local: Path, final: Path) -> None:
+        if self.queue is not None:
+            self.queue.put((local, Path(final)))
+        else:
+            self.pending.append((local, Path(final)))
+
+    def _move_batch(self, items) -> None:
+        made = set()
+        for local, final in items:
+            try:
+                if final.parent not in made:
+                    final.parent.mkdir(parents=True, exist_ok=True)
+                    made.add(final.parent)
+                st = local.stat()
+                if self.link_methods is not None and self._link(local, final, st):
+                    continue
+                shutil.move(local, final)
+                self.moved += 1
+                self.bytes += st.st_size
+            except Exception as e:
+                self.errors.append((final, str(e)))
+
+    def _link(self, local: Path, final: Path, st) -> bool:
+        """
+        Hardlink roboczy (OutputDeduper w katalogu roboczym) -> link do już przeniesionej kopii
+        w celu (link_methods, jak dedup_output.link_or_copy); True, gdy local obsłużony.
+        Przeniesienie między woluminami zrobiłoby z każdego linku pełną kopię.
+        """
+        key = (st.st_dev, st.st_ino)
+        src = self.links.get(key)
+        if st.st_nlink == 1:
+            self.links.pop(key, None)        # ostatni link – i-węzeł może zostać użyty ponownie
+        if src is None or not src.exists():
+            if st.st_nlink > 1:
+                self.links[key] = final
+            return False
+        method = link_or_copy(src, final, self.link_methods)
+        local.unlink()
+        self.linked[method] = self.linked.get(method, 0) + 1
+        if method != "copy":
+            self.bytes_saved += st.st_size
+        return True
+
+    def _mover(self) -> None:
+        stop = False
+        while not stop:
+            items = [self.queue.get()]
+            while len(items) < self.batch:          # dobierz, co już czeka – jedna partia
+                try:
+                    items.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in items:
+                stop = True
+                items = [it for it in items if it is not None]
+            self._move_batch(sorted(items, key=lambda it: str(it[1].parent)))
+
+    def close(self) -> None:
+        if self.queue is not None:
+            self.queue.put(None)
+            self.thread.join()
+        else:
+            items = sorted(self.pending, key=lambda it: str(it[1].parent))
+            for i in range(0, len(items), self.batch):
+                self._move_batch(items[i:i + self.batch])
+            self.pending = []
+        for d in sorted(set(self.created), key=lambda d: len(d.parts), reverse=True):   # najgłębsze pierwsze
+            try:
+                os.rmdir(d)
+            except OSError:       # niepusty (np. plik po błędzie przeniesienia) – zostaje
+                pass
+        self.created = []
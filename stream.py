@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tryb strumieniowy: NC1 na stdin, DXF (albo JSON) na stdout – bez plików tymczasowych.
+
+  type P1.nc1 | nctodxf.exe --stream > P1.dxf              (albo: python stream.py ...)
+  nctodxf.exe --stream --framing nul --output json < czesci.bin
+
+Ramkowanie (--framing), takie samo na wejściu i wyjściu:
+  single  – całe stdin to jedna część, na stdout jeden dokument (domyślnie),
+  nul     – dokumenty rozdzielone bajtem NUL (DXF tekstowy/JSON nie zawiera NUL),
+  length  – każdy dokument poprzedzony długością: uint32 big-endian.
+--output json: jeden obiekt na dokument {"name", "file_stem", "header", "info",
+  "dxf_base64"} albo {"error": ...} – dla single/nul z '\\n' na końcu.
+Błąd części: stdout dostaje pusty dokument (dxf) albo {"error"} (json), komunikat
+idzie na stderr, przetwarzanie trwa dalej; kod wyjścia 1. Zła licencja – kod 2.
+Proces jest jeden i ciepły: ezdxf zaimportowany raz, ten sam dokument-szablon DXF
+czyszczony między częściami (bez ezdxf.new na część).
+"""
+
+import argparse
+import base64
+import contextlib
+import json
+import struct
+import sys
+
+import main
+
+_LEN = struct.Struct(">I")
+CHUNK = 64 * 1024
+
+def read_documents(inp, framing: str):
+    """Generator dokumentów (bytes) ze strumienia binarnego; czyta przyrostowo."""
+    if framing == "single":
+        yield inp.read()
+    elif framing == "nul":
+        buf, scan = bytearray(), 0         # scan: od tego miejsca bufor nie był jeszcze przeszukany
+        while True:
+            chunk = inp.read1(CHUNK) if hasattr(inp, "read1") else inp.read(CHUNK)
+            if not chunk:
+                break
+            buf += chunk
+            start = 0
+            while (end := buf.find(b"\0", scan)) >= 0:
+                yield bytes(buf[start:end])
+                start = scan = end + 1
+            scan = len(buf)
+            if start:                       # reszta za ostatnim NUL < CHUNK – przesunięcie tanie
+                del buf[:start]
+                scan -= start
+        if buf.strip():
+            yield bytes(buf)
+    else:
+        while True:
+            head = inp.read(_LEN.size)
+            if not head:
+                break
+            if len(head) < _LEN.size:
+                raise ValueError("urwany prefiks długości")
+            n = _LEN.unpack(head)[0]
+            data = inp.read(n)
+            if len(data) < n:
+                raise ValueError(f"urwany dokument: {len(data)} z {n} B")
+            yield data
+
+def write_document(out, data: bytes, framing: str) -> None:
+    if framing == "length":
+        out.write(_LEN.pack(len(data)))
+        out.write(data)
+    else:
+        out.write(data)
+        if framing == "nul":
+            out.write(b"\0")
+    out.flush()             # odbiorca dostaje część od razu, nie po końcu strumienia
+
+def run(inp, out, framing: str = "single", output: str = "dxf", stem: str = "") -> int:
+    """Przetwarza strumień; kod wyjścia (0 ok, 1 błędy części, 2 licencja)."""
+    if framing == "nul" and output == "dxf" and main.DXF_FORMAT == "bin":
+        print("Ramkowanie nul nie działa z binarnym DXF – użyj --framing length.", file=sys.stderr)
+        return 2
+    try:
+        with contextlib.redirect_stdout(sys.stderr):      # komunikaty licencji nie psują stdout
+            lic = main.verify_license_or_exit(wait=False)
+    except SystemExit:
+        return 2
+
+    template = main.new_dxf_template()
+    errors = 0
+    for n, data in enumerate(read_documents(inp, framing), 1):
+        part_stem = stem if framing == "single" else f"{stem or 'stdin'}-{n}"
+        try:
+            res = main.nc_to_dxf_bytes(data.decode("utf-8", errors="replace"), lic, part_stem, template)
+        except Exception as e:
+            errors += 1
+            msg = f"{type(e).__name__}: {e}"
+            print(f"[BŁĄD] dokument {n}: {msg}", file=sys.stderr)
+            template = main.new_dxf_template()       # szablon mógł zostać w połowie rysowania
+            res = None
+        if output == "json":
+            obj = {"error": msg} if res is None else {
+                "name": res["name"], "file_stem": res["file_stem"], "header": res["header"],
+                "info": res["info"], "dxf_base64": base64.b64encode(res["dxf"]).decode("ascii")}
+            body = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+            if framing != "length":
+                body += b"\n"
+        else:
+            body = b"" if res is None else res["dxf"]
+        write_document(out, body, framing)
+    return 1 if errors else 0
+
+def main_cli(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Konwersja NC1 -> DXF ze stdin na stdout")
+    ap.add_argument("--framing", choices=("single", "nul", "length"), default="single",
+                    help="Podział strumienia na dokumenty (wejście i wyjście)")
+    ap.add_argument("--output", choices=("dxf", "json"), default="dxf")
+    ap.add_argument("--stem", default="", help="Nazwa części, gdy brak jej w nagłówku NC1")
+    args = ap.parse_args(argv)
+    try:
+        return run(sys.stdin.buffer, sys.stdout.buffer, args.framing, args.output, args.stem)
+    except ValueError as e:
+        print(f"[BŁĄD] strumień wejściowy: {e}", file=sys.stderr)
+        return 2
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,39 @@
+import csv
+import shutil
+from pathlib import Path
+
+import pytest
+
+import main
+
+DATA = Path(__file__).resolve().parent / "data"
+LIC = {"name": "test", "fp": "LIN|TEST"}
+
+@pytest.mark.parametrize("fmt", ["csv", pytest.param("parquet", marks=pytest.mark.skipif(
+    __import__("bom").pa is None, reason="brak pyarrow"))])
+def test_bom_domkniety_po_przerwaniu_przebiegu(tmp_path, monkeypatch, fmt):
+    for n in range(3):
+        for src in sorted(DATA.glob("*.nc1")):
+            shutil.copy(src, tmp_path / f"{n}_{src.name}")
+    monkeypatch.setattr(main, "BOM", True)
+    monkeypatch.setattr(main, "BOM_FORMAT", fmt)
+    process_file, calls = main.process_file, []
+
+    def failing(*args, **kw):
+        calls.append(args[0])
+        if len(calls) == 3:
+            raise KeyboardInterrupt
+        return process_file(*args, **kw)
+
+    monkeypatch.setattr(main, "process_file", failing)
+    with pytest.raises(KeyboardInterrupt) as exc:     # ramka run_batch (i writer) nadal żywa
+        main.run_batch([tmp_path], LIC, rename=False, quiet=True)
+    assert exc.traceback
+
+    if fmt == "csv":
+        with (tmp_path / f"{main.BOM_NAME}.csv").open(encoding="utf-8-sig", newline="") as f:
+            rows = list(csv.reader(f, delimiter=";"))
+        assert len(rows) == 3 and rows[0][0] == "piece"
+    else:
+        import pyarrow.parquet as pq
+        assert pq.read_table(tmp_path / f"{main.BOM_NAME}.parquet").num_rows == 2
@@ -0,0 +1,26 @@
+from pathlib import Path
+
+import pytest
+
+import dxf_format
+from compact_dxf import compact_doc, dxf_size
+from nc1core import add_doc_metadata, nc_to_dxf_doc
+
+NC = (Path(__file__).resolve().parent / "data" / "blacha_luki.nc1").read_text(encoding="utf-8")
+
+@pytest.mark.parametrize("fmt", ["asc", "bin"])
+def test_rozmiar_to_bajty_pliku(tmp_path, fmt):
+    doc, msp = nc_to_dxf_doc(NC)
+    add_doc_metadata(doc, msp, {"name": "Zakład Łódź – ślusarnia"}, ("nctodxf", "PRIMES", "1.0.0"))
+    for label in ("full", "compact"):
+        path = tmp_path / f"{label}.dxf"
+        doc.saveas(path, fmt=fmt)
+        assert dxf_size(doc, fmt) == path.stat().st_size, label
+        compact_doc(doc)
+
+def test_rozmiar_z_crlf(monkeypatch):
+    doc, _ = nc_to_dxf_doc(NC)
+    lf = dxf_size(doc)
+    lines = dxf_format.serialize(doc).count(b"\n")
+    monkeypatch.setattr(dxf_format.os, "linesep", "\r\n")    # saveas na Windows
+    assert dxf_size(doc) == lf + lines
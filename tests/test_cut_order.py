@@ -0,0 +1,56 @@
+import math
+import random
+import time
+
+import pytest
+
+import cut_order
+
+def uniform(n, seed=0):
+    rnd = random.Random(seed)
+    return [(rnd.uniform(0, 12000), rnd.uniform(0, 2500)) for _ in range(n)]
+
+def perforated(n, pitch=6.0, cols=80, x0=100.0, y0=100.0):
+    return [(x0 + pitch * (i % cols), y0 + pitch * (i // cols)) for i in range(n)]
+
+CASES = {
+    "losowe_5000": lambda: uniform(5000),
+    "skupisko_5120_plus_2": lambda: perforated(5120) + [(11000.0, 2400.0), (11900.0, 100.0)],
+    "te_same_xy_6000": lambda: [(500.0, 500.0)] * 6000,
+    "dwa_skupiska": lambda: perforated(3000) + perforated(3000, x0=11000.0, y0=2000.0),
+}
+
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_czas_i_permutacja(name):
+    points = CASES[name]()
+    t = time.perf_counter()
+    order, before, after = cut_order.optimize_cut_order(points, end=(0.0, 0.0))
+    elapsed = time.perf_counter() - t
+    assert sorted(order) == list(range(len(points)))
+    assert after <= before + 1e-6
+    assert math.isclose(after, cut_order.path_length(points, order, (0.0, 0.0), (0.0, 0.0)))
+    assert elapsed < cut_order.TIME_LIMIT + 0.3, f"{name}: {elapsed:.2f} s"
+
+def test_limit_czasu_obejmuje_najblizszego_sasiada():
+    points = uniform(20000, seed=1)
+    t = time.perf_counter()
+    order, before, after = cut_order.optimize_cut_order(points, time_limit=0.05)
+    assert time.perf_counter() - t < 1.0         # budowa drzewa + ucięty NN, bez list sąsiadów i 2-opt
+    assert sorted(order) == list(range(len(points)))
+
+def test_kdtree_zgodne_z_przegladem_zupelnym():
+    rnd = random.Random(2)
+    for _ in range(30):
+        n = rnd.randint(1, 200)
+        pts = [(rnd.choice([rnd.uniform(0, 100), 5.0]), rnd.choice([rnd.uniform(0, 50), 7.0]))
+               for _ in range(n)]
+        tree = cut_order._KDTree(pts)
+        removed = set(rnd.sample(range(n), n // 3))
+        for i in removed:
+            tree.remove(i)
+        for _ in range(10):
+            p = (rnd.uniform(-10, 110), rnd.uniform(-10, 60))
+            k, ex = rnd.randint(1, 10), rnd.randrange(n)
+            got = tree.nearest(p, k, exclude=ex)
+            ref = sorted(math.dist(p, pts[i]) for i in range(n) if i not in removed and i != ex)[:k]
+            assert [math.dist(p, pts[i]) for i in got] == pytest.approx(ref)
@@ -0,0 +1,24 @@
+from pathlib import Path
+
+from dedup_output import OutputDeduper
+from nc1core import nc_to_dxf_doc
+
+NC = (Path(__file__).resolve().parent / "data" / "katownik.nc1").read_text(encoding="utf-8")
+
+def doc_with(*pairs):
+    doc, msp = nc_to_dxf_doc(NC)
+    doc.appids.add("NCTODXF")
+    msp.block_record.set_xdata("NCTODXF", [(1000, p) for p in pairs])
+    return doc
+
+def test_rozne_metadane_to_rozne_pliki(tmp_path):
+    dedup = OutputDeduper()
+    assert dedup.save(doc_with("license_to=A", "mass_kg=1.5"), tmp_path / "a.dxf") == "write"
+    assert dedup.save(doc_with("license_to=A", "mass_kg=2.5"), tmp_path / "b.dxf") == "write"
+    assert dedup.save(doc_with("license_to=B", "mass_kg=1.5"), tmp_path / "c.dxf") == "write"
+
+def test_sam_znacznik_czasu_nie_rozroznia(tmp_path):
+    dedup = OutputDeduper()
+    assert dedup.save(doc_with("license_to=A", "generated=2026-01-01T10:00:00Z"), tmp_path / "a.dxf") == "write"
+    assert dedup.save(doc_with("license_to=A", "generated=2026-01-01T10:00:07Z"), tmp_path / "b.dxf") != "write"
+    assert (tmp_path / "b.dxf").read_bytes() == (tmp_path / "a.dxf").read_bytes()
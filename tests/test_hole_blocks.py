@@ -0,0 +1,31 @@
+import main
+from hole_blocks import HoleBlocks
+from nc1core import add_bo_item, new_dxf_doc, part_geometry
+
+def test_blok_z_wymiarow_otworu_nie_z_klucza():
+    doc, msp = new_dxf_doc()
+    items = [("circle", (10.0 * i, 0.0), None, 18.00004) for i in range(3)]
+    items += [("slot", (0.0, 50.0 * i), (40.00003, 50.0 * i + 0.00002), 22.00001) for i in range(2)]
+    blocks = HoleBlocks(doc, items, draw=add_bo_item)
+    for it in items:
+        assert blocks.add(msp, it)
+    circle = [e for name in blocks.names.values() for e in doc.blocks[name] if e.dxftype() == "CIRCLE"]
+    assert [c.dxf.radius for c in circle] == [9.00002]
+    [slot] = [doc.blocks[n] for k, n in blocks.names.items() if k[0] == "slot"]
+    ref = new_dxf_doc()[1]
+    add_bo_item(ref, ("slot", (0.0, 0.0), (40.00003, 0.00002), 22.00001))
+    pts = lambda layout: [e.get_points("xyb") for e in layout if e.dxftype() == "LWPOLYLINE"]
+    assert pts(slot) == pts(ref)
+
+def test_cut_order_bez_minsert(monkeypatch):
+    items = [("circle", (10.0 * (i % 5), 10.0 * (i // 5)), None, 8.0) for i in range(20)]
+    part = part_geometry([(0, 0, 0), (100, 0, 0), (100, 100, 0), (0, 100, 0)], [], items)
+    monkeypatch.setattr(main, "HOLE_BLOCKS", True)
+    monkeypatch.setattr(main, "HOLE_ARRAYS", True)
+    for cut_order, arrays in ((False, 1), (True, 0)):
+        monkeypatch.setattr(main, "CUT_ORDER", cut_order)
+        doc, msp = new_dxf_doc()
+        info = main.draw_part(doc, msp, part)
+        assert info["hole_arrays"] == arrays
+    inserts = [tuple(e.dxf.insert)[:2] for e in msp.query("INSERT")]
+    assert inserts == [item[1] for kind, item in part["cutouts"]]
@@ -0,0 +1,103 @@
+import importlib.util
+import shutil
+from pathlib import Path
+from unittest import mock
+
+import ezdxf
+import pytest
+
+from conftest import ROOT
+
+pytest.importorskip("tkinter")   # skrypty Pomocnicze importują tkinter (okna nie są otwierane)
+
+DATA = Path(__file__).resolve().parent / "data"
+SAMPLES = sorted(DATA.glob("*.nc1"))
+LIC = {"name": "test", "fp": "LIN|TEST", "expires": None}
+
+def load(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+@pytest.fixture(scope="module")
+def entry():
+    import main
+    return {"main": main,
+            "win": load("main_WIn", ROOT / "main_WIn.py"),
+            "n2d": load("nc1_to_dxf", ROOT / "Pomocnicze" / "nc1_to_dxf.py"),
+            "t2d": load("ncTodxf", ROOT / "Pomocnicze" / "ncTodxf.py"),
+            "ren": load("nc_renamer", ROOT / "Pomocnicze" / "nc-renamer.py")}
+
+def signature(path):
+    """Rysunek bez uchwytów: encje modelspace (typ, atrybuty, wierzchołki), warstwy, XDATA bez generated=."""
+    doc = ezdxf.readfile(path)
+    msp = doc.modelspace()
+    ents = []
+    for e in msp:
+        attrs = e.dxf.all_existing_dxf_attribs()
+        attrs.pop("handle", None)
+        attrs.pop("owner", None)
+        pts = [tuple(round(v, 9) for v in p) for p in e.get_points("xyb")] if e.dxftype() == "LWPOLYLINE" else None
+        ents.append((e.dxftype(), sorted((k, str(v)) for k, v in attrs.items()), pts))
+    layers = sorted((layer.dxf.name, layer.dxf.color) for layer in doc.layers)
+    xdata = None
+    if msp.block_record.has_xdata("NCTODXF"):
+        xdata = [v for v in msp.block_record.get_xdata("NCTODXF") if not str(v[1]).startswith("generated=")]
+    return ents, layers, xdata, doc.header.get("$LASTSAVEDBY")
+
+@pytest.mark.parametrize("src", SAMPLES, ids=[p.stem for p in SAMPLES])
+def test_ten_sam_dxf_i_nazwa_z_kazdego_punktu_wejscia(entry, src, tmp_path):
+    txt = src.read_text(encoding="utf-8")
+    out = {}
+
+    # main.py: przebieg wsadowy (zmiana nazwy + DXF) na kopii
+    (tmp_path / "main").mkdir()
+    nc = tmp_path / "main" / src.name
+    shutil.copy(src, nc)
+    entry["main"].process_file(nc, LIC, rename=True, dxf=True)
+    [out["main"]] = (tmp_path / "main").glob("*.dxf")
+
+    # main_WIn.py: tryb okienkowy (natywne okno wyboru katalogu) -> main.main -> run_batch
+    win = tmp_path / "win"
+    win.mkdir()
+    shutil.copy(src, win / src.name)
+    with mock.patch.object(entry["main"], "verify_license_or_exit", return_value=LIC), \
+         mock.patch.object(entry["win"], "pick_folder_windows", return_value=str(win)), \
+         mock.patch("builtins.input"):
+        entry["win"].main()
+    [out["win"]] = win.glob("*.dxf")
+
+    out["n2d"] = tmp_path / "n2d.dxf"
+    entry["n2d"].generate_dxf_from_nc_text(txt, out["n2d"])
+
+    t2d_src = tmp_path / "t2d.nc1"
+    shutil.copy(src, t2d_src)
+    with mock.patch.object(entry["t2d"].filedialog, "askopenfilename", return_value=str(t2d_src)), \
+         mock.patch.object(entry["t2d"], "Tk"):
+        entry["t2d"].main()
+    out["t2d"] = tmp_path / "t2d_OUTER_CUTS.dxf"
+
+    # Rysunek: identyczny wszędzie; metadane licencji: main.py i main_WIn.py tak samo
+    sig = {k: signature(p) for k, p in out.items()}
+    for k in ("win", "n2d", "t2d"):
+        assert sig[k][:2] == sig["main"][:2], k
+    assert sig["win"][2:] == sig["main"][2:]
+    assert sig["main"][2] is not None
+
+    # Nazwa pliku: main.py (po zmianie nazwy) = main_WIn.py = nc-renamer = nc1_to_dxf
+    names = {entry["main"].parse_nc1_for_name(txt, fallback_stem=src.stem)}
+    names |= {entry[k].parse_nc1(txt, fallback_stem=src.stem) for k in ("ren", "n2d")}
+    assert len(names) == 1
+    name, thickness, grade, qty = names.pop()
+    stem = entry["main"].sanitize(f"{grade}-{thickness}-({name})-{qty}")
+    for k in ("main", "win"):
+        assert out[k].stem == stem
+        assert (out[k].parent / (stem + ".nc1")).exists()
+
+def test_probki_pokrywaja_luki_ik_bo_i_sloty():
+    from nc1core import parse_nc_geometry
+    outer, inner, bo = parse_nc_geometry((DATA / "blacha_luki.nc1").read_text(encoding="utf-8"))
+    assert any(k for _, _, k in outer)
+    assert len(inner) == 3 and len(inner[1]) == 1            # IK zdegenerowany w środku
+    assert {item[0] for item in bo} == {"circle", "slot"}
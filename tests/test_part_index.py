@@ -0,0 +1,29 @@
+import shutil
+from pathlib import Path
+
+import main
+
+DATA = Path(__file__).resolve().parent / "data"
+LIC = {"name": "test", "fp": "LIN|TEST"}
+
+def rows(db):
+    from part_index import run_sql
+    return run_sql(db, "SELECT nc_path, dxf_path, width, holes, slots FROM parts ORDER BY nc_path")[1]
+
+def test_wiersze_z_przebiegu_bez_dxf_uzupelniane_geometria(tmp_path, monkeypatch):
+    for src in DATA.glob("*.nc1"):
+        shutil.copy(src, tmp_path / src.name)
+    monkeypatch.setattr(main, "PART_INDEX", True)
+    db = tmp_path / main.INDEX_NAME
+
+    main.run_batch([tmp_path], LIC, rename=False, dxf=False, quiet=True)
+    assert all(r[1] is None and r[2] is None for r in rows(db))
+
+    main.run_batch([tmp_path], LIC, rename=False, dxf=True, quiet=True)
+    filled = rows(db)
+    assert len(filled) == 2
+    assert all(r[1] and r[2] for r in filled)
+    assert any(r[4] for r in filled)                    # fasolki z blacha_luki
+
+    main.run_batch([tmp_path], LIC, rename=False, dxf=False, quiet=True)   # bez DXF – bez zmian
+    assert rows(db) == filled
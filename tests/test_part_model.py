@@ -0,0 +1,15 @@
+import pytest
+
+from part_model import Hole, Slot
+
+@pytest.mark.parametrize("item", [Hole(1.5, -2.0, 18.0), Slot(0.0, 1.0, 40.0, 1.0, 22.0)])
+def test_indeksowanie_jak_krotka(item):
+    tup = item.astuple()
+    for i in range(-4, 4):
+        assert item[i] == tup[i]
+    assert item[1:3] == tup[1:3] and item[::-1] == tup[::-1]
+    for i in (4, -5):
+        with pytest.raises(IndexError):
+            item[i]
+    kind, c1, c2, dia = item
+    assert (kind, c1, c2, dia) == tup
@@ -0,0 +1,56 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+import server
+
+DATA = Path(__file__).resolve().parent / "data"
+LIC = {"name": "test", "fp": "LIN|TEST"}
+
+@pytest.fixture(scope="module")
+def httpd():
+    srv = server.ConvertServer("127.0.0.1", 0, 1, LIC, quiet=True)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+def post(srv, obj):
+    req = urllib.request.Request(f"http://127.0.0.1:{srv.server_address[1]}/convert",
+                                 json.dumps(obj).encode("utf-8"), {"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=60) as r:
+            return r.status, json.load(r)
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e)
+
+def test_path_poza_localhost_tylko_z_root(httpd, monkeypatch):
+    nc = str(DATA / "katownik.nc1")
+    assert post(httpd, {"path": nc})[0] == 200
+    monkeypatch.setattr(httpd, "local", False)               # jak --host 0.0.0.0
+    code, res = post(httpd, {"path": nc})
+    assert code == 403 and "--root" in res["error"]
+    assert post(httpd, {"text": DATA.joinpath("katownik.nc1").read_text(encoding="utf-8")})[0] == 200
+    monkeypatch.setattr(httpd, "root", DATA.resolve())
+    assert post(httpd, {"path": "katownik.nc1"})[0] == 200
+    assert post(httpd, {"path": nc})[0] == 200
+    assert post(httpd, {"path": "../conftest.py"})[0] == 403
+    assert post(httpd, {"path": str(Path(__file__))})[0] == 403
+
+def test_pula_odtworzona_po_awarii_procesu(httpd):
+    pool = httpd.pool
+    for proc in list(pool._processes.values()):
+        proc.kill()
+        proc.join()
+    code, res = post(httpd, {"path": str(DATA / "katownik.nc1")})
+    assert code == 200 and res["dxf_base64"]
+    assert httpd.pool is not pool
+    assert post(httpd, {"path": str(DATA / "blacha_luki.nc1")})[0] == 200
+
+def test_loopback():
+    assert server._is_loopback("127.0.0.1") and server._is_loopback("::1") and server._is_loopback("localhost")
+    assert not server._is_loopback("0.0.0.0") and not server._is_loopback("") and not server._is_loopback("pc-biuro")
@@ -0,0 +1,17 @@
+import main
+
+LIC = {"name": "test", "fp": "LIN|TEST"}
+
+def test_stale_konfig_czytane_w_chwili_wywolania(tmp_path, monkeypatch):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "a.nc1").write_text("ST\n", encoding="utf-8")
+    assert main.find_candidates([tmp_path]) == []
+    monkeypatch.setattr(main, "RECURSIVE", True)
+    assert main.find_candidates([tmp_path]) == [tmp_path / "sub" / "a.nc1"]
+
+    monkeypatch.setattr(main, "BACKEND", "thread")
+    assert main.resolve_backend() == "thread"
+
+    monkeypatch.setattr(main, "PARSE_CACHE", True)
+    main.run_batch([tmp_path], LIC, rename=False, quiet=True)
+    assert (tmp_path / main.CACHE_DIR).is_dir()
@@ -0,0 +1,34 @@
+import os
+import time
+
+from shard import ShardQueue
+
+def queue(tmp_path, node, ttl=300.0):
+    q = ShardQueue(tmp_path / "kolejka", node, ttl)
+    q.manifest = {"files": 2, "chunks": [["a.nc1"], ["b.nc1"]]}
+    return q
+
+def test_complete_po_utracie_dzierzawy_nic_nie_zapisuje(tmp_path):
+    a, b = queue(tmp_path, "A"), queue(tmp_path, "B")
+    i = a.claim()
+    a._lease(i).write_text("B", encoding="utf-8")          # przejęta przez B
+    assert not a.complete(i, [{"file": "a.nc1"}])
+    assert not a._done(i).exists()
+    assert not (a.dir / "reports" / "A.jsonl").exists()
+    assert a._lease(i).read_text(encoding="utf-8") == "B"
+    assert b.complete(i, [{"file": "a.nc1"}])
+    assert a._done(i).read_text(encoding="utf-8") == "B"
+
+def test_heartbeat_nie_odswieza_cudzej_dzierzawy(tmp_path):
+    a = queue(tmp_path, "A", ttl=0.3)
+    i = a.claim()
+    lease = a._lease(i)
+    with a.holding(i) as lost:
+        time.sleep(0.25)
+        assert not lost.is_set()
+        lease.write_text("B", encoding="utf-8")
+        os.utime(lease, (1000.0, 1000.0))
+        time.sleep(0.35)
+        assert lost.is_set()
+    assert lease.stat().st_mtime == 1000.0
+    assert lease.read_text(encoding="utf-8") == "B"
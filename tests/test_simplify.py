@@ -0,0 +1,68 @@
+import math
+import random
+
+from nc1core import build_xyb_from_points
+from simplify import simplify_points
+
+TOL = 0.05
+
+def random_contour(rng):
+    """Kontur z łukami, punktami prawie współliniowymi i duplikatami (także przy łukach i na starcie)."""
+    pts, x, y = [], 0.0, 0.0
+    for _ in range(rng.randint(4, 40)):
+        pts.append((x, y, rng.choice([0.0, 0.0, 0.0, 25.0, -40.0])))
+        r = rng.random()
+        if r < 0.2:                                  # duplikat w tolerancji
+            pts.append((x + rng.uniform(-0.01, 0.01), y + rng.uniform(-0.01, 0.01), rng.choice([0.0, 30.0])))
+        elif r < 0.4:                                # punkt pośredni na odcinku prostym
+            pts[-1] = (x, y, 0.0)
+            pts.append((x + 5.0, y + 5.0 + rng.uniform(-0.02, 0.02), 0.0))
+            x, y = x + 5.0, y + 5.0
+        x += rng.uniform(-20, 20)
+        y += rng.uniform(-20, 20)
+    if rng.random() < 0.3:                           # ostatni = start konturu
+        pts.append((pts[0][0] + 0.005, pts[0][1], rng.choice([0.0, 30.0])))
+    return pts
+
+def arcs(pts):
+    n = len(pts)
+    return [(pts[i][:2], pts[(i + 1) % n][:2], pts[i][2]) for i in range(n) if pts[i][2] != 0]
+
+def test_wierzcholki_z_wejscia_w_tej_samej_kolejnosci_i_luki_zachowane():
+    rng = random.Random(29)
+    for _ in range(3000):
+        pts = random_contour(rng)
+        out, removed = simplify_points(pts, TOL)
+        assert removed == len(pts) - len(out)
+
+        # XY każdego wierzchołka 1:1 z wejścia, podciąg w kolejności z pliku
+        xy, j = [p[:2] for p in pts], 0
+        for p in out:
+            j = xy.index(p[:2], j) + 1
+
+        # każdy łuk (niezerowej długości) zostaje z tym samym k; koniec przesunięty najwyżej
+        # o duplikat w tolerancji
+        kept = arcs(out)
+        for a, b, k in arcs(pts):
+            if math.dist(a, b) > TOL:
+                assert any(k2 == k and math.dist(a, a2) <= TOL and math.dist(b, b2) <= TOL
+                           for a2, b2, k2 in kept), (pts, (a, b, k))
+        assert {k for *_, k in kept} <= {p[2] for p in pts}
+
+def test_luki_bez_duplikatow_bit_w_bit():
+    pts = [(0, 0, 0), (50, 0.01, 0), (100, 0, 0), (100, 40, 20.0), (80, 60, 0), (40, 60.02, 0),
+           (0, 60, -35.0), (0, 30, 0)]
+    out, removed = simplify_points(pts, TOL)
+    assert removed == 2
+    assert out == [(0, 0, 0), (100, 0, 0), (100, 40, 20.0), (80, 60, 0), (0, 60, -35.0), (0, 30, 0)]
+    bulges = lambda c: [(x, y, b) for x, y, b in build_xyb_from_points(c) if b != 0]
+    assert bulges(out) == bulges(pts)
+
+def test_krotki_luk_nie_jest_duplikatem():
+    # łuk R0.02 o cięciwie 0.03 <= TOL: (100, 50) -> (100.03, 50) oraz zamykający (0.01, 0) -> (0, 0)
+    pts = [(0, 0, 0), (100, 0, 0), (100, 50, 0.02), (100.03, 50, 0), (0, 50, 0),
+           (0.01, 0, -0.02)]
+    out, removed = simplify_points(pts, TOL)
+    assert removed == 0 and out == pts
+    dup = [(0, 0, 0), (100, 0, 0), (100, 50, 0), (100.03, 50, 0), (0, 50, 0), (0.01, 0, 0)]
+    assert simplify_points(dup, TOL)[0] == [(0, 0, 0), (100, 0, 0), (100.03, 50, 0), (0, 50, 0)]
@@ -0,0 +1,47 @@
+import shutil
+from pathlib import Path
+
+import main
+import staging
+from staging import Stager, stage_path
+
+def test_close_usuwa_tylko_wlasne_katalogi(tmp_path):
+    stage, dest = tmp_path / "robocze", tmp_path / "cel"
+    cudzy = stage / "cudzy" / "pusty"
+    cudzy.mkdir(parents=True)                               # był przed przebiegiem
+    for background in (True, False):
+        stager = Stager(stage, background=background)
+        for name in ("a/1.dxf", "a/b/2.dxf", "c/3.dxf"):
+            local = stager.local_path(dest / name)
+            local.write_text(name)
+            stager.done(local, dest / name)
+        made = []                                           # jak proces roboczy (process_file)
+        local = stage_path(stage, dest / "d" / "4.dxf", made)
+        local.write_text("4")
+        stager.add_dirs(made)
+        stager.done(local, dest / "d" / "4.dxf")
+        stager.close()
+        assert not stager.errors
+        assert sorted(p.relative_to(dest).as_posix() for p in dest.rglob("*.dxf")) == \
+            ["a/1.dxf", "a/b/2.dxf", "c/3.dxf", "d/4.dxf"]
+        assert cudzy.is_dir()
+        assert [p.relative_to(stage).as_posix() for p in stage.rglob("*")] == ["cudzy", "cudzy/pusty"]
+
+def test_dedup_przy_staging_linkuje_w_celu(tmp_path, monkeypatch, capsys):
+    src, dest, stage = tmp_path / "nc", tmp_path / "cel", tmp_path / "robocze"
+    src.mkdir()
+    nc = (Path(__file__).resolve().parent / "data" / "katownik.nc1").read_text(encoding="utf-8")
+    for n in range(4):
+        (src / f"{n}.nc1").write_text(nc.replace("KT-7", f"KT-{n}"), encoding="utf-8")
+
+    def cross_volume(a, b):                       # inny wolumin: kopia + usunięcie
+        shutil.copyfile(a, b)
+        a.unlink()
+
+    monkeypatch.setattr(staging.shutil, "move", cross_volume)
+    monkeypatch.setattr(main, "DEDUP_OUTPUT", True)
+    main.run_batch([src], {"name": "test"}, rename=False, out_dir=dest, staging=stage)
+    out = sorted(dest.glob("*.dxf"))
+    assert len(out) == 4
+    assert len({p.stat().st_ino for p in out}) == 1            # jeden plik, reszta to linki w celu
+    assert "hardlink: 3" in capsys.readouterr().out
@@ -0,0 +1,33 @@
+import io
+import time
+
+import stream
+
+class Trickle(io.RawIOBase):
+    """Strumień oddający po `step` B na odczyt (granice porcji w dowolnym miejscu)."""
+
+    def __init__(self, data, step):
+        self.data, self.pos, self.step = data, 0, step
+
+    def readable(self):
+        return True
+
+    def read(self, n=-1):
+        n = self.step if n < 0 else min(n, self.step)
+        out = self.data[self.pos:self.pos + n]
+        self.pos += len(out)
+        return out
+
+def test_nul_ramki_na_granicach_porcji():
+    docs = [b"ST\nA", b"", b"x" * 200, b"B\nEN\n", b"\r\n" * 7]
+    data = b"\0".join(docs) + b"\0"
+    for step in (1, 2, 3, 7, 64, len(data)):
+        assert list(stream.read_documents(Trickle(data, step), "nul")) == docs
+    assert list(stream.read_documents(io.BytesIO(b"a\0b"), "nul")) == [b"a", b"b"]
+    assert list(stream.read_documents(io.BytesIO(b"a\0 \n"), "nul")) == [b"a"]
+
+def test_nul_duzy_dokument_liniowo():
+    big = b"x" * (16 * 1024 * 1024)
+    t = time.perf_counter()
+    assert list(stream.read_documents(Trickle(big + b"\0y", 4096), "nul")) == [big, b"y"]
+    assert time.perf_counter() - t < 2.0
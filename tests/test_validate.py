@@ -0,0 +1,34 @@
+import time
+
+from nc1core import build_xyb_from_points
+from part_model import Contour, Hole
+from validate import validate_part
+
+def plate(w=12000.0, h=2500.0):
+    return Contour.from_points([(0, 0, 0), (w, 0, 0), (w, h, 0), (0, h, 0)])
+
+def check(outer, inner, bo):
+    return validate_part(outer, inner, build_xyb_from_points(outer),
+                         [build_xyb_from_points(p) for p in inner], bo)
+
+def test_gesta_perforacja_na_duzym_arkuszu():
+    bo = [Hole(100 + 6 * (i % 80), 100 + 6 * (i // 80), 5) for i in range(5120)]
+    bo += [Hole(11000, 2400, 5), Hole(11900, 100, 5)]
+    t = time.perf_counter()
+    assert check(plate(), [], bo) == []
+    assert time.perf_counter() - t < 2.0
+
+def test_nachodzace_otwory_w_skupisku():
+    bo = [Hole(100 + 6 * (i % 80), 100 + 6 * (i // 80), 5) for i in range(800)]
+    bo.append(Hole(103, 100, 5))                      # między #1 i #2
+    issues = check(plate(), [], bo)
+    assert "BO #1 nachodzi na BO #801" in issues
+    assert "BO #2 nachodzi na BO #801" in issues
+
+def test_numeracja_ik_z_konturem_zdegenerowanym():
+    degenerate = Contour.from_points([(5, 5, 0)])
+    ik = Contour.from_points([(500, 500, 10), (700, 500, 0), (700, 700, 0), (500, 700, 0)])  # łuk r=10 na cięciwie 200
+    issues = check(plate(), [degenerate, ik], [Hole(500, 600, 20)])
+    assert any(s.startswith("IK #2: łuk #1") for s in issues)
+    assert "IK #2 nachodzi na BO #1" in issues
+    assert not any(s.startswith("IK #1") for s in issues)
@@ -0,0 +1,50 @@
+import zipfile
+from pathlib import Path
+
+import pytest
+
+import main
+from zip_io import ZipMember
+
+DATA = Path(__file__).resolve().parent / "data"
+LIC = {"name": "test", "fp": "LIN|TEST"}
+
+@pytest.fixture
+def paczka(tmp_path):
+    path = tmp_path / "paczka.zip"
+    with zipfile.ZipFile(path, "w") as zf:
+        for n in range(12):
+            for src in sorted(DATA.glob("*.nc1")):
+                txt = src.read_text(encoding="utf-8").replace("ORD7", f"ORD{n}", 1)
+                zf.writestr(f"poz/{n:02d}_{src.name}", txt.replace("B-101", f"B-{n}").replace("KT-7", f"KT-{n}"))
+    return path
+
+def names(path):
+    with zipfile.ZipFile(path) as zf:
+        return sorted(zf.namelist())
+
+@pytest.mark.parametrize("schedule", ["size", "scan", "fifo"])
+def test_pozycje_zip_czytane_w_oknie_puli(paczka, tmp_path, monkeypatch, schedule):
+    seen = []
+    run_plan = main.run_plan
+
+    def spy(pool, fn, jobs, chunks, **kw):
+        seen.append([type(job[6]) for job in jobs])
+        return run_plan(pool, fn, jobs, chunks, **kw)
+
+    monkeypatch.setattr(main, "run_plan", spy)
+    one, many = tmp_path / "j1.zip", tmp_path / "j3.zip"
+    assert main.run_batch([paczka], LIC, workers=1, zip_out=one, quiet=True)["errors"] == 0
+    stats = main.run_batch([paczka], LIC, workers=3, zip_out=many, quiet=True,
+                           backend="thread", schedule=schedule)
+    assert stats["errors"] == 0 and stats["dxf_ok"] == 24
+    assert seen == [[ZipMember] * 24]           # plan bez treści pozycji
+    assert names(many) == names(one)
+
+def test_koszt_size_z_katalogu_archiwum(paczka):
+    jobs = [(Path(m.name), LIC, True, True, None, None, m, True, None)
+            for m in main.lazy_members(paczka, main.zip_members(paczka, main.NC_SUFFIXES))]
+    with zipfile.ZipFile(paczka) as zf:
+        sizes = [len(zf.read(m[6].name)) for m in jobs]
+    assert main.job_costs(jobs, "size") == [main.size_cost(s) for s in sizes]
+    assert main.job_costs(jobs, "scan") == [main.scan_cost(main._load_job(j)[6]) for j in jobs]
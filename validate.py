@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Walidacja geometrii części (przed laserem):
+- otwory BO / kontury IK poza OUTER (lub przecinające AK)
+- nachodzące na siebie wycięcia (BO/IK)
+- samoprzecinające się kontury AK/IK
+- łuki z cięciwą > 2r (bulge_from_points_radius po cichu je przycina)
+
+Wyszukiwanie kandydatów przez siatkę wielopoziomową (GridIndex, komórka wg rozmiaru
+elementów) – zamiast porównań każdy-z-każdym O(n²) sprawdzane są tylko elementy
+z sąsiednich komórek, także przy gęstej perforacji na dużym arkuszu.
+"""
+
+import math
+
+EPS = 1e-9
+TOL = 1e-3          # mm – styk/tolerancja (otwory stykające się nie są błędem)
+ARC_TOL = 0.01      # mm – maks. strzałka przy zamianie łuku na odcinki
+
+# ---------- siatka ----------
+class GridIndex:
+    """
+    Siatka wielopoziomowa: id -> bbox. Element trafia na poziom, którego komórka (cell·4^k)
+    nie jest mniejsza od bboxa (najwyżej 4 komórki); zapytanie przegląda każdy poziom.
+    Gęste skupiska drobnych otworów nie lądują w jednej komórce, a długie krawędzie
+    nie są rozpisywane na tysiące drobnych komórek.
+    """
+
+    def __init__(self, cell: float):
+        self.cell = max(cell, EPS)
+        self.levels = {}          # poziom -> {(i, j): [id]}
+        self.rows = {}            # poziom -> {j: [(id, x0, x1)]} – zapytania wzdłuż promienia
+
+    def _level(self, bbox):
+        size = max(bbox[2] - bbox[0], bbox[3] - bbox[1])
+        k, c = 0, self.cell
+        while c < size:
+            k, c = k + 1, c * 4.0
+        return k, c
+
+    @staticmethod
+    def _range(bbox, c):
+        x0, y0, x1, y1 = bbox
+        return (math.floor(x0 / c), math.floor(y0 / c), math.floor(x1 / c), math.floor(y1 / c))
+
+    def insert(self, item, bbox):
+        k, c = self._level(bbox)
+        cells = self.levels.setdefault(k, {})
+        rows = self.rows.setdefault(k, {})
+        i0, j0, i1, j1 = self._range(bbox, c)
+        for j in range(j0, j1 + 1):
+            rows.setdefault(j, []).append((item, bbox[0], bbox[2]))
+            for i in range(i0, i1 + 1):
+                cells.setdefault((i, j), []).append(item)
+
+    def query(self, bbox):
+        found = set()
+        for k, cells in self.levels.items():
+            i0, j0, i1, j1 = self._range(bbox, self.cell * 4.0 ** k)
+            if (i1 - i0 + 1) * (j1 - j0 + 1) > len(cells):     # duże zapytanie – po zajętych komórkach
+                for (i, j), ids in cells.items():
+                    if i0 <= i <= i1 and j0 <= j <= j1:
+                        found.update(ids)
+                continue
+            for i in range(i0, i1 + 1):
+                for j in range(j0, j1 + 1):
+                    found.update(cells.get((i, j), ()))
+        return found
+
+    def query_row(self, y, x0, x1):
+        """Elementy, których bbox może przecinać odcinek poziomy y, x0..x1 (promień)."""
+        found = set()
+        for k, rows in self.rows.items():
+            for item, a, b in rows.get(math.floor(y / (self.cell * 4.0 ** k)), ()):
+                if b >= x0 and a <= x1:
+                    found.add(item)
+        return found
+
+def cell_size_for(bboxes) -> float:
+    """Komórka bazowa ~ mediana rozmiaru elementów (większe idą na wyższe poziomy GridIndex)."""
+    sizes = sorted(max(b[2] - b[0], b[3] - b[1]) for b in bboxes)
+    if not sizes:
+        return 1.0
+    return max(sizes[len(sizes) // 2], TOL)
+
+# ---------- geometria ----------
+def arc_points(p1, p2, b, tol=ARC_TOL):
+    """Punkty pośrednie łuku p1->p2 o bulge b (bez p1 i p2)."""
+    (x1, y1), (x2, y2) = p1, p2
+    c = math.hypot(x2 - x1, y2 - y1)
+    if abs(b) < EPS or c < EPS:
+        return []
+    r = c * (1.0 + b * b) / (4.0 * abs(b))
+    s = abs(b) * c / 2.0
+    lx, ly = -(y2 - y1) / c, (x2 - x1) / c          # normalna w lewo
+    d = (r - s) * (1.0 if b > 0 else -1.0)
+    cx, cy = (x1 + x2) / 2.0 + lx * d, (y1 + y2) / 2.0 + ly * d
+    theta = 4.0 * math.atan(b)
+    step = 2.0 * math.acos(max(-1.0, 1.0 - tol / r)) if r > tol else math.pi / 2
+    n = min(256, max(2, math.ceil(abs(theta) / max(step, EPS))))
+    a0 = math.atan2(y1 - cy, x1 - cx)
+    return [(cx + r * math.cos(a0 + theta * i / n), cy + r * math.sin(a0 + theta * i / n))
+            for i in range(1, n)]
+
+def flatten_xyb(verts, tol=ARC_TOL):
+    """Zamknięta polilinia (x,y,b) -> lista punktów (łuki rozbite na odcinki)."""
+    out = []
+    n = len(verts)
+    for i in range(n):
+        x, y, b = verts[i]
+        x2, y2, _ = verts[(i + 1) % n]
+        out.append((x, y))
+        out.extend(arc_points((x, y), (x2, y2), b, tol))
+    return out
+
+def edges_of(poly):
+    n = len(poly)
+    return [(poly[i], poly[(i + 1) % n]) for i in range(n)]
+
+def seg_bbox(seg, pad=0.0):
+    (x1, y1), (x2, y2) = seg
+    return (min(x1, x2) - pad, min(y1, y2) - pad, max(x1, x2) + pad, max(y1, y2) + pad)
+
+def _orient(a, b, c):
+    v = (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+    return 0 if abs(v) < EPS else (1 if v > 0 else -1)
+
+def segments_cross(s1, s2) -> bool:
+    """Właściwe przecięcie odcinków (wspólne końce i styk nie są przecięciem)."""
+    a, b = s1
+    c, d = s2
+    o1, o2 = _orient(a, b, c), _orient(a, b, d)
+    o3, o4 = _orient(c, d, a), _orient(c, d, b)
+    return o1 * o2 < 0 and o3 * o4 < 0
+
+def point_seg_dist(p, seg) -> float:
+    (x1, y1), (x2, y2) = seg
+    dx, dy = x2 - x1, y2 - y1
+    L2 = dx * dx + dy * dy
+    t = 0.0 if L2 < EPS else max(0.0, min(1.0, ((p[0] - x1) * dx + (p[1] - y1) * dy) / L2))
+    return math.hypot(p[0] - (x1 + t * dx), p[1] - (y1 + t * dy))
+
+def seg_seg_dist(s1, s2) -> float:
+    if segments_cross(s1, s2):
+        return 0.0
+    return min(point_seg_dist(s1[0], s2), point_seg_dist(s1[1], s2),
+               point_seg_dist(s2[0], s1), point_seg_dist(s2[1], s1))
+
+class PolygonIndex:
+    """Spłaszczony kontur + siatka krawędzi (punkt w wielokącie, odległość, przecięcia)."""
+
+    def __init__(self, poly):
+        self.poly = poly
+        self.edges = edges_of(poly)
+        boxes = [seg_bbox(e) for e in self.edges]
+        self.bbox = (min(b[0] for b in boxes), min(b[1] for b in boxes),
+                     max(b[2] for b in boxes), max(b[3] for b in boxes))
+        self.grid = GridIndex(cell_size_for(boxes))
+        for i, bb in enumerate(boxes):
+            self.grid.insert(i, bb)
+
+    def contains(self, p) -> bool:
+        """Ray casting w +x – tylko krawędzie z wiersza siatki punktu p."""
+        x, y = p
+        if not (self.bbox[0] <= x <= self.bbox[2] and self.bbox[1] <= y <= self.bbox[3]):
+            return False
+        inside = False
+        for i in self.grid.query_row(y, x, self.bbox[2]):
+            (x1, y1), (x2, y2) = self.edges[i]
+            if (y1 > y) != (y2 > y):
+                xc = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+                if xc > x:
+                    inside = not inside
+        return inside
+
+    def min_dist(self, seg, limit) -> float:
+        """Odległość odcinka od brzegu (szukana tylko do `limit`)."""
+        best = math.inf
+        for i in self.grid.query(seg_bbox(seg, limit)):
+            best = min(best, seg_seg_dist(seg, self.edges[i]))
+        return best
+
+    def crossings(self, edges) -> int:
+        n = 0
+        for e in edges:
+            for i in self.grid.query(seg_bbox(e)):
+                if segments_cross(e, self.edges[i]):
+                    n += 1
+        return n
+
+def self_intersections(poly) -> int:
+    """Liczba par nie-sąsiednich krawędzi, które się przecinają."""
+    edges = edges_of(poly)
+    n = len(edges)
+    if n < 4:
+        return 0
+    boxes = [seg_bbox(e) for e in edges]
+    grid = GridIndex(cell_size_for(boxes))
+    for i, bb in enumerate(boxes):
+        grid.insert(i, bb)
+    hits = 0
+    for i, e in enumerate(edges):
+        for j in grid.query(boxes[i]):
+            if j <= i + 1 or (i == 0 and j == n - 1):
+                continue
+            if segments_cross(e, edges[j]):
+                hits += 1
+    return hits
+
+# ---------- walidacja ----------
+def check_arc_chords(pts, label):
+    """k != 0 i cięciwa > 2|k| – łuk niemożliwy (w DXF przycinany do półokręgu)."""
+    issues = []
+    n = len(pts)
+    for i in range(n):
+        x, y, k = pts[i]
+        x2, y2, _ = pts[(i + 1) % n]
+        if abs(k) < EPS:
+            continue
+        d = math.hypot(x2 - x, y2 - y)
+        if d > 2.0 * abs(k) + TOL:
+            issues.append(f"{label}: łuk #{i + 1} cięciwa {d:.3f} > 2r {2.0 * abs(k):.3f}")
+    return issues
+
+def validate_part(outer_pts, inner_contours, outer_verts, inner_verts, bo_items) -> list[str]:
+    """
+    Zwraca listę problemów (pusta = OK). Wejście jak w generate_dxf_from_nc_text:
+    punkty (x,y,k) z NC1 oraz zbudowane kontury (x,y,bulge); inner_verts[n] odpowiada
+    inner_contours[n] (pusty dla konturu zdegenerowanego) – jedna numeracja IK #n.
+    """
+    issues = []
+
+    # łuki
+    if outer_pts:
+        issues += check_arc_chords(outer_pts, "AK")
+    for n, pts in enumerate(inner_contours, 1):
+        issues += check_arc_chords(pts, f"IK #{n}")
+
+    # kontury
+    outer = None
+    if outer_verts:
+        poly = flatten_xyb(outer_verts)
+        if self_intersections(poly):
+            issues.append("AK: kontur samoprzecinający się")
+        outer = PolygonIndex(poly)
+
+    # wycięcia: ("cap", nr, oś, r) dla BO, ("poly", nr, PolygonIndex, None) dla IK
+    cutouts = []
+    for n, verts in enumerate(inner_verts, 1):
+        if not verts:
+            continue
+        poly = flatten_xyb(verts)
+        if self_intersections(poly):
+            issues.append(f"IK #{n}: kontur samoprzecinający się")
+        cutouts.append(("poly", f"IK #{n}", PolygonIndex(poly), None))
+    for n, (kind, c1, c2, dia) in enumerate(bo_items, 1):
+        if dia <= 0:
+            continue
+        axis = (c1, c2 if kind == "slot" else c1)
+        cutouts.append(("cap", f"BO #{n}", axis, dia / 2.0))
+
+    def bbox(c):
+        if c[0] == "poly":
+            return c[2].bbox
+        return seg_bbox(c[2], c[3])
+
+    # względem OUTER
+    if outer is not None:
+        for c in cutouts:
+            kind, label, geo, r = c
+            if kind == "cap":
+                inside = [outer.contains(geo[0]), outer.contains(geo[1])]
+                if not any(inside):
+                    issues.append(f"{label}: poza OUTER ({geo[0][0]:.2f}, {geo[0][1]:.2f})")
+                elif not all(inside) or outer.min_dist(geo, r) < r - TOL:
+                    issues.append(f"{label}: przecina OUTER ({geo[0][0]:.2f}, {geo[0][1]:.2f})")
+            else:
+                if outer.crossings(geo.edges):
+                    issues.append(f"{label}: przecina OUTER")
+                elif not outer.contains(geo.poly[0]):
+                    issues.append(f"{label}: poza OUTER")
+
+    # wycięcia między sobą
+    boxes = [bbox(c) for c in cutouts]
+    grid = GridIndex(cell_size_for(boxes))
+    for i, bb in enumerate(boxes):
+        grid.insert(i, bb)
+    for i, a in enumerate(cutouts):
+        for j in sorted(grid.query(boxes[i])):
+            if j <= i:
+                continue
+            b = cutouts[j]
+            if _cutouts_overlap(a, b):
+                issues.append(f"{a[1]} nachodzi na {b[1]}")
+    return issues
+
+def _cutouts_overlap(a, b) -> bool:
+    if a[0] == "cap" and b[0] == "cap":
+        return seg_seg_dist(a[2], b[2]) < a[3] + b[3] - TOL
+    if a[0] == "poly" and b[0] == "poly":
+        pa, pb = a[2], b[2]
+        return bool(pa.crossings(pb.edges)) or pa.contains(pb.poly[0]) or pb.contains(pa.poly[0])
+    cap, poly = (a, b) if a[0] == "cap" else (b, a)
+    axis, r = cap[2], cap[3]
+    return poly[2].contains(axis[0]) or poly[2].min_dist(axis, r) < r - TOL
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Paczki ZIP (Tekla, Advance Steel) bez rozpakowywania na dysk.
+
+Wejście: pozycje .nc/.nc1/.dstv czytane po kolei z jednego otwartego archiwum
+(jeden sekwencyjny odczyt zamiast tysięcy małych plików na udziale sieciowym);
+przy -j > 1 plan dostaje ZipMember (nazwa + rozmiar), a treść czyta ZipReaders
+dopiero dla paczek w oknie puli.
+Wyjście: ZipOutput – NC po zmianie nazwy i DXF dopisywane strumieniowo do jednego
+archiwum; plik powstaje jako .tmp i jest podmieniany dopiero po zamknięciu.
+"""
+
+import os
+import threading
+import zipfile
+from pathlib import Path, PurePosixPath
+from typing import NamedTuple
+
+COMPRESSLEVEL = 6       # deflate; DXF tekstowy kurczy się ~5-10x
+
+def is_zip(path: Path) -> bool:
+    return path.suffix.lower() == ".zip" and path.is_file()
+
+def zip_members(zip_path: Path, suffixes) -> list[str]:
+    """Nazwy pozycji NC w kolejności archiwum (= kolejność danych w pliku)."""
+    with zipfile.ZipFile(zip_path) as zf:
+        return [i.filename for i in zf.infolist()
+                if not i.is_dir() and PurePosixPath(i.filename).suffix.lower() in suffixes]
+
+def read_members(zip_path: Path, names):
+    """Generator (nazwa, bajty) – archiwum otwarte raz na cały przebieg."""
+    with zipfile.ZipFile(zip_path) as zf:
+        for name in names:
+            yield name, zf.read(name)
+
+class ZipMember(NamedTuple):
+    """Pozycja archiwum bez treści (plan przy -j > 1): treść czytana dopiero przed wysłaniem do puli."""
+    zip_path: Path
+    name: str
+    size: int           # po rozpakowaniu – koszt "size"
+
+    def read(self) -> bytes:
+        """Odczyt z osobnym otwarciem archiwum (poza ZipReaders, np. w procesie roboczym)."""
+        with zipfile.ZipFile(self.zip_path) as zf:
+            return zf.read(self.name)
+
+def lazy_members(zip_path: Path, names) -> list[ZipMember]:
+    """ZipMember dla names (zip_members) – tylko katalog archiwum, bez dekompresji."""
+    with zipfile.ZipFile(zip_path) as zf:
+        return [ZipMember(zip_path, name, zf.getinfo(name).file_size) for name in names]
+
+class ZipReaders:
+    """Odczyt ZipMember z wielu wątków: każde archiwum otwarte raz na przebieg, odczyty po kolei."""
+
+    def __init__(self):
+        self.files = {}
+        self.lock = threading.Lock()
+
+    def read(self, member: ZipMember) -> bytes:
+        with self.lock:
+            zf = self.files.get(member.zip_path)
+            if zf is None:
+                zf = self.files[member.zip_path] = zipfile.ZipFile(member.zip_path)
+            return zf.read(member.name)
+
+    def close(self) -> None:
+        with self.lock:
+            for zf in self.files.values():
+                zf.close()
+            self.files.clear()
+
+class ZipOutput:
+    """Archiwum wynikowe; write(nazwa, bajty) -> nazwa faktycznie zapisana (powtórki: "x (2).dxf")."""
+
+    def __init__(self, path: Path, compresslevel: int = COMPRESSLEVEL):
+        self.path = path
+        self.tmp = path.with_name(path.name + ".tmp")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.zf = zipfile.ZipFile(self.tmp, "w", zipfile.ZIP_DEFLATED, compresslevel=compresslevel)
+        self.names = set()
+        self.files = 0
+        self.bytes = 0
+
+    def write(self, arcname: str, data: bytes) -> str:
+        name, n = arcname, 1
+        while name.lower() in self.names:
+            n += 1
+            p = PurePosixPath(arcname)
+            name = str(p.with_name(f"{p.stem} ({n}){p.suffix}"))
+        self.names.add(name.lower())
+        self.zf.writestr(name, data)
+        self.files += 1
+        self.bytes += len(data)
+        return name
+
+    def close(self) -> None:
+        self.zf.close()
+        os.replace(self.tmp, self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()